@@ -0,0 +1,110 @@
+import asyncio
+import hashlib
+import re
+import time
+from types import SimpleNamespace
+
+_ORIGINAL_QUERY_PATTERN = re.compile(r'Original query: "(.*)"')
+_WORD_PATTERN = re.compile(r'[A-Za-z]\w+')
+
+def stub_completion_text(messages, max_tokens=None, words=120):
+    """
+    Deterministic stand-in for a model answer: the same messages always give
+    the same text. Rephrase prompts get the "Rephrased query:/Keywords:" lines
+    the server parses; other prompts get `words` words derived from a hash of
+    the prompt, capped at `max_tokens`.
+    """
+    prompt = "\n".join(str(message.get("content", "")) for message in messages)
+    original = _ORIGINAL_QUERY_PATTERN.search(prompt)
+    if original:
+        query = original.group(1)
+        keywords = list(dict.fromkeys(word.lower() for word in _WORD_PATTERN.findall(query) if len(word) > 3))[:5]
+        return f"Rephrased query: {query}\nKeywords: {', '.join(keywords or [query])}"
+
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    count = min(words, max_tokens) if max_tokens else words
+    return " ".join(f"w{digest[(i * 2) % len(digest):(i * 2) % len(digest) + 4]}" for i in range(count))
+
+def _chunk(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+def _response(text):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+class _StubStream:
+    def __init__(self, parts, chunk_latency):
+        self.parts = parts
+        self.chunk_latency = chunk_latency
+        self.closed = False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for part in self.parts:
+            if self.closed:
+                return
+            if self.chunk_latency:
+                await asyncio.sleep(self.chunk_latency)
+            yield _chunk(part)
+
+    async def close(self):
+        self.closed = True
+
+class _AsyncCompletions:
+    def __init__(self, stub):
+        self.stub = stub
+
+    async def create(self, model, messages, stream=False, **params):
+        self.stub.calls += 1
+        if self.stub.latency:
+            await asyncio.sleep(self.stub.latency)
+        text = stub_completion_text(messages, params.get("max_tokens"), self.stub.words)
+        if stream:
+            words = text.split(" ")
+            parts = [word if i == 0 else " " + word for i, word in enumerate(words)]
+            return _StubStream(parts, self.stub.chunk_latency)
+        return _response(text)
+
+class _Completions:
+    def __init__(self, stub):
+        self.stub = stub
+
+    def create(self, model, messages, **params):
+        self.stub.calls += 1
+        if self.stub.latency:
+            time.sleep(self.stub.latency)
+        return _response(stub_completion_text(messages, params.get("max_tokens"), self.stub.words))
+
+class GroqStub:
+    """
+    Drop-in for the sync and async Groq clients used by `llm_service`, with a
+    fixed `latency` (seconds) per request and `chunk_latency` per streamed
+    chunk. Answers come from `stub_completion_text`, so runs are repeatable.
+    """
+
+    def __init__(self, latency=0.0, chunk_latency=0.0, words=120):
+        self.latency = latency
+        self.chunk_latency = chunk_latency
+        self.words = words
+        self.calls = 0
+        self.sync_client = SimpleNamespace(chat=SimpleNamespace(completions=_Completions(self)))
+        self.async_client = SimpleNamespace(chat=SimpleNamespace(completions=_AsyncCompletions(self)), close=self._close)
+
+    async def _close(self):
+        pass
+
+def install_groq_stub(latency=0.0, chunk_latency=0.0, words=120, disable_cache=True):
+    """
+    Make `llm_service` use a `GroqStub` instead of the Groq API. With
+    `disable_cache` the completion cache is bypassed so every request pays
+    the stub latency. Returns the stub.
+    """
+    from services import llm_service
+
+    stub = GroqStub(latency, chunk_latency, words)
+    llm_service._groq_client = stub.sync_client
+    llm_service._async_groq_client = stub.async_client
+    if disable_cache:
+        llm_service.completion_cache = None
+    return stub
@@ -0,0 +1,288 @@
+import argparse
+import copy
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from benchmarks.synthetic_data import FILLER_WORDS, add_generator_arguments, generate_posts, generator_options, write_json, write_jsonl
+from benchmarks.groq_stub import install_groq_stub
+
+DEFAULT_RESULTS_DIR = os.path.join("benchmarks", "results")
+
+def measure(func, repeat=5, warmup=1, setup=None):
+    """
+    Time `func` over `repeat` runs after `warmup` untimed runs. `setup`, if
+    given, runs untimed before each call and its result is passed to `func`.
+    Returns timing statistics in milliseconds.
+    """
+    for _ in range(warmup):
+        func(setup()) if setup else func()
+
+    durations = []
+    for _ in range(repeat):
+        argument = setup() if setup else None
+        start_time = time.perf_counter()
+        func(argument) if setup else func()
+        durations.append((time.perf_counter() - start_time) * 1000)
+    return timing_stats(durations)
+
+def timing_stats(durations):
+    ordered = sorted(durations)
+    return {
+        "runs": len(ordered),
+        "min_ms": round(ordered[0], 3),
+        "median_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))], 3),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "max_ms": round(ordered[-1], 3)
+    }
+
+def sample_queries(posts, count=3):
+    """The most common non-filler title words: query terms that do match the data."""
+    words = Counter(
+        word for post in posts for word in post["data"]["title"].split() if word not in FILLER_WORDS
+    )
+    return [word for word, _ in words.most_common(count)]
+
+def bench_extract_topics(posts, repeat):
+    from services.misc_service import extract_topics_from_text
+
+    texts = [post["data"]["selftext"] for post in posts]
+    stats = measure(lambda: [extract_topics_from_text(text) for text in texts], repeat)
+    stats["texts"] = len(texts)
+    stats["texts_per_second"] = round(len(texts) / (stats["median_ms"] / 1000), 1) if stats["median_ms"] else None
+    return stats
+
+def bench_filter_json_data(records, queries, repeat):
+    from services.misc_service import filter_json_data
+    from services.json_index import JsonIndex
+
+    results = {"queries": queries}
+    results["scan"] = measure(lambda: [filter_json_data(records, [query]) for query in queries], repeat)
+
+    start_time = time.perf_counter()
+    index = JsonIndex(records)
+    results["index_build_ms"] = round((time.perf_counter() - start_time) * 1000, 3)
+    results["indexed"] = measure(
+        lambda: [filter_json_data(records, [query], max_items=3, index=index) for query in queries], repeat
+    )
+    return results
+
+def network_from_posts(posts, author_limit=None):
+    """Author/subreddit nodes and links shaped like the network-graph endpoint's."""
+    authors = {}
+    for post in posts:
+        data = post["data"]
+        if data["author"] == "[deleted]":
+            continue
+        if author_limit is not None and data["author"] not in authors and len(authors) >= author_limit:
+            continue
+        authors.setdefault(data["author"], set()).add(data["subreddit"])
+
+    nodes = [{"id": author, "group": 1, "type": "author", "community": None} for author in authors]
+    subreddits = sorted({subreddit for names in authors.values() for subreddit in names})
+    nodes.extend({"id": subreddit, "group": 2, "type": "subreddit", "community": None} for subreddit in subreddits)
+    links = [{"source": author, "target": subreddit, "value": 1}
+             for author, names in authors.items() for subreddit in sorted(names)]
+    return nodes, links
+
+def bench_detect_communities(posts, repeat, author_limits=(100, 1000, None)):
+    from services.misc_service import detect_communities
+
+    results = {}
+    for limit in author_limits:
+        nodes, links = network_from_posts(posts, limit)
+        stats = measure(lambda fresh: detect_communities(fresh, links), repeat, setup=lambda: copy.deepcopy(nodes))
+        stats.update(nodes=len(nodes), links=len(links))
+        results[f"authors_{limit or 'all'}"] = stats
+    return results
+
+def bench_ingest(jsonl_path, num_posts, repeat):
+    """Full (destructive) load of the synthetic file into the configured Neo4j."""
+    from services.init_neo4j import load_graph_database
+
+    durations = []
+    stats = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        stats = load_graph_database(jsonl_path)
+        durations.append((time.perf_counter() - start_time) * 1000)
+
+    results = timing_stats(durations)
+    results["posts"] = num_posts
+    results["posts_per_second"] = round(num_posts / (results["median_ms"] / 1000), 1) if results["median_ms"] else None
+    results["ingest_stats"] = stats if isinstance(stats, dict) else None
+    return results
+
+def endpoint_requests(queries, subreddits):
+    query = queries[0] if queries else "reddit"
+    subreddit_filter = ",".join(subreddits[:3])
+    return [
+        ("root", "GET", "/", None),
+        ("time_series", "GET", "/api/time-series", {"params": {"query": query}}),
+        ("time_series_subreddits", "GET", "/api/time-series", {"params": {"subreddits": subreddit_filter}}),
+        ("community_distribution", "GET", "/api/community-distribution", {"params": {"query": query}}),
+        ("topic_trends", "GET", "/api/topic-trends", None),
+        ("network_graph", "GET", "/api/network-graph", {"params": {"query": query}}),
+        ("dashboard", "GET", "/api/dashboard", {"params": {"query": query}}),
+        ("network_graph_summary", "GET", "/api/network-graph/summary", {"params": {"query": query}}),
+        ("ai_analysis", "POST", "/api/ai-analysis", {"json": {"query": query}}),
+        ("ai_analysis_stream", "POST", "/api/ai-analysis/stream", {"json": {"query": query}}),
+        ("chatbot_keywords", "POST", "/api/chatbot", {"json": {"message": query}}),
+        ("chatbot_question", "POST", "/api/chatbot", {"json": {"message": f"What are people saying about {query} lately?"}}),
+        ("chatbot_stream", "POST", "/api/chatbot/stream", {"json": {"message": f"Why is {query} popular?"}}),
+        ("cache_stats", "GET", "/api/cache-stats", None)
+    ]
+
+def bench_endpoints(requests, repeat):
+    """
+    Call every endpoint through an in-process client. `cold` drops every
+    in-process cache before each call: the response and rephrase caches, the
+    in-memory analytics engine, the stats snapshot and the loaded
+    processed data with its index. `warm` repeats the call with them kept.
+    """
+    from fastapi.testclient import TestClient
+    import main
+    from services.analytics_engine import reset_analytics_engine
+
+    def clear_caches():
+        main.response_cache.set_version(main.response_cache.version)
+        main.rephrase_cache.set_version(main.rephrase_cache.version)
+        reset_analytics_engine()
+        main.stats_snapshot.reset()
+        main.context_store.reset()
+
+    results = {}
+    with TestClient(main.app) as client:
+        for name, method, path, options in requests:
+            def call(_=None):
+                response = client.request(method, path, **(options or {}))
+                if response.status_code >= 400:
+                    raise RuntimeError(f"{method} {path} returned {response.status_code}: {response.text[:200]}")
+                return response
+
+            try:
+                results[name] = {
+                    "method": method,
+                    "path": path,
+                    "cold": measure(call, repeat, warmup=0, setup=clear_caches),
+                    "warm": measure(call, repeat, warmup=1)
+                }
+            except Exception as e:
+                results[name] = {"method": method, "path": path, "error": str(e)}
+    return results
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmark(results, name, func, *args):
+    print(f"Running {name}...")
+    try:
+        results[name] = func(*args)
+    except Exception as e:
+        print(f"Benchmark {name} failed: {str(e)}")
+        results[name] = {"error": str(e)}
+
+def run(args, workdir, started_at):
+    """Generate the data in `workdir`, run the selected benchmarks and return the report."""
+    jsonl_path = os.path.join(workdir, "data.jsonl")
+    json_path = os.path.join(workdir, "processed_data.json")
+
+    # Settings are read from the environment at import time, so they must be
+    # in place before any service module is imported. The Neo4j settings are
+    # always overridden so a .env pointing at a real database is never used.
+    os.environ["NEO4J_URI"] = args.neo4j_uri or "bolt://localhost:7687"
+    os.environ["NEO4J_USER"] = args.neo4j_user
+    os.environ["NEO4J_PASSWORD"] = args.neo4j_password
+    os.environ["PROCESSED_DATA_PATH"] = json_path
+    os.environ["LLM_CACHE_ENABLED"] = "false"
+    os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+    import nltk
+    for resource in ("punkt", "punkt_tab", "stopwords"):
+        nltk.download(resource, quiet=True)
+
+    options = generator_options(args)
+    start_time = time.perf_counter()
+    posts = list(generate_posts(**options))
+    write_jsonl(jsonl_path, posts)
+    write_json(json_path, posts)
+    generate_ms = round((time.perf_counter() - start_time) * 1000, 3)
+
+    stub = install_groq_stub(args.llm_latency, args.llm_chunk_latency)
+    queries = sample_queries(posts)
+    subreddits = [name for name, _ in Counter(post["data"]["subreddit"] for post in posts).most_common()]
+
+    results = {}
+    if "extract_topics" not in args.skip:
+        run_benchmark(results, "extract_topics", bench_extract_topics, posts, args.repeat)
+    if "filter_json_data" not in args.skip:
+        run_benchmark(results, "filter_json_data", bench_filter_json_data, posts, queries, args.repeat)
+    if "detect_communities" not in args.skip:
+        run_benchmark(results, "detect_communities", bench_detect_communities, posts, args.repeat)
+    if args.neo4j_uri:
+        if "ingest" not in args.skip:
+            run_benchmark(results, "ingest", bench_ingest, jsonl_path, len(posts), 1)
+        if "endpoints" not in args.skip:
+            run_benchmark(results, "endpoints", bench_endpoints, endpoint_requests(queries, subreddits), args.repeat)
+    else:
+        print("No --neo4j-uri given; skipping the ingest and endpoint benchmarks.")
+
+    return {
+        "timestamp": started_at.isoformat(),
+        "git_commit": git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": {
+            **options,
+            "repeat": args.repeat,
+            "llm_latency": args.llm_latency,
+            "llm_chunk_latency": args.llm_chunk_latency,
+            "neo4j": bool(args.neo4j_uri)
+        },
+        "generate_ms": generate_ms,
+        "llm_stub_calls": stub.calls,
+        "results": results
+    }
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the AI server on synthetic Reddit data and write the results as JSON."
+    )
+    add_generator_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Seconds the Groq stub waits per request.")
+    parser.add_argument("--llm-chunk-latency", type=float, default=0.005, help="Seconds the Groq stub waits per streamed chunk.")
+    parser.add_argument("--neo4j-uri", help="Local Neo4j (e.g. a container on bolt://localhost:7687) to ingest into and "
+                                            "serve the endpoints from. Its database is wiped. Without it those benchmarks are skipped.")
+    parser.add_argument("--neo4j-user", default="neo4j")
+    parser.add_argument("--neo4j-password", default="benchmark")
+    parser.add_argument("--skip", nargs="*", default=[], help="Benchmarks to skip: extract_topics, filter_json_data, "
+                                                              "detect_communities, ingest, endpoints.")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<timestamp>.json).")
+    args = parser.parse_args()
+
+    started_at = datetime.now(timezone.utc)
+    with tempfile.TemporaryDirectory(prefix="reddit-benchmark-") as workdir:
+        report = run(args, workdir, started_at)
+
+    output = args.output or os.path.join(DEFAULT_RESULTS_DIR, started_at.strftime("%Y%m%dT%H%M%SZ") + ".json")
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"Wrote benchmark results to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import argparse
+import json
+import math
+import os
+import random
+from itertools import accumulate
+
+SYLLABLES = [
+    "ba", "be", "bi", "bo", "ca", "co", "da", "de", "di", "fa", "fe", "ga", "go", "ha", "he", "ka", "ki",
+    "la", "le", "li", "lo", "ma", "me", "mi", "mo", "na", "ne", "no", "pa", "pe", "po", "ra", "re", "ri",
+    "ro", "sa", "se", "si", "so", "ta", "te", "ti", "to", "va", "ve", "vo", "za", "zo"
+]
+
+FILLER_WORDS = [
+    "the", "and", "that", "this", "with", "for", "about", "from", "they", "have", "what", "when", "just",
+    "people", "think", "really", "because", "would", "there", "their", "some", "more", "like", "into"
+]
+
+DEFAULT_START_UTC = 1704067200
+
+def zipf_cum_weights(count, skew):
+    """Cumulative Zipf weights: rank r has weight 1 / r**skew (skew 0 is uniform)."""
+    return list(accumulate(1.0 / (rank ** skew) for rank in range(1, count + 1)))
+
+def _pseudo_word(rng, min_syllables=2, max_syllables=4):
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(min_syllables, max_syllables)))
+
+def _unique_words(rng, count, min_syllables=2, max_syllables=4):
+    words = []
+    seen = set()
+    while len(words) < count:
+        word = _pseudo_word(rng, min_syllables, max_syllables)
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+def _sentence(rng, length, topic_words, vocabulary, topic_bias):
+    words = []
+    for _ in range(length):
+        draw = rng.random()
+        if draw < topic_bias:
+            words.append(rng.choice(topic_words))
+        elif draw < topic_bias + (1 - topic_bias) / 2:
+            words.append(rng.choice(FILLER_WORDS))
+        else:
+            words.append(rng.choice(vocabulary))
+    return " ".join(words)
+
+def generate_posts(num_posts, seed=42, num_subreddits=50, num_authors=5000, subreddit_skew=1.1,
+                   author_skew=1.2, text_words=80, text_length_sigma=1.0, title_words=10,
+                   vocabulary_size=5000, topics_per_subreddit=20, topic_bias=0.3, deleted_ratio=0.05,
+                   start_utc=DEFAULT_START_UTC, days=90):
+    """
+    Yield `num_posts` Reddit post records ({"kind": "t3", "data": {...}}) with
+    the fields the ingest reads. Subreddits and authors are drawn from Zipf
+    distributions (`subreddit_skew`, `author_skew`; 0 is uniform), selftext
+    lengths are log-normal around `text_words` words with `text_length_sigma`
+    spread, and each subreddit favours its own topic words so topic
+    extraction and filtering see realistic overlap. The same arguments always
+    yield the same posts.
+    """
+    rng = random.Random(seed)
+    vocabulary = _unique_words(rng, vocabulary_size)
+    subreddits = [word.capitalize() + str(index) for index, word in enumerate(_unique_words(rng, num_subreddits, 2, 3))]
+    authors = [f"{word}_{index}" for index, word in enumerate(_unique_words(rng, num_authors, 2, 4))]
+    subreddit_topics = {name: rng.sample(vocabulary, min(topics_per_subreddit, len(vocabulary))) for name in subreddits}
+
+    subreddit_weights = zipf_cum_weights(num_subreddits, subreddit_skew)
+    author_weights = zipf_cum_weights(num_authors, author_skew)
+    mu = math.log(max(text_words, 1)) - text_length_sigma ** 2 / 2
+    span = days * 24 * 3600
+
+    for index in range(num_posts):
+        subreddit = rng.choices(subreddits, cum_weights=subreddit_weights)[0]
+        author = "[deleted]" if rng.random() < deleted_ratio else rng.choices(authors, cum_weights=author_weights)[0]
+        topic_words = subreddit_topics[subreddit]
+
+        length = int(rng.lognormvariate(mu, text_length_sigma)) if text_words else 0
+        selftext = _sentence(rng, length, topic_words, vocabulary, topic_bias)
+        if selftext and rng.random() < 0.1:
+            selftext += f" https://example.com/{rng.choice(topic_words)} #{rng.choice(topic_words)}"
+
+        score = int(rng.paretovariate(1.5)) - 1
+        yield {
+            "kind": "t3",
+            "data": {
+                "name": f"t3_{seed:x}{index:08x}",
+                "title": _sentence(rng, rng.randint(max(title_words // 2, 1), title_words), topic_words, vocabulary, topic_bias),
+                "selftext": selftext,
+                "created_utc": start_utc + rng.randrange(span),
+                "score": score,
+                "num_comments": int(score * rng.random() * 0.5),
+                "upvote_ratio": round(rng.uniform(0.5, 1.0), 2),
+                "subreddit": subreddit,
+                "author": author
+            }
+        }
+
+def write_jsonl(path, posts):
+    """Write one record per line; returns the number of records."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    count = 0
+    with open(path, "w") as file:
+        for post in posts:
+            file.write(json.dumps(post) + "\n")
+            count += 1
+    return count
+
+def write_json(path, posts):
+    """Write the records as one JSON array, the shape of processed_data.json."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    posts = list(posts)
+    with open(path, "w") as file:
+        json.dump(posts, file)
+    return len(posts)
+
+def add_generator_arguments(parser):
+    parser.add_argument("--posts", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--subreddits", type=int, default=50)
+    parser.add_argument("--authors", type=int, default=5000)
+    parser.add_argument("--subreddit-skew", type=float, default=1.1)
+    parser.add_argument("--author-skew", type=float, default=1.2)
+    parser.add_argument("--text-words", type=int, default=80)
+    parser.add_argument("--text-length-sigma", type=float, default=1.0)
+
+def generator_options(args):
+    return {
+        "num_posts": args.posts,
+        "seed": args.seed,
+        "num_subreddits": args.subreddits,
+        "num_authors": args.authors,
+        "subreddit_skew": args.subreddit_skew,
+        "author_skew": args.author_skew,
+        "text_words": args.text_words,
+        "text_length_sigma": args.text_length_sigma
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic Reddit JSONL file.")
+    parser.add_argument("output", nargs="?", default="data/synthetic.jsonl")
+    parser.add_argument("--json", help="Also write the posts as a JSON array (like processed_data.json) to this path.")
+    add_generator_arguments(parser)
+    args = parser.parse_args()
+
+    options = generator_options(args)
+    count = write_jsonl(args.output, generate_posts(**options))
+    if args.json:
+        write_json(args.json, generate_posts(**options))
+    print(f"Wrote {count} synthetic posts to {args.output}")
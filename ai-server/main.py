@@ -1,16 +1,31 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
+import asyncio
+import hashlib
 import json
+from collections import Counter
 from typing import Optional, List, Dict, Any, Tuple
-from datetime import datetime
 import os
-import groq
 from dotenv import load_dotenv
-from python_types.types import SearchQuery, ChatMessage, Neo4jConnection
+from python_types.types import SearchQuery, ChatMessage
 from services.chatbot_service import extract_query_terms, detect_response_length
-from services.neo4j_service import query_neo4j_for_general_stats
-from services.misc_service import process_reddit_data, detect_communities, filter_json_data
-from services.init_neo4j import create_graph_database
+from services.neo4j_service import neo4j_connection, aggregate_general_stats, stats_snapshot
+from services.misc_service import detect_communities, filter_json_data, reduce_data_context
+from services.init_neo4j import load_graph_database
+from services.search_service import match_posts
+from services.rollup_service import query_daily_counts, rollups_available, parse_date_bound
+from services.analytics_engine import get_analytics_engine, reset_analytics_engine
+from services.cache_service import ResponseCache
+from services.dashboard_service import DashboardPanels, DASHBOARD_POSTS_RETURN
+from services.ingest_service import get_dataset_version
+from services.context_store import context_store
+from services.prompt_budget import ContextPacker, truncate_to_tokens
+from services.llm_service import acreate_completion, astream_completion, close_llm_clients, completion_cache_stats, LLM_TIMEOUT
+from services.pipeline_service import Pipeline
+from services.query_service import QueryRewriter, normalize_query
 import nltk
 
 nltk.download("punkt")
@@ -19,9 +34,19 @@ nltk.download("stopwords")
 
 load_dotenv()
 
-groq_client = groq.Client(api_key=os.getenv("GROQ_API_KEY"))
+CHAT_REPHRASE_TIMEOUT = float(os.getenv("CHAT_REPHRASE_TIMEOUT", 10))
+CHAT_RETRIEVAL_TIMEOUT = float(os.getenv("CHAT_RETRIEVAL_TIMEOUT", 10))
+CHAT_ANSWER_TIMEOUT = float(os.getenv("CHAT_ANSWER_TIMEOUT", LLM_TIMEOUT))
+REPHRASE_CACHE_SIZE = int(os.getenv("REPHRASE_CACHE_SIZE", 2048))
+REPHRASE_CACHE_TTL = float(os.getenv("REPHRASE_CACHE_TTL", 24 * 3600))
 
-app = FastAPI(title="Social Media Analysis Dashboard API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await close_llm_clients()
+    await neo4j_connection.aclose()
+
+app = FastAPI(title="Social Media Analysis Dashboard API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -31,41 +56,55 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-neo4j_connection = Neo4jConnection(
-    uri=os.getenv("NEO4J_URI"),
-    user=os.getenv("NEO4J_USER"),
-    password=os.getenv("NEO4J_PASSWORD")
-)   
+response_cache = ResponseCache(version_loader=lambda: get_dataset_version(neo4j_connection.driver))
+rephrase_cache = ResponseCache(max_entries=REPHRASE_CACHE_SIZE, ttl_seconds=REPHRASE_CACHE_TTL)
+query_rewriter = QueryRewriter(snapshot_loader=stats_snapshot.get)
 
-def generate_groq_response(prompt: str, model_name: str, max_tokens: int = 1000, max_input_tokens: int = 4000):
+async def generate_groq_response(prompt: str, model_name: str, max_tokens: int = 1000, max_input_tokens: int = 4000):
     """Generate response from Groq LLM with token management"""
 
-    def estimate_tokens(text: str) -> int:
-        return len(text) // 4
-    
-    if estimate_tokens(prompt) > max_input_tokens:
-        chars_to_keep = max_input_tokens * 4
-        half_length = chars_to_keep // 2
-        prompt = prompt[:half_length] + "\n...[content truncated for brevity]...\n" + prompt[-half_length:]
+    prompt = truncate_to_tokens(prompt, max_input_tokens)
     
     try:
-        response = groq_client.chat.completions.create(
-            model=model_name,
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=max_tokens
-        )
-        return response.choices[0].message.content
+        return await acreate_completion([{"role": "user", "content": prompt}], model_name, max_tokens=max_tokens)
     except Exception as e:
         print(f"Error calling Groq API: {str(e)}")
         raise e
 
-def rephrase_query(user_query: str, model_name: str = "llama3-8b-8192") -> Tuple[str, List[str]]:
+async def stream_groq_response(prompt: str, model_name: str, max_tokens: int = 1000, max_input_tokens: int = 4000):
+    """Streaming variant of generate_groq_response; yields text as it is generated."""
+
+    prompt = truncate_to_tokens(prompt, max_input_tokens)
+    
+    async for text in astream_completion([{"role": "user", "content": prompt}], model_name, max_tokens=max_tokens):
+        yield text
+
+async def rephrase_query(user_query: str, model_name: str = "llama3-8b-8192") -> Tuple[str, List[str]]:
     """
     Rephrase user query to be more specific and extract key search terms.
+    Keyword-style queries and queries made of known subreddits and topics are
+    handled locally; other queries go to the LLM, memoized by normalized query.
+    Concurrent identical queries share one LLM call, which keeps running when
+    one of the requests waiting on it times out.
     
     Returns:
         Tuple[str, List[str]]: (rephrased_query, extracted_keywords)
     """
+    local = await run_in_threadpool(query_rewriter.rewrite, user_query)
+    if local is not None:
+        return local
+    
+    try:
+        return await rephrase_cache.get_or_compute(
+            ("rephrase", model_name, normalize_query(user_query)),
+            lambda: llm_rephrase_query(user_query, model_name)
+        )
+    except Exception as e:
+        print(f"Error rephrasing query: {str(e)}")
+        return user_query, extract_query_terms(user_query)
+
+async def llm_rephrase_query(user_query: str, model_name: str) -> Tuple[str, List[str]]:
+    """Rephrase a query with the LLM; errors propagate so they are not memoized."""
     prompt = f"""
     You are an expert at improving search queries about Reddit data. Rephrase this query to be more precise:
     
@@ -81,61 +120,47 @@ def rephrase_query(user_query: str, model_name: str = "llama3-8b-8192") -> Tuple
     Keywords: cryptocurrency, Finance, weekly trend, posts
     """
     
-    try:
-        response = generate_groq_response(prompt, model_name, max_tokens=200, max_input_tokens=1000)
-        
-        rephrased_query = ""
-        keywords = []
-        
-        for line in response.split('\n'):
-            if line.startswith("Rephrased query:"):
-                rephrased_query = line.replace("Rephrased query:", "").strip()
-            elif line.startswith("Keywords:"):
-                keywords_text = line.replace("Keywords:", "").strip()
-                keywords = [k.strip() for k in keywords_text.split(',')]
-        
-        if not rephrased_query:
-            rephrased_query = user_query
-            
-        if not keywords:
-            keywords = extract_query_terms(user_query)
-            
-        return rephrased_query, keywords
-    except Exception as e:
-        print(f"Error rephrasing query: {str(e)}")
-        return user_query, extract_query_terms(user_query)
-
-def reduce_data_context(data: Dict[str, Any], max_items: int = 5) -> Dict[str, Any]:
-    """Reduce data context size by limiting number of items"""
-    
-    if not data:
-        return {}
+    response = await generate_groq_response(prompt, model_name, max_tokens=200, max_input_tokens=1000)
     
-    reduced_data = {}
+    rephrased_query = ""
+    keywords = []
     
-    for key, value in data.items():
-        if isinstance(value, list):
-            reduced_data[key] = value[:max_items]
-            if len(value) > max_items:
-                reduced_data[f"{key}_count"] = len(value)
-        elif isinstance(value, dict):
-            reduced_data[key] = reduce_data_context(value, max_items//2)
-        else:
-            reduced_data[key] = value
+    for line in response.split('\n'):
+        if line.startswith("Rephrased query:"):
+            rephrased_query = line.replace("Rephrased query:", "").strip()
+        elif line.startswith("Keywords:"):
+            keywords_text = line.replace("Keywords:", "").strip()
+            keywords = [k.strip() for k in keywords_text.split(',')]
     
-    return reduced_data
+    if not rephrased_query:
+        rephrased_query = user_query
+        
+    if not keywords:
+        keywords = extract_query_terms(user_query)
+        
+    return rephrased_query, keywords
 
 @app.post("/api/init-database")
-async def init_database():
-    """Initialize the Neo4j graph database with data from the JSONL file."""
+async def init_database(incremental: bool = Query(False), rescan: bool = Query(False)):
+    """
+    Initialize the Neo4j graph database with data from the JSONL file.
+    With `incremental`, only posts appended since the last load are ingested;
+    `rescan` rereads the whole file for new and edited posts.
+    """
     try:
-        data = process_reddit_data()
-        create_graph_database(data)
-        return {"status": "success", "message": "Database initialized successfully"}
+        stats = await run_in_threadpool(load_graph_database, incremental=incremental, rescan=rescan)
+        await run_in_threadpool(reset_analytics_engine)
+        response_cache.set_version(await run_in_threadpool(get_dataset_version, neo4j_connection.driver))
+        return {
+            "status": "success",
+            "message": "Database updated successfully" if incremental or rescan else "Database initialized successfully",
+            "posts_ingested": stats["posts"]
+        }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/time-series")
+@response_cache.cached("time-series")
 async def get_time_series(
     query: Optional[str] = Query(None),
     start_date: Optional[str] = Query(None),
@@ -144,43 +169,54 @@ async def get_time_series(
 ):
     """Get time series data for posts matching the query."""
     try:
-        cypher_query = """
-        MATCH (p:Post)-[:POSTED_IN]->(s:Subreddit)
-        """
-        
         where_clauses = []
         params = {}
         
-        if query:
-            where_clauses.append("(toLower(p.title) CONTAINS toLower($query) OR toLower(p.selftext) CONTAINS toLower($query))")
-            params["query"] = query
+        cypher_query = match_posts("(p:Post)-[:POSTED_IN]->(s:Subreddit)", query, params, where_clauses)
             
         if start_date:
-            start_timestamp = datetime.fromisoformat(start_date).timestamp()
+            start_timestamp = parse_date_bound(start_date)
             where_clauses.append("p.created_utc >= $start_timestamp")
             params["start_timestamp"] = start_timestamp
             
         if end_date:
-            end_timestamp = datetime.fromisoformat(end_date).timestamp()
-            where_clauses.append("p.created_utc <= $end_timestamp")
+            end_timestamp = parse_date_bound(end_date, end=True)
+            where_clauses.append("p.created_utc < $end_timestamp")
             params["end_timestamp"] = end_timestamp
             
         if subreddits:
             subreddit_list = [s.strip() for s in subreddits.split(",")]
             where_clauses.append("s.name IN $subreddit_list")
             params["subreddit_list"] = subreddit_list
-            
-        if where_clauses:
-            cypher_query += "WHERE " + " AND ".join(where_clauses)
-            
-        cypher_query += """
-        RETURN date(datetime({epochSeconds: toInteger(p.created_utc)})) as date, count(p) as count
-        ORDER BY date
-        """
         
-        result = neo4j_connection.query(cypher_query, params)
+        time_series_data = None
+        analytics_engine = None if query else await run_in_threadpool(get_analytics_engine, neo4j_connection, response_cache.version)
+        if analytics_engine is not None:
+            time_series_data = analytics_engine.time_series(
+                params.get("start_timestamp"),
+                params.get("end_timestamp"),
+                params.get("subreddit_list")
+            )
+        elif not query and await rollups_available(neo4j_connection, response_cache.version):
+            time_series_data = await query_daily_counts(
+                neo4j_connection,
+                params.get("start_timestamp"),
+                params.get("end_timestamp"),
+                params.get("subreddit_list")
+            )
         
-        time_series_data = [{"date": record["date"].isoformat(), "count": record["count"]} for record in result]
+        if time_series_data is None:
+            if where_clauses:
+                cypher_query += "WHERE " + " AND ".join(where_clauses)
+                
+            cypher_query += """
+            RETURN date(datetime({epochSeconds: toInteger(p.created_utc)})) as date, count(p) as count
+            ORDER BY date
+            """
+            
+            result = await neo4j_connection.aquery(cypher_query, params)
+            
+            time_series_data = [{"date": record["date"].isoformat(), "count": record["count"]} for record in result]
         
         if not time_series_data:
             print("Query returned no data")
@@ -193,6 +229,7 @@ async def get_time_series(
         raise HTTPException(status_code=500, detail=str(e))
     
 @app.get("/api/community-distribution")
+@response_cache.cached("community-distribution")
 async def get_community_distribution(
     query: Optional[str] = Query(None),
     start_date: Optional[str] = Query(None),
@@ -200,26 +237,24 @@ async def get_community_distribution(
 ):
     """Get distribution of posts across different subreddits."""
     try:
-        cypher_query = """
-        MATCH (p:Post)-[:POSTED_IN]->(s:Subreddit)
-        """
-        
         where_clauses = []
         params = {}
         
-        if query:
-            where_clauses.append("(p.title CONTAINS $query OR p.selftext CONTAINS $query)")
-            params["query"] = query
+        cypher_query = match_posts("(p:Post)-[:POSTED_IN]->(s:Subreddit)", query, params, where_clauses)
             
         if start_date:
-            start_timestamp = datetime.fromisoformat(start_date).timestamp()
+            start_timestamp = parse_date_bound(start_date)
             where_clauses.append("p.created_utc >= $start_timestamp")
             params["start_timestamp"] = start_timestamp
             
         if end_date:
-            end_timestamp = datetime.fromisoformat(end_date).timestamp()
-            where_clauses.append("p.created_utc <= $end_timestamp")
+            end_timestamp = parse_date_bound(end_date, end=True)
+            where_clauses.append("p.created_utc < $end_timestamp")
             params["end_timestamp"] = end_timestamp
+        
+        analytics_engine = None if query else await run_in_threadpool(get_analytics_engine, neo4j_connection, response_cache.version)
+        if analytics_engine is not None:
+            return analytics_engine.community_distribution(params.get("start_timestamp"), params.get("end_timestamp"))
             
         if where_clauses:
             cypher_query += "WHERE " + " AND ".join(where_clauses)
@@ -230,7 +265,7 @@ async def get_community_distribution(
         LIMIT 10
         """
         
-        result = neo4j_connection.query(cypher_query, params)
+        result = await neo4j_connection.aquery(cypher_query, params)
         
         distribution_data = [{"name": record["subreddit"], "value": record["count"]} for record in result]
         
@@ -239,6 +274,7 @@ async def get_community_distribution(
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/topic-trends")
+@response_cache.cached("topic-trends")
 async def get_topic_trends(
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
@@ -255,7 +291,7 @@ async def get_topic_trends(
             
         if start_date:
             try:
-                start_timestamp = datetime.fromisoformat(start_date).timestamp()
+                start_timestamp = parse_date_bound(start_date)
                 where_clauses.append("p.created_utc >= $start_timestamp")
                 params["start_timestamp"] = start_timestamp
             except ValueError:
@@ -263,8 +299,8 @@ async def get_topic_trends(
             
         if end_date:
             try:
-                end_timestamp = datetime.fromisoformat(end_date).timestamp()
-                where_clauses.append("p.created_utc <= $end_timestamp")
+                end_timestamp = parse_date_bound(end_date, end=True)
+                where_clauses.append("p.created_utc < $end_timestamp")
                 params["end_timestamp"] = end_timestamp
             except ValueError:
                 raise HTTPException(status_code=400, detail="Invalid end_date format. Use ISO format (e.g., 2023-01-31).")
@@ -273,19 +309,27 @@ async def get_topic_trends(
             subreddit_list = [s.strip() for s in subreddits.split(",")]
             where_clauses.append("EXISTS { MATCH (p)-[:POSTED_IN]->(s:Subreddit) WHERE s.name IN $subreddit_list }")
             params["subreddit_list"] = subreddit_list
+        
+        analytics_engine = await run_in_threadpool(get_analytics_engine, neo4j_connection, response_cache.version)
+        if analytics_engine is not None:
+            topic_data = analytics_engine.topic_trends(
+                params.get("start_timestamp"),
+                params.get("end_timestamp"),
+                params.get("subreddit_list")
+            )
+        else:
+            if where_clauses:
+                cypher_query += "WHERE " + " AND ".join(where_clauses)
+                
+            cypher_query += """
+            RETURN t.name as topic, count(*) as count
+            ORDER BY count DESC
+            LIMIT 15
+            """
             
-        if where_clauses:
-            cypher_query += "WHERE " + " AND ".join(where_clauses)
+            result = await neo4j_connection.aquery(cypher_query, params)
             
-        cypher_query += """
-        RETURN t.name as topic, count(*) as count
-        ORDER BY count DESC
-        LIMIT 15
-        """
-        
-        result = neo4j_connection.query(cypher_query, params)
-        
-        topic_data = [{"topic": record["topic"], "count": record["count"]} for record in result]
+            topic_data = [{"topic": record["topic"], "count": record["count"]} for record in result]
         
         if not topic_data:
             return {"message": "No trending topics found for the given criteria."}
@@ -296,6 +340,7 @@ async def get_topic_trends(
         raise HTTPException(status_code=500, detail="An error occurred while fetching topic trends.")
 
 @app.get("/api/network-graph")
+@response_cache.cached("network-graph")
 async def get_network_graph(
     query: Optional[str] = Query(None),
     start_date: Optional[str] = Query(None),
@@ -305,25 +350,19 @@ async def get_network_graph(
 ):
     """Get a network graph of authors and subreddits with filters."""
     try:
-        cypher_query = """
-        MATCH (a:Author)-[:AUTHORED_BY]-(p:Post)-[:POSTED_IN]->(s:Subreddit)
-        """
-        
         where_clauses = []
         params = {"limit": limit}
         
-        if query:
-            where_clauses.append("(p.title CONTAINS $query OR p.selftext CONTAINS $query)")
-            params["query"] = query
+        cypher_query = match_posts("(a:Author)-[:AUTHORED_BY]-(p:Post)-[:POSTED_IN]->(s:Subreddit)", query, params, where_clauses)
             
         if start_date:
-            start_timestamp = datetime.fromisoformat(start_date).timestamp()
+            start_timestamp = parse_date_bound(start_date)
             where_clauses.append("p.created_utc >= $start_timestamp")
             params["start_timestamp"] = start_timestamp
             
         if end_date:
-            end_timestamp = datetime.fromisoformat(end_date).timestamp()
-            where_clauses.append("p.created_utc <= $end_timestamp")
+            end_timestamp = parse_date_bound(end_date, end=True)
+            where_clauses.append("p.created_utc < $end_timestamp")
             params["end_timestamp"] = end_timestamp
             
         if subreddits and subreddits.strip():
@@ -335,58 +374,18 @@ async def get_network_graph(
             cypher_query += "WHERE " + " AND ".join(where_clauses)
             
         cypher_query += """
-        RETURN a.name as author, collect(distinct s.name) as subreddits
+        RETURN a.name as author, a.community as community,
+               collect(distinct {name: s.name, community: s.community}) as subreddits
         LIMIT $limit
         """
         
-        result = neo4j_connection.query(cypher_query, params)
-        
-        nodes = []
-        links = []
-        subreddit_nodes = set()
-        author_nodes = set()
-        
-        for record in result:
-            author = record["author"]
-            author_nodes.add(author)
-            
-            for subreddit in record["subreddits"]:
-                subreddit_nodes.add(subreddit)
-                links.append({"source": author, "target": subreddit, "value": 1})
-        
-        for author in author_nodes:
-            nodes.append({"id": author, "group": 1, "type": "author"})
-            
-        for subreddit in subreddit_nodes:
-            nodes.append({"id": subreddit, "group": 2, "type": "subreddit"})
-        
-        try:
-            nodes = detect_communities(nodes, links)
-        except ImportError:
-            for node in nodes:
-                node["community"] = node["group"]  
-        
-        summary_prompt = f"""
-        The network graph represents the relationships between authors and subreddits based on posts. 
-        Authors are connected to subreddits if they have posted in them. 
-        The graph contains {len(author_nodes)} authors and {len(subreddit_nodes)} subreddits, with {len(links)} connections.
-        The authors are grouped into communities based on their interactions with subreddits.
-        Provide a summary of the graph, highlighting key patterns, communities, and any notable insights.
-        """
-        
-        summary_response = groq_client.chat.completions.create(
-            model="llama3-8b-8192",
-            messages=[{"role": "user", "content": summary_prompt}],
-            max_tokens=1000
-        )
-
-        summary = summary_response.choices[0].message.content
+        author_rows = []
+        async for record in neo4j_connection.astream(cypher_query, params):
+            subreddit_pairs = [(subreddit["name"], subreddit["community"]) for subreddit in record["subreddits"]]
+            author_rows.append((record["author"], record["community"], subreddit_pairs))
         
-        return {
-            "nodes": nodes,
-            "links": links,
-            "summary": summary
-        }
+        filters = {"query": query, "start_date": start_date, "end_date": end_date, "subreddits": subreddits, "limit": limit}
+        return network_graph_payload(author_rows, filters)
     except Exception as e:
         import traceback
         error_detail = {
@@ -396,162 +395,460 @@ async def get_network_graph(
         print(f"Network Graph Error: {error_detail}")
         raise HTTPException(status_code=500, detail=str(e))
     
-@app.post("/api/ai-analysis")
-async def get_ai_analysis(search_query: SearchQuery):
-    """Get AI-powered analysis of the search results."""
-    try:
-        rephrased_query, keywords = rephrase_query(search_query.query) if search_query.query else ("", [])
+def network_graph_payload(author_rows, filters: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the network-graph response from (author, community, [(subreddit, community)]) rows."""
+    nodes = []
+    links = []
+    subreddit_nodes = {}
+    author_nodes = {}
+    
+    for author, author_community, subreddit_pairs in author_rows:
+        author_nodes[author] = author_community
         
-        search_term = rephrased_query if rephrased_query else search_query.query
+        for subreddit, subreddit_community in subreddit_pairs:
+            subreddit_nodes[subreddit] = subreddit_community
+            links.append({"source": author, "target": subreddit, "value": 1})
+    
+    for author, community_id in author_nodes.items():
+        nodes.append({"id": author, "group": 1, "type": "author", "community": community_id})
         
-        cypher_query = """
-        MATCH (p:Post)
-        """
+    for subreddit, community_id in subreddit_nodes.items():
+        nodes.append({"id": subreddit, "group": 2, "type": "subreddit", "community": community_id})
+    
+    # Communities are precomputed at ingest; only a graph that predates
+    # that stage is partitioned here.
+    nodes = detect_communities(nodes, links)
+    
+    stats = network_graph_stats(nodes, links)
+    
+    return {
+        "nodes": nodes,
+        "links": links,
+        "stats": stats,
+        "summary_signature": graph_signature(filters, stats)
+    }
+
+def network_graph_stats(nodes: List[Dict[str, Any]], links: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Counts and community sizes of a network graph; all that its summary depends on."""
+    community_sizes = Counter(node["community"] for node in nodes)
+    return {
+        "authors": sum(1 for node in nodes if node["type"] == "author"),
+        "subreddits": sum(1 for node in nodes if node["type"] == "subreddit"),
+        "links": len(links),
+        "communities": len(community_sizes),
+        "largest_communities": sorted(community_sizes.values(), reverse=True)[:5]
+    }
+
+def graph_signature(filters: Dict[str, Any], stats: Dict[str, Any]) -> str:
+    """Stable key of a network graph summary: the normalized filters plus the graph stats."""
+    payload = json.dumps({"filters": response_cache.make_key("network-graph", filters), "stats": stats}, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+@app.get("/api/dashboard")
+@response_cache.cached("dashboard")
+async def get_dashboard(
+    query: Optional[str] = Query(None),
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    subreddits: Optional[str] = Query(None),
+    limit: int = Query(100)
+):
+    """
+    Every dashboard panel for one filter set. Without a search query the
+    panels come from their own endpoints, which use the in-memory engine,
+    the daily rollups and server-side aggregation. With a query they are
+    computed from a single scan of the matching posts, with the same shapes
+    and filters as their endpoints; topic trends never use the search query,
+    so they come from /api/topic-trends. The scanned network graph is also
+    cached under its own endpoint's key for /api/network-graph/summary.
+    """
+    try:
+        if not query:
+            time_series, community_distribution, topic_trends, network_graph = await asyncio.gather(
+                get_time_series(query=query, start_date=start_date, end_date=end_date, subreddits=subreddits),
+                get_community_distribution(query=query, start_date=start_date, end_date=end_date),
+                get_topic_trends(start_date=start_date, end_date=end_date, subreddits=subreddits),
+                get_network_graph(query=query, start_date=start_date, end_date=end_date, subreddits=subreddits, limit=limit)
+            )
+            return {
+                "time_series": time_series,
+                "community_distribution": community_distribution,
+                "topic_trends": topic_trends,
+                "network_graph": network_graph
+            }
         
+        version = response_cache.version
         where_clauses = []
         params = {}
         
-        if search_term:
-            where_clauses.append("(p.title CONTAINS $query OR p.selftext CONTAINS $query)")
-            params["query"] = search_term
+        cypher_query = match_posts("(p:Post)", query, params, where_clauses)
             
-        if search_query.start_date:
-            start_timestamp = datetime.fromisoformat(search_query.start_date).timestamp()
+        if start_date:
+            start_timestamp = parse_date_bound(start_date)
             where_clauses.append("p.created_utc >= $start_timestamp")
             params["start_timestamp"] = start_timestamp
             
-        if search_query.end_date:
-            end_timestamp = datetime.fromisoformat(search_query.end_date).timestamp()
-            where_clauses.append("p.created_utc <= $end_timestamp")
+        if end_date:
+            end_timestamp = parse_date_bound(end_date, end=True)
+            where_clauses.append("p.created_utc < $end_timestamp")
             params["end_timestamp"] = end_timestamp
-            
-        if search_query.subreddits:
-            where_clauses.append("EXISTS { MATCH (p)-[:POSTED_IN]->(s:Subreddit) WHERE s.name IN $subreddit_list }")
-            params["subreddit_list"] = search_query.subreddits
+        
+        subreddit_list = [s.strip() for s in subreddits.split(",")] if subreddits and subreddits.strip() else None
             
         if where_clauses:
             cypher_query += "WHERE " + " AND ".join(where_clauses)
             
-        cypher_query += """
-        RETURN p.title as title, p.selftext as selftext, p.score as score
-        ORDER BY p.score DESC
-        LIMIT 10
-        """
+        cypher_query += DASHBOARD_POSTS_RETURN
         
-        result = neo4j_connection.query(cypher_query, params)
+        panels = DashboardPanels(subreddit_list, author_limit=limit)
+        async for record in neo4j_connection.astream(cypher_query, params):
+            panels.add(record["created_utc"], record["subreddit"], record["author"])
         
-        posts = [{"title": record["title"], "content": record["selftext"][:300], "score": record["score"]} for record in result]
+        time_series_data = panels.time_series()
+        time_series = {"data": time_series_data} if time_series_data else {"data": [], "message": "No matching posts found for the given criteria"}
         
-        post_texts = "\n\n".join([f"Title: {post['title']}\nScore: {post['score']}\nContent: {post['content']}..." for post in posts])
+        topic_trends = await get_topic_trends(start_date=start_date, end_date=end_date, subreddits=subreddits)
         
-        prompt = f"""
-        Analyze these Reddit posts related to:
-        Original query: "{search_query.query}"
-        Rephrased query: "{rephrased_query}"
-        Key themes to focus on: {', '.join(keywords) if keywords else 'any relevant themes'}
+        network_filters = {"query": query, "start_date": start_date, "end_date": end_date, "subreddits": subreddits, "limit": limit}
+        network_graph = network_graph_payload(panels.network_rows(), network_filters)
+        response_cache.put(response_cache.make_key("network-graph", network_filters), network_graph, version)
         
-        Posts:
-        {post_texts}
+        return {
+            "time_series": time_series,
+            "community_distribution": panels.community_distribution(),
+            "topic_trends": topic_trends,
+            "network_graph": network_graph
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error in dashboard endpoint: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/network-graph/summary")
+async def get_network_graph_summary(
+    query: Optional[str] = Query(None),
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    subreddits: Optional[str] = Query(None),
+    limit: int = Query(100)
+):
+    """
+    LLM summary of the network graph for the same filters as /api/network-graph.
+    The graph comes from the response cache and the summary is cached on the
+    graph signature, so the graph itself never waits for the LLM.
+    """
+    try:
+        graph = await get_network_graph(query=query, start_date=start_date, end_date=end_date, subreddits=subreddits, limit=limit)
+        stats = graph["stats"]
+        signature = graph["summary_signature"]
         
-        Provide a concise analysis covering:
-        1. Main themes
-        2. Key points
-        3. Overall sentiment
-        4. Notable patterns
+        summary_prompt = f"""
+        The network graph represents the relationships between authors and subreddits based on posts. 
+        Authors are connected to subreddits if they have posted in them. 
+        The graph contains {stats["authors"]} authors and {stats["subreddits"]} subreddits, with {stats["links"]} connections.
+        The authors are grouped into {stats["communities"]} communities based on their interactions with subreddits; the largest have {", ".join(map(str, stats["largest_communities"]))} members.
+        Provide a summary of the graph, highlighting key patterns, communities, and any notable insights.
         """
         
-        analysis = generate_groq_response(prompt, model_name="llama3-8b-8192", max_tokens=1000, max_input_tokens=4000)
+        summary = await response_cache.get_or_compute(
+            ("network-graph-summary", signature),
+            lambda: acreate_completion([{"role": "user", "content": summary_prompt}], "llama3-8b-8192", max_tokens=1000)
+        )
+        
+        return {"summary": summary, "signature": signature}
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Network Graph Summary Error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def build_analysis_prompt(search_query: SearchQuery, rephrased_query: str, keywords: List[str]) -> Tuple[str, Dict[str, Any]]:
+    """Retrieve the posts for an AI analysis and build its prompt. Returns (prompt, retrieval metadata)."""
+    search_term = rephrased_query if rephrased_query else search_query.query
+    
+    where_clauses = []
+    params = {}
+    
+    cypher_query = match_posts("(p:Post)", keywords or search_term, params, where_clauses)
+        
+    if search_query.start_date:
+        start_timestamp = parse_date_bound(search_query.start_date)
+        where_clauses.append("p.created_utc >= $start_timestamp")
+        params["start_timestamp"] = start_timestamp
+        
+    if search_query.end_date:
+        end_timestamp = parse_date_bound(search_query.end_date, end=True)
+        where_clauses.append("p.created_utc < $end_timestamp")
+        params["end_timestamp"] = end_timestamp
+        
+    if search_query.subreddits:
+        where_clauses.append("EXISTS { MATCH (p)-[:POSTED_IN]->(s:Subreddit) WHERE s.name IN $subreddit_list }")
+        params["subreddit_list"] = search_query.subreddits
+        
+    if where_clauses:
+        cypher_query += "WHERE " + " AND ".join(where_clauses)
+        
+    cypher_query += f"""
+    RETURN p.title as title, p.selftext as selftext, p.score as score
+    ORDER BY {"relevance DESC, " if "search" in params else ""}p.score DESC
+    LIMIT 10
+    """
+    
+    result = await neo4j_connection.aquery(cypher_query, params)
+    
+    posts = [{"title": record["title"], "content": record["selftext"][:300], "score": record["score"]} for record in result]
+    
+    packer = ContextPacker(separator="\n\n")
+    for rank, post in enumerate(posts):
+        packer.add(f"Title: {post['title']}\nScore: {post['score']}\nContent: {post['content']}...", priority=-rank)
+    post_texts = packer.pack()
+    
+    prompt = f"""
+    Analyze these Reddit posts related to:
+    Original query: "{search_query.query}"
+    Rephrased query: "{rephrased_query}"
+    Key themes to focus on: {', '.join(keywords) if keywords else 'any relevant themes'}
+    
+    Posts:
+    {post_texts}
+    
+    Provide a concise analysis covering:
+    1. Main themes
+    2. Key points
+    3. Overall sentiment
+    4. Notable patterns
+    """
+    
+    return prompt, {"posts": len(posts), "posts_in_prompt": len(posts) - packer.dropped, "context_tokens": packer.used_tokens}
+
+def filter_chat_data(json_data, json_index, keywords: List[str]) -> Dict[str, Any]:
+    """Keep the parts of processed_data.json that mention the keywords."""
+    filtered_json_data = filter_json_data(json_data, keywords, max_items=3, index=json_index)
+    return reduce_data_context(filtered_json_data, max_items=3)
+
+def chat_pipeline(user_message: str) -> Pipeline:
+    """
+    Retrieval stages of a chat message. The stats snapshot and the processed
+    data load while the query is rephrased; only slicing them by keyword
+    waits for the rephrase.
+    """
+    async def general_stats(rephrase, stats_snapshot):
+        _, keywords = rephrase
+        if stats_snapshot:
+            return stats_snapshot.describe(keywords[:3])
+        return await run_in_threadpool(aggregate_general_stats)
+
+    async def filtered_data(rephrase, context_index):
+        _, keywords = rephrase
+        if not keywords or context_index is None:
+            return {}
+        json_data, json_index = context_index
+        return await run_in_threadpool(filter_chat_data, json_data, json_index, keywords)
+
+    return (
+        Pipeline()
+        .add("rephrase", lambda: rephrase_query(user_message), timeout=CHAT_REPHRASE_TIMEOUT,
+             default=(user_message, extract_query_terms(user_message)))
+        .add("stats_snapshot", lambda: run_in_threadpool(stats_snapshot.get),
+             timeout=CHAT_RETRIEVAL_TIMEOUT, default=None)
+        .add("general_stats", general_stats, depends_on=("rephrase", "stats_snapshot"),
+             timeout=CHAT_RETRIEVAL_TIMEOUT, default=None)
+        .add("context_index", lambda: run_in_threadpool(context_store.get_index),
+             timeout=CHAT_RETRIEVAL_TIMEOUT, default=None)
+        .add("filtered_data", filtered_data, depends_on=("rephrase", "context_index"),
+             timeout=CHAT_RETRIEVAL_TIMEOUT, default={})
+    )
+
+def build_chat_prompt(user_message: str, rephrased_query: str, keywords: List[str], response_length: str,
+                      neo4j_data: Optional[str], filtered_json_data: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """Build the prompt for a chat message from its retrieved graph statistics and processed-data highlights."""
+    neo4j_data = neo4j_data if keywords else None
+    
+    packer = ContextPacker()
+    if neo4j_data:
+        packer.add_lines(neo4j_data)
+    if filtered_json_data:
+        packer.add_json(filtered_json_data, section="Processed data highlights:")
+    context = packer.pack()
+        
+    prompt = f"""
+    You are a data analyst assistant for Reddit data. Generate a response to this user query:
+    
+    Original query: "{user_message}"
+    Rephrased for clarity: "{rephrased_query}"
+    Keywords identified: {', '.join(keywords) if keywords else 'None identified'}
+    
+    Available Data:
+    {context or 'No matching data was found.'}
+    
+    Guidelines:
+    - Only use information present in the provided data
+    - If data is insufficient, acknowledge limitations clearly
+    - {'Keep your answer concise (1-2 short paragraphs max)' if response_length == 'concise' else 'Provide thorough analysis'}
+    - Include specific numbers/stats when available
+    - Do not make up information
+    - Structure your response in a natural, conversational way
+    - If appropriate, suggest follow-up questions the user might want to ask
+    """
+    
+    return prompt, {
+        "neo4j_data_available": bool(neo4j_data),
+        "json_data_available": bool(filtered_json_data),
+        "context_tokens": packer.used_tokens
+    }
+
+CHAT_FALLBACK_RESPONSE = "I'm having trouble processing your request due to data size limitations. Could you ask a more specific question about a particular aspect of the Reddit data?"
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+def sse_response(events) -> StreamingResponse:
+    """
+    Stream server-sent events from an async generator of (event, data) pairs.
+    Errors after the stream has started are sent as an `error` event. When the
+    client disconnects the generator is closed, which also closes the LLM stream.
+    """
+    async def body():
+        try:
+            async for event, data in events:
+                yield _sse(event, data)
+        except Exception as e:
+            print(f"Error in event stream: {str(e)}")
+            yield _sse("error", {"detail": str(e)})
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(body(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.post("/api/ai-analysis")
+async def get_ai_analysis(search_query: SearchQuery):
+    """Get AI-powered analysis of the search results."""
+    try:
+        rephrased_query, keywords = await rephrase_query(search_query.query) if search_query.query else ("", [])
+        
+        prompt, _ = await build_analysis_prompt(search_query, rephrased_query, keywords)
+        
+        analysis = await generate_groq_response(prompt, model_name="llama3-8b-8192", max_tokens=1000, max_input_tokens=4000)
         
         return {"analysis": analysis, "rephrased_query": rephrased_query, "keywords": keywords}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/ai-analysis/stream")
+async def stream_ai_analysis(search_query: SearchQuery, request: Request):
+    """
+    Streaming variant of /api/ai-analysis. Sends `rephrase`, then `context`
+    (retrieval metadata), then `token` events as the analysis is generated,
+    and finally `done`.
+    """
+    async def events():
+        rephrased_query, keywords = await rephrase_query(search_query.query) if search_query.query else ("", [])
+        yield "rephrase", {"rephrased_query": rephrased_query, "keywords": keywords}
+        
+        prompt, metadata = await build_analysis_prompt(search_query, rephrased_query, keywords)
+        yield "context", metadata
+        
+        if await request.is_disconnected():
+            return
+        async for text in stream_groq_response(prompt, model_name="llama3-8b-8192", max_tokens=1000, max_input_tokens=4000):
+            yield "token", {"text": text}
+        yield "done", {}
+
+    return sse_response(events())
     
 @app.post("/api/chatbot")
 async def chatbot(message: ChatMessage):
     """
     Interact with a chatbot that first rephrases user queries for better understanding.
+    Retrieval runs as a concurrent pipeline; `timings` reports each stage.
     """
     try:
         user_message = message.message
         response_length = detect_response_length(user_message)
         
-        rephrased_query, keywords = rephrase_query(user_message)
-        
-        neo4j_data = {}
-        try:
-            if keywords:
-                neo4j_data = query_neo4j_for_general_stats(keywords[:3])  
-        except Exception as e:
-            print(f"Neo4j query error: {str(e)}")
-        
-        filtered_json_data = {}
-        try:
-            json_file_path = os.path.join("data", "processed_data.json")
-            with open(json_file_path, 'r') as file:
-                json_data = json.load(file)
-                
-            if keywords:
-                filtered_json_data = filter_json_data(json_data, keywords)
-                filtered_json_data = reduce_data_context(filtered_json_data, max_items=3)  
-        except Exception as e:
-            print(f"JSON processing error: {str(e)}")
-        
-        combined_data = {
-            "original_query": user_message,
-            "rephrased_query": rephrased_query,
-            "keywords": keywords,
-            "data_summary": {
-                "neo4j_data_available": bool(neo4j_data),
-                "json_data_available": bool(filtered_json_data)
-            }
-        }
-        
-        if neo4j_data:
-            combined_data["neo4j_highlights"] = neo4j_data
-        
-        if filtered_json_data:
-            combined_data["json_highlights"] = filtered_json_data
-            
-        prompt = f"""
-        You are a data analyst assistant for Reddit data. Generate a response to this user query:
-        
-        Original query: "{user_message}"
-        Rephrased for clarity: "{rephrased_query}"
-        Keywords identified: {', '.join(keywords) if keywords else 'None identified'}
-        
-        Available Data:
-        {json.dumps(combined_data, indent=2, default=str)}
-        
-        Guidelines:
-        - Only use information present in the provided data
-        - If data is insufficient, acknowledge limitations clearly
-        - {'Keep your answer concise (1-2 short paragraphs max)' if response_length == 'concise' else 'Provide thorough analysis'}
-        - Include specific numbers/stats when available
-        - Do not make up information
-        - Structure your response in a natural, conversational way
-        - If appropriate, suggest follow-up questions the user might want to ask
-        """
-        
-        try:
-            final_response = generate_groq_response(
+        async def answer(rephrase, general_stats, filtered_data):
+            rephrased_query, keywords = rephrase
+            prompt, _ = build_chat_prompt(user_message, rephrased_query, keywords, response_length, general_stats, filtered_data)
+            return await generate_groq_response(
                 prompt, 
                 "llama3-8b-8192", 
                 max_tokens=800 if response_length == 'concise' else 1500,
                 max_input_tokens=4000
             )
-        except Exception as e:
-            print(f"LLM API error: {str(e)}")
-            final_response = "I'm having trouble processing your request due to data size limitations. Could you ask a more specific question about a particular aspect of the Reddit data?"
+        
+        pipeline = chat_pipeline(user_message).add(
+            "answer", answer, depends_on=("rephrase", "general_stats", "filtered_data"),
+            timeout=CHAT_ANSWER_TIMEOUT, default=CHAT_FALLBACK_RESPONSE
+        )
+        results = await pipeline.run()
+        rephrased_query, keywords = results["rephrase"]
         
         return {
-            "response": final_response,
+            "response": results["answer"],
             "rephrased_query": rephrased_query,
-            "keywords": keywords
+            "keywords": keywords,
+            "timings": pipeline.timings,
+            "total_ms": pipeline.elapsed_ms()
         }
     except Exception as e:
         print(f"Error in chatbot endpoint: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/chatbot/stream")
+async def stream_chatbot(message: ChatMessage, request: Request):
+    """
+    Streaming variant of /api/chatbot. Sends `rephrase`, then `context`
+    (which data sources were found and the retrieval timings), then `token`
+    events as the answer is generated, and finally `done` with the total time.
+    """
+    user_message = message.message
+    response_length = detect_response_length(user_message)
+
+    async def events():
+        pipeline = chat_pipeline(user_message).start()
+        try:
+            rephrased_query, keywords = await pipeline.result("rephrase")
+            yield "rephrase", {"rephrased_query": rephrased_query, "keywords": keywords}
+            
+            general_stats = await pipeline.result("general_stats")
+            filtered_data = await pipeline.result("filtered_data")
+            prompt, metadata = build_chat_prompt(user_message, rephrased_query, keywords, response_length, general_stats, filtered_data)
+            yield "context", {**metadata, "timings": pipeline.timings}
+        finally:
+            pipeline.cancel()
+        
+        if await request.is_disconnected():
+            return
+        sent_tokens = False
+        try:
+            async for text in stream_groq_response(
+                prompt,
+                "llama3-8b-8192",
+                max_tokens=800 if response_length == 'concise' else 1500,
+                max_input_tokens=4000
+            ):
+                sent_tokens = True
+                yield "token", {"text": text}
+        except Exception as e:
+            print(f"LLM API error: {str(e)}")
+            if sent_tokens:
+                raise
+            yield "token", {"text": CHAT_FALLBACK_RESPONSE}
+        yield "done", {"total_ms": pipeline.elapsed_ms()}
+
+    return sse_response(events())
+
+@app.get("/api/cache-stats")
+async def get_cache_stats():
+    """Report hit/miss counters of the response, LLM completion and rephrase caches and the context store footprint."""
+    return {
+        "responses": response_cache.stats(),
+        "completions": completion_cache_stats(),
+        "rephrase": {**rephrase_cache.stats(), **query_rewriter.stats()},
+        "context_store": context_store.stats()
+    }
+
 @app.get("/")
 async def root():
     return {"message": "Social Media Analysis API is running. Access the dashboard at /docs for API documentation."}
\ No newline at end of file
@@ -1,19 +1,80 @@
 from pydantic import BaseModel
 from typing import List, Dict, Optional, Any
-from neo4j import GraphDatabase
+import os
+from neo4j import AsyncGraphDatabase, GraphDatabase, READ_ACCESS
+
+async def _read_all(tx, query, parameters):
+    result = await tx.run(query, parameters)
+    return [record async for record in result]
+
+def _read_all_sync(tx, query, parameters):
+    return list(tx.run(query, parameters))
 
 class Neo4jConnection:
-    def __init__(self, uri, user, password):
-        self.driver = GraphDatabase.driver(uri, auth=(user, password))
-        
+    """
+    Neo4j connection with a sync driver and a lazily created async driver that
+    share the same pool settings. `query` runs auto-commit queries (schema and
+    writes); `read_query`, `aquery` and the streaming iterators use read
+    transactions so reads are routed to readers in a cluster. Pool settings
+    default to NEO4J_MAX_POOL_SIZE, NEO4J_ACQUISITION_TIMEOUT and NEO4J_FETCH_SIZE.
+    """
+
+    def __init__(self, uri, user, password, max_connection_pool_size=None,
+                 connection_acquisition_timeout=None, fetch_size=None):
+        self.uri = uri
+        self.auth = (user, password)
+        self.fetch_size = fetch_size or int(os.getenv("NEO4J_FETCH_SIZE", 1000))
+        self.pool_config = {
+            "max_connection_pool_size": max_connection_pool_size or int(os.getenv("NEO4J_MAX_POOL_SIZE", 100)),
+            "connection_acquisition_timeout": connection_acquisition_timeout or float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", 60))
+        }
+        self.driver = GraphDatabase.driver(uri, auth=self.auth, **self.pool_config)
+        self._async_driver = None
+
+    @property
+    def async_driver(self):
+        if self._async_driver is None:
+            self._async_driver = AsyncGraphDatabase.driver(self.uri, auth=self.auth, **self.pool_config)
+        return self._async_driver
+
     def close(self):
         self.driver.close()
+
+    async def aclose(self):
+        if self._async_driver is not None:
+            await self._async_driver.close()
+            self._async_driver = None
+        self.driver.close()
         
     def query(self, query, parameters=None):
         with self.driver.session() as session:
             result = session.run(query, parameters)
             return [record for record in result]
 
+    def read_query(self, query, parameters=None):
+        """Run a read query in a read transaction and return all records."""
+        with self.driver.session(default_access_mode=READ_ACCESS, fetch_size=self.fetch_size) as session:
+            return session.execute_read(_read_all_sync, query, parameters or {})
+
+    def stream(self, query, parameters=None):
+        """Yield the records of a read query as they are fetched."""
+        with self.driver.session(default_access_mode=READ_ACCESS, fetch_size=self.fetch_size) as session:
+            with session.begin_transaction() as tx:
+                yield from tx.run(query, parameters or {})
+
+    async def aquery(self, query, parameters=None):
+        """Async `read_query`."""
+        async with self.async_driver.session(default_access_mode=READ_ACCESS, fetch_size=self.fetch_size) as session:
+            return await session.execute_read(_read_all, query, parameters or {})
+
+    async def astream(self, query, parameters=None):
+        """Async `stream`."""
+        async with self.async_driver.session(default_access_mode=READ_ACCESS, fetch_size=self.fetch_size) as session:
+            async with await session.begin_transaction() as tx:
+                result = await tx.run(query, parameters or {})
+                async for record in result:
+                    yield record
+
 class RedditPost(BaseModel):
     kind: str
     data: Dict[str, Any]
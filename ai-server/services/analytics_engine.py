@@ -0,0 +1,249 @@
+import os
+import threading
+import time
+from array import array
+import numpy as np
+from services.jsonl_reader import chunked, iter_jsonl
+from services.rollup_service import SECONDS_PER_DAY
+from services.text_pipeline import analyze_selftext, create_text_pool, submit_analyses, DEFAULT_WORKERS
+from services.ingest_service import get_dataset_version
+
+ANALYTICS_BACKEND = os.getenv("ANALYTICS_BACKEND", "neo4j")
+ANALYTICS_SOURCE = os.getenv("ANALYTICS_SOURCE", "graph")
+ANALYTICS_VERSION_CHECK_INTERVAL = float(os.getenv("ANALYTICS_VERSION_CHECK_INTERVAL", 5))
+
+GRAPH_POSTS_QUERY = """
+MATCH (p:Post)
+RETURN p.id AS id, p.created_utc AS created_utc, p.score AS score, p.num_comments AS num_comments,
+       [(p)-[:POSTED_IN]->(s:Subreddit) | s.name][0] AS subreddit,
+       [(p)-[:AUTHORED_BY]->(a:Author) | a.name][0] AS author,
+       [(p)-[:DISCUSSES]->(t:Topic) | t.name] AS topics
+"""
+
+class _Dictionary:
+    """Interns strings to dense integer ids."""
+
+    def __init__(self):
+        self.ids = {}
+        self.values = []
+
+    def encode(self, value):
+        if value is None:
+            return -1
+        value_id = self.ids.get(value)
+        if value_id is None:
+            value_id = len(self.values)
+            self.ids[value] = value_id
+            self.values.append(value)
+        return value_id
+
+class _Builder:
+    """Accumulates post rows, keeping the last version of a repeated post id."""
+
+    def __init__(self):
+        self.subreddits = _Dictionary()
+        self.authors = _Dictionary()
+        self.topics = _Dictionary()
+        self.rows = {}
+
+    def add(self, post_id, created_utc, score, num_comments, subreddit, author, topics):
+        self.rows[post_id] = (
+            float(created_utc or 0),
+            int(score or 0),
+            int(num_comments or 0),
+            self.subreddits.encode(subreddit),
+            self.authors.encode(author),
+            [self.topics.encode(topic) for topic in dict.fromkeys(topics)]
+        )
+
+    def build(self):
+        rows = list(self.rows.values())
+        topic_indptr = array('q', [0])
+        topic_ids = array('i')
+        for row in rows:
+            topic_ids.extend(row[5])
+            topic_indptr.append(len(topic_ids))
+
+        return AnalyticsEngine(
+            created_utc=np.fromiter((row[0] for row in rows), dtype=np.float64, count=len(rows)),
+            score=np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows)),
+            num_comments=np.fromiter((row[2] for row in rows), dtype=np.int64, count=len(rows)),
+            subreddit_ids=np.fromiter((row[3] for row in rows), dtype=np.int32, count=len(rows)),
+            author_ids=np.fromiter((row[4] for row in rows), dtype=np.int32, count=len(rows)),
+            topic_indptr=np.frombuffer(topic_indptr, dtype=np.int64).copy(),
+            topic_ids=np.frombuffer(topic_ids, dtype=np.int32).copy(),
+            subreddit_names=self.subreddits.values,
+            author_names=self.authors.values,
+            topic_names=self.topics.values
+        )
+
+class AnalyticsEngine:
+    """
+    Columnar in-memory copy of the post graph for dashboard aggregates.
+    Posts are rows of NumPy arrays; subreddits, authors and topics are
+    dictionary-encoded, and post -> topic links are stored in CSR form.
+    Results match the Cypher endpoints for requests without a text query.
+    """
+
+    def __init__(self, created_utc, score, num_comments, subreddit_ids, author_ids,
+                 topic_indptr, topic_ids, subreddit_names, author_names, topic_names):
+        self.created_utc = created_utc
+        self.score = score
+        self.num_comments = num_comments
+        self.subreddit_ids = subreddit_ids
+        self.author_ids = author_ids
+        self.topic_indptr = topic_indptr
+        self.topic_ids = topic_ids
+        self.topic_post_ids = np.repeat(np.arange(len(created_utc), dtype=np.int64), np.diff(topic_indptr))
+        self.subreddit_names = subreddit_names
+        self.author_names = author_names
+        self.topic_names = topic_names
+        self.subreddit_lookup = {name: index for index, name in enumerate(subreddit_names)}
+        self.day_numbers = created_utc.astype(np.int64) // SECONDS_PER_DAY
+
+    @classmethod
+    def from_graph(cls, connection):
+        """Load the engine from the posts stored in Neo4j."""
+        builder = _Builder()
+        for record in connection.stream(GRAPH_POSTS_QUERY):
+            builder.add(record["id"], record["created_utc"], record["score"], record["num_comments"],
+                        record["subreddit"], record["author"], record["topics"])
+        return builder.build()
+
+    @classmethod
+    def from_jsonl(cls, jsonl_file, analyze_text=analyze_selftext, workers=DEFAULT_WORKERS, chunk_size=2000):
+        """Load the engine from a JSONL file, extracting topics like the ingest path."""
+        builder = _Builder()
+        pool = create_text_pool(workers)
+        try:
+            for chunk in chunked(iter_jsonl(jsonl_file), chunk_size):
+                post_datas = [
+                    post["data"] for post in chunk
+                    if isinstance(post, dict) and post.get("data") and "name" in post["data"]
+                ]
+                for post_data, (topics, _) in zip(post_datas, submit_analyses(pool, analyze_text, post_datas, workers)):
+                    author = post_data.get("author")
+                    builder.add(
+                        post_data["name"],
+                        post_data.get("created_utc", 0),
+                        post_data.get("score", 0),
+                        post_data.get("num_comments", 0),
+                        post_data.get("subreddit"),
+                        author if author != "[deleted]" else None,
+                        topics
+                    )
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+        return builder.build()
+
+    @property
+    def nbytes(self):
+        return sum(column.nbytes for column in (
+            self.created_utc, self.score, self.num_comments, self.subreddit_ids, self.author_ids,
+            self.topic_indptr, self.topic_ids, self.topic_post_ids, self.day_numbers
+        ))
+
+    def _mask(self, start_timestamp=None, end_timestamp=None, subreddit_list=None):
+        mask = np.ones(len(self.created_utc), dtype=bool)
+        if start_timestamp is not None:
+            mask &= self.created_utc >= start_timestamp
+        if end_timestamp is not None:
+            mask &= self.created_utc < end_timestamp
+        if subreddit_list:
+            ids = [self.subreddit_lookup[name] for name in subreddit_list if name in self.subreddit_lookup]
+            mask &= np.isin(self.subreddit_ids, np.asarray(ids, dtype=np.int32))
+        return mask
+
+    def _top(self, ids, names, limit):
+        counts = np.bincount(ids, minlength=len(names))
+        order = np.argsort(-counts, kind="stable")[:limit]
+        return [(names[index], int(counts[index])) for index in order if counts[index] > 0]
+
+    def time_series(self, start_timestamp=None, end_timestamp=None, subreddit_list=None):
+        """Post counts per UTC day, like /api/time-series."""
+        mask = self._mask(start_timestamp, end_timestamp, subreddit_list) & (self.subreddit_ids >= 0)
+        days, counts = np.unique(self.day_numbers[mask], return_counts=True)
+        return [
+            {"date": np.datetime64(int(day), "D").item().isoformat(), "count": int(count)}
+            for day, count in zip(days, counts)
+        ]
+
+    def community_distribution(self, start_timestamp=None, end_timestamp=None, limit=10):
+        """Top subreddits by post count, like /api/community-distribution."""
+        mask = self._mask(start_timestamp, end_timestamp) & (self.subreddit_ids >= 0)
+        return [
+            {"name": name, "value": count}
+            for name, count in self._top(self.subreddit_ids[mask], self.subreddit_names, limit)
+        ]
+
+    def topic_trends(self, start_timestamp=None, end_timestamp=None, subreddit_list=None, limit=15):
+        """Top topics by post mentions, like /api/topic-trends."""
+        mask = self._mask(start_timestamp, end_timestamp, subreddit_list)
+        selected = mask[self.topic_post_ids]
+        return [
+            {"topic": name, "count": count}
+            for name, count in self._top(self.topic_ids[selected], self.topic_names, limit)
+        ]
+
+_engine = None
+_engine_version = None
+_engine_checked_at = float("-inf")
+_engine_lock = threading.Lock()
+
+def _load_dataset_version(connection):
+    try:
+        return get_dataset_version(connection.driver)
+    except Exception as e:
+        print(f"Error loading dataset version: {str(e)}")
+        return _engine_version
+
+def get_analytics_engine(connection, version=None):
+    """
+    Return the shared in-memory engine when ANALYTICS_BACKEND=memory, loading
+    it on first use from the graph or from data.jsonl (ANALYTICS_SOURCE).
+    The engine is tagged with the dataset version it was loaded for and is
+    reloaded when that changes, so ingests by other workers or by
+    scripts/neo4j_script.py are picked up. Callers that know the current
+    `version` (the response cache does) pass it; otherwise it is looked up
+    at most every ANALYTICS_VERSION_CHECK_INTERVAL seconds.
+    """
+    global _engine, _engine_version, _engine_checked_at
+    if ANALYTICS_BACKEND != "memory":
+        return None
+
+    if _engine is not None:
+        if version is not None and version == _engine_version:
+            return _engine
+        if version is None and time.monotonic() - _engine_checked_at < ANALYTICS_VERSION_CHECK_INTERVAL:
+            return _engine
+
+    with _engine_lock:
+        if version is None:
+            if _engine is not None and time.monotonic() - _engine_checked_at < ANALYTICS_VERSION_CHECK_INTERVAL:
+                return _engine
+            version = _load_dataset_version(connection)
+            _engine_checked_at = time.monotonic()
+        if _engine is None or version != _engine_version:
+            _engine = load_analytics_engine(connection)
+            _engine_version = version
+        return _engine
+
+def load_analytics_engine(connection, jsonl_file="data/data.jsonl"):
+    """Build a fresh engine from the configured source."""
+    start_time = time.perf_counter()
+    if ANALYTICS_SOURCE == "jsonl":
+        engine = AnalyticsEngine.from_jsonl(jsonl_file)
+    else:
+        engine = AnalyticsEngine.from_graph(connection)
+    print(f"Loaded analytics engine with {len(engine.created_utc)} posts "
+          f"({engine.nbytes / 1e6:.1f} MB) in {time.perf_counter() - start_time:.1f}s")
+    return engine
+
+def reset_analytics_engine():
+    """Drop the loaded engine so the next request reloads it."""
+    global _engine, _engine_version, _engine_checked_at
+    with _engine_lock:
+        _engine = None
+        _engine_version = None
+        _engine_checked_at = float("-inf")
@@ -0,0 +1,144 @@
+import asyncio
+import functools
+import os
+import time
+from collections import OrderedDict
+from starlette.concurrency import run_in_threadpool
+
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", 300))
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", 512))
+DATASET_VERSION_CHECK_INTERVAL = float(os.getenv("DATASET_VERSION_CHECK_INTERVAL", 5))
+
+def _normalize_param(name, value):
+    """Normalize a filter value so equivalent requests share a cache key."""
+    if isinstance(value, str):
+        value = " ".join(value.split())
+        if not value:
+            return None
+        if name == "query":
+            return value.lower()
+        if name == "subreddits":
+            return ",".join(sorted({part.strip() for part in value.split(",") if part.strip()}))
+    if isinstance(value, (list, tuple)):
+        return tuple(sorted(value))
+    return value
+
+class ResponseCache:
+    """
+    TTL + LRU cache for read-only endpoint responses. Entries are tagged with
+    the dataset version and dropped when it changes; concurrent misses for the
+    same key share a single computation.
+    """
+
+    def __init__(self, max_entries=RESPONSE_CACHE_SIZE, ttl_seconds=RESPONSE_CACHE_TTL,
+                 version_loader=None, version_check_interval=DATASET_VERSION_CHECK_INTERVAL):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.version_loader = version_loader
+        self.version_check_interval = version_check_interval
+        self.version = None
+        self._version_checked_at = float("-inf")
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def make_key(self, namespace, params):
+        return (namespace, tuple(sorted((name, _normalize_param(name, value)) for name, value in params.items())))
+
+    async def _refresh_version(self):
+        if self.version_loader is None:
+            return
+        now = time.monotonic()
+        if now - self._version_checked_at < self.version_check_interval:
+            return
+        self._version_checked_at = now
+        try:
+            version = await run_in_threadpool(self.version_loader)
+        except Exception as e:
+            print(f"Error loading dataset version: {str(e)}")
+            return
+        if version != self.version:
+            self.set_version(version)
+
+    def set_version(self, version):
+        """Switch to a new dataset version, dropping every cached response."""
+        self.version = version
+        self._entries.clear()
+
+    async def get_or_compute(self, key, compute):
+        """
+        Return the cached value for `key` or compute it. The computation runs
+        in a task owned by the cache, so a caller that is cancelled (timed out
+        or disconnected) does not cancel it for the others waiting on it.
+        """
+        await self._refresh_version()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, version, value = entry
+            if expires_at > time.monotonic() and version == self.version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(compute())
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._finish, key, self.version))
+        return await asyncio.shield(task)
+
+    def _finish(self, key, version, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if task.cancelled():
+            return
+        if task.exception() is None:
+            self._store(key, task.result(), version)
+
+    def put(self, key, value, version=None):
+        """
+        Cache a value computed elsewhere, e.g. one part of a combined response.
+        `version` is the dataset version the value was computed from; it is
+        not stored if the version changed since.
+        """
+        self._store(key, value, self.version if version is None else version)
+
+    def _store(self, key, value, version):
+        if version != self.version:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, version, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def cached(self, namespace):
+        """Decorate an async endpoint so its responses are cached by its parameters."""
+        def decorator(endpoint):
+            @functools.wraps(endpoint)
+            async def wrapper(**kwargs):
+                return await self.get_or_compute(self.make_key(namespace, kwargs), lambda: endpoint(**kwargs))
+            return wrapper
+        return decorator
+
+    def stats(self):
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            "dataset_version": self.version
+        }
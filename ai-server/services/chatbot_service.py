@@ -1,8 +1,4 @@
-from groq import Client as GroqClient
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
+from services.llm_service import create_completion
 
 def extract_query_terms(query):
     """
@@ -29,17 +25,13 @@ def extract_query_terms(query):
 def generate_groq_response_with_model(prompt, model_name, max_tokens=1000):
     """Generate a response using a specified Groq model."""
     try:
-        groq_client = GroqClient(api_key=os.getenv("GROQ_API_KEY"))
-
-        response = groq_client.chat.completions.create(
-            model=model_name, 
-            messages=[{"role": "user", "content": prompt}],
+        return create_completion(
+            [{"role": "user", "content": prompt}],
+            model_name,
             max_tokens=max_tokens,
             temperature=0.7,
             top_p=0.9
         )
-        
-        return response.choices[0].message.content
     except Exception as e:
         return f"Error generating response with {model_name}: {str(e)}"
     
@@ -76,15 +68,7 @@ def generate_groq_response_with_file(prompt, file_path, model_name="llama3-8b-81
             ]}
         ]
 
-        groq_client = GroqClient(api_key=os.getenv("GROQ_API_KEY"))
-        
-        response = groq_client.chat.completions.create(
-            model=model_name,
-            messages=messages,
-            max_tokens=max_tokens
-        )
-        
-        return response.choices[0].message.content
+        return create_completion(messages, model_name, max_tokens=max_tokens)
     except Exception as e:
         print(f"Error in generate_groq_response_with_file: {str(e)}")
         return f"Error generating response: {str(e)}"
@@ -101,14 +85,7 @@ def generate_groq_response(prompt: str, model_name: str, max_tokens: int = 1000,
         prompt = prompt[:half_length] + "\n...[content truncated for brevity]...\n" + prompt[-half_length:]
     
     try:
-        groq_client = GroqClient(api_key=os.getenv("GROQ_API_KEY"))
-        
-        response = groq_client.chat.completions.create(
-            model=model_name,
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=max_tokens
-        )
-        return response.choices[0].message.content
+        return create_completion([{"role": "user", "content": prompt}], model_name, max_tokens=max_tokens)
     except Exception as e:
         print(f"Error calling Groq API: {str(e)}")
         raise e
\ No newline at end of file
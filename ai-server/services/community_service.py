@@ -0,0 +1,195 @@
+import os
+import time
+from collections import defaultdict, Counter
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from services.text_pipeline import DEFAULT_WORKERS
+from services.graph_core import CSRGraph, louvain
+from services.ingest_service import _run_query, bump_dataset_version
+
+COMMUNITY_TX_SIZE = int(os.getenv("COMMUNITY_TX_SIZE", 5000))
+COMMUNITY_SEED = int(os.getenv("COMMUNITY_SEED", 42))
+MIN_POOL_COMPONENT_EDGES = int(os.getenv("MIN_POOL_COMPONENT_EDGES", 1000))
+
+AUTHOR_SUBREDDIT_EDGES_QUERY = """
+MATCH (a:Author)<-[:AUTHORED_BY]-(p:Post)-[:POSTED_IN]->(s:Subreddit)
+RETURN a.name AS author, s.name AS subreddit, count(p) AS weight
+"""
+
+UNASSIGNED_EDGES_QUERY = """
+MATCH (a:Author)<-[:AUTHORED_BY]-(p:Post)-[:POSTED_IN]->(s:Subreddit)
+WHERE a.community IS NULL OR s.community IS NULL
+RETURN a.name AS author, a.community AS author_community,
+       s.name AS subreddit, s.community AS subreddit_community, count(p) AS weight
+"""
+
+MAX_COMMUNITY_QUERY = """
+OPTIONAL MATCH (n) WHERE (n:Author OR n:Subreddit) AND n.community IS NOT NULL
+RETURN max(n.community) AS max_community
+"""
+
+SET_AUTHOR_COMMUNITY_QUERY = """
+UNWIND $rows AS row
+MATCH (a:Author {name: row.name})
+SET a.community = row.community
+"""
+
+SET_SUBREDDIT_COMMUNITY_QUERY = """
+UNWIND $rows AS row
+MATCH (s:Subreddit {name: row.name})
+SET s.community = row.community
+"""
+
+AUTHOR = "author"
+SUBREDDIT = "subreddit"
+
+def _connected_components(edges):
+    """Group (author, subreddit, weight) edges by connected component (union-find)."""
+    parent = {}
+
+    def find(node):
+        root = node
+        while parent.setdefault(root, root) != root:
+            root = parent[root]
+        while parent[node] != root:
+            parent[node], node = root, parent[node]
+        return root
+
+    for author, subreddit, _ in edges:
+        root_a, root_s = find((AUTHOR, author)), find((SUBREDDIT, subreddit))
+        if root_a != root_s:
+            parent[root_a] = root_s
+
+    components = defaultdict(list)
+    for edge in edges:
+        components[find((SUBREDDIT, edge[1]))].append(edge)
+    return sorted(components.values(), key=len, reverse=True)
+
+def partition_component(edges, seed=COMMUNITY_SEED):
+    """Louvain partition of one component; returns {(kind, name): local community}."""
+    names = list(dict.fromkeys(node for author, subreddit, _ in edges for node in ((AUTHOR, author), (SUBREDDIT, subreddit))))
+    ids = {name: index for index, name in enumerate(names)}
+    graph = CSRGraph.from_edges(
+        np.fromiter((ids[(AUTHOR, edge[0])] for edge in edges), dtype=np.int32, count=len(edges)),
+        np.fromiter((ids[(SUBREDDIT, edge[1])] for edge in edges), dtype=np.int32, count=len(edges)),
+        np.fromiter((edge[2] for edge in edges), dtype=np.float64, count=len(edges)),
+        len(names)
+    )
+    return dict(zip(names, louvain(graph, seed=seed).tolist()))
+
+def compute_communities(edges, workers=DEFAULT_WORKERS):
+    """
+    Assign a global community id to every author and subreddit of the weighted
+    author-subreddit graph. Connected components are partitioned
+    independently; large ones run in a process pool. Ids are deterministic
+    for the same graph (fixed Louvain seed, components in size order).
+    """
+    components = _connected_components(edges)
+    large = [component for component in components if len(component) >= MIN_POOL_COMPONENT_EDGES]
+
+    partitions = []
+    if workers and workers > 1 and len(large) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(large))) as pool:
+            partitions.extend(pool.map(partition_component, large))
+    else:
+        partitions.extend(partition_component(component) for component in large)
+    partitions.extend(partition_component(component) for component in components[len(large):])
+
+    assignment = {}
+    offset = 0
+    for partition in partitions:
+        local_ids = sorted(set(partition.values()))
+        remap = {local_id: offset + index for index, local_id in enumerate(local_ids)}
+        for node, local_id in partition.items():
+            assignment[node] = remap[local_id]
+        offset += len(local_ids)
+    return assignment
+
+def assign_new_nodes(edges, next_community):
+    """
+    Give communities to nodes that have none, keeping existing assignments.
+    `edges` are (author, author_community, subreddit, subreddit_community,
+    weight) rows touching at least one unassigned node. Each unassigned node
+    joins its neighbors' heaviest community, repeating so new nodes can pick
+    up labels from other new nodes; isolated new clusters get fresh ids.
+    """
+    labels = {}
+    neighbors = defaultdict(list)
+    for author, author_community, subreddit, subreddit_community, weight in edges:
+        author_node, subreddit_node = (AUTHOR, author), (SUBREDDIT, subreddit)
+        if author_community is not None:
+            labels[author_node] = author_community
+        if subreddit_community is not None:
+            labels[subreddit_node] = subreddit_community
+        neighbors[author_node].append((subreddit_node, weight))
+        neighbors[subreddit_node].append((author_node, weight))
+
+    unassigned = [node for node in neighbors if node not in labels]
+    assignment = {}
+
+    changed = True
+    while changed:
+        changed = False
+        for node in unassigned:
+            if node in assignment:
+                continue
+            votes = Counter()
+            for neighbor, weight in neighbors[node]:
+                label = labels.get(neighbor, assignment.get(neighbor))
+                if label is not None:
+                    votes[label] += weight
+            if votes:
+                assignment[node] = max(votes.items(), key=lambda item: (item[1], -item[0]))[0]
+                changed = True
+
+    for node in unassigned:
+        if node in assignment:
+            continue
+        stack = [node]
+        assignment[node] = next_community
+        while stack:
+            current = stack.pop()
+            for neighbor, _ in neighbors[current]:
+                if neighbor not in labels and neighbor not in assignment:
+                    assignment[neighbor] = next_community
+                    stack.append(neighbor)
+        next_community += 1
+
+    return assignment
+
+def _write_assignment(session, assignment, tx_size):
+    rows = {AUTHOR: [], SUBREDDIT: []}
+    for (kind, name), community_id in assignment.items():
+        rows[kind].append({"name": name, "community": community_id})
+
+    for kind, query in ((AUTHOR, SET_AUTHOR_COMMUNITY_QUERY), (SUBREDDIT, SET_SUBREDDIT_COMMUNITY_QUERY)):
+        for start in range(0, len(rows[kind]), tx_size):
+            chunk = rows[kind][start:start + tx_size]
+            session.execute_write(_run_query, query, rows=chunk)
+
+def update_communities(driver, incremental=False, workers=DEFAULT_WORKERS, tx_size=COMMUNITY_TX_SIZE):
+    """
+    Store a `community` property on every Author and Subreddit node. A full
+    run partitions the whole author-subreddit graph; an incremental run only
+    assigns nodes that have no community yet. Returns the number of nodes written.
+    """
+    start_time = time.perf_counter()
+
+    with driver.session() as session:
+        if incremental:
+            records = session.run(UNASSIGNED_EDGES_QUERY)
+            edges = [(record["author"], record["author_community"], record["subreddit"],
+                      record["subreddit_community"], record["weight"]) for record in records]
+            max_community = session.run(MAX_COMMUNITY_QUERY).single()["max_community"]
+            assignment = assign_new_nodes(edges, 0 if max_community is None else max_community + 1)
+        else:
+            records = session.run(AUTHOR_SUBREDDIT_EDGES_QUERY)
+            edges = [(record["author"], record["subreddit"], record["weight"]) for record in records]
+            assignment = compute_communities(edges, workers)
+
+        _write_assignment(session, assignment, tx_size)
+
+    if assignment:
+        bump_dataset_version(driver)
+    print(f"Assigned communities to {len(assignment)} nodes in {time.perf_counter() - start_time:.1f}s")
+    return len(assignment)
@@ -0,0 +1,112 @@
+import os
+import sys
+import threading
+import time
+from services.jsonl_reader import _loads
+from services.json_index import JsonIndex
+
+PROCESSED_DATA_PATH = os.getenv("PROCESSED_DATA_PATH", os.path.join("data", "processed_data.json"))
+
+def _deep_sizeof(data):
+    """Approximate the memory held by a decoded JSON tree."""
+    seen = set()
+    stack = [data]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+    return total
+
+class ContextStore:
+    """
+    Keeps a decoded JSON file in memory across requests. Each `get` compares
+    the file's mtime and size with the loaded copy and reloads it when they
+    changed, so an updated file is picked up without a restart. A keyword
+    index of the data is built on first use after each load.
+    """
+
+    def __init__(self, path=PROCESSED_DATA_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data = None
+        self._signature = None
+        self._index = None
+        self.loaded_at = None
+        self.load_seconds = None
+        self.nbytes = 0
+        self.reloads = 0
+
+    def _file_signature(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self):
+        """Return the decoded file, loading or reloading it if needed."""
+        signature = self._file_signature()
+        if signature == self._signature:
+            return self._data
+
+        with self._lock:
+            signature = self._file_signature()
+            if signature != self._signature:
+                self._load(signature)
+            return self._data
+
+    def get_index(self):
+        """Return the data and its `JsonIndex`, building the index if needed."""
+        data = self.get()
+        index = self._index
+        if index is None or index.data is not data:
+            with self._lock:
+                index = self._index
+                if index is None or index.data is not data:
+                    start_time = time.perf_counter()
+                    index = JsonIndex(data)
+                    if self._data is data:
+                        self._index = index
+                    print(f"Indexed {self.path} ({len(index.vocabulary)} tokens, {len(index.paths)} entries) "
+                          f"in {time.perf_counter() - start_time:.2f}s")
+        return data, index
+
+    def reset(self):
+        """Drop the loaded data and index so the next `get` reloads the file."""
+        with self._lock:
+            self._data = None
+            self._index = None
+            self._signature = None
+
+    def _load(self, signature):
+        start_time = time.perf_counter()
+        with open(self.path, 'rb') as file:
+            data = _loads(file.read())
+
+        self._data = data
+        self._index = None
+        self._signature = signature
+        self.loaded_at = time.time()
+        self.load_seconds = time.perf_counter() - start_time
+        self.nbytes = _deep_sizeof(data)
+        self.reloads += 1
+        print(f"Loaded {self.path} ({self.nbytes / 1e6:.1f} MB in memory) in {self.load_seconds:.2f}s")
+
+    def stats(self):
+        return {
+            "path": self.path,
+            "loaded": self._signature is not None,
+            "file_bytes": self._signature[1] if self._signature else None,
+            "memory_bytes": self.nbytes,
+            "loaded_at": self.loaded_at,
+            "load_seconds": self.load_seconds,
+            "indexed_tokens": len(self._index.vocabulary) if self._index else None,
+            "reloads": self.reloads
+        }
+
+context_store = ContextStore()
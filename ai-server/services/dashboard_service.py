@@ -0,0 +1,57 @@
+from collections import Counter
+from datetime import datetime, timezone
+from services.rollup_service import post_day_number, SECONDS_PER_DAY
+
+DASHBOARD_POSTS_RETURN = """
+RETURN p.created_utc AS created_utc,
+       [(p)-[:POSTED_IN]->(s:Subreddit) | [s.name, s.community]][0] AS subreddit,
+       [(p)-[:AUTHORED_BY]->(a:Author) | [a.name, a.community]][0] AS author
+"""
+
+def _day_iso(day_number):
+    return datetime.fromtimestamp(day_number * SECONDS_PER_DAY, tz=timezone.utc).date().isoformat()
+
+class DashboardPanels:
+    """
+    Accumulates the time series, subreddit distribution and network panels
+    of a searched dashboard in one pass over the matched posts. Each panel keeps the filters of its own endpoint: the subreddit
+    distribution ignores `subreddit_list`, the other panels apply it, and the
+    network keeps the first `author_limit` authors seen.
+    """
+
+    def __init__(self, subreddit_list=None, author_limit=100):
+        self.subreddit_list = set(subreddit_list) if subreddit_list else None
+        self.author_limit = author_limit
+        self.day_counts = Counter()
+        self.subreddit_counts = Counter()
+        self.authors = {}
+        self.subreddit_communities = {}
+
+    def add(self, created_utc, subreddit, author):
+        """Count one post; `subreddit` and `author` are [name, community] pairs or None."""
+        subreddit_name = subreddit[0] if subreddit else None
+        selected = self.subreddit_list is None or subreddit_name in self.subreddit_list
+
+        if subreddit_name is not None:
+            self.subreddit_counts[subreddit_name] += 1
+            if selected:
+                self.day_counts[post_day_number(created_utc)] += 1
+
+        if author and subreddit_name is not None and selected:
+            author_name, author_community = author
+            entry = self.authors.get(author_name)
+            if entry is None:
+                if len(self.authors) >= self.author_limit:
+                    return
+                entry = self.authors[author_name] = (author_community, {})
+            entry[1].setdefault(subreddit_name, subreddit[1])
+
+    def time_series(self):
+        return [{"date": _day_iso(day), "count": count} for day, count in sorted(self.day_counts.items())]
+
+    def community_distribution(self, limit=10):
+        return [{"name": name, "value": count} for name, count in self.subreddit_counts.most_common(limit)]
+
+    def network_rows(self):
+        """(author, community, [(subreddit, community), ...]) rows, like the network-graph query."""
+        return [(author, community, list(subreddits.items())) for author, (community, subreddits) in self.authors.items()]
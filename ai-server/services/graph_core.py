@@ -0,0 +1,234 @@
+import numpy as np
+
+MODULARITY_TOLERANCE = 1e-7
+
+def _combine_edges(sources, targets, weights, num_nodes):
+    """Sum the weights of repeated (source, target) pairs; pairs come back sorted."""
+    keys = sources.astype(np.int64) * num_nodes + targets
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    combined = np.bincount(inverse, weights=weights, minlength=len(unique_keys))
+    return (unique_keys // num_nodes).astype(np.int32), (unique_keys % num_nodes).astype(np.int32), combined
+
+def _first_max_per_group(groups, values):
+    """
+    Position of the largest value in each run of equal `groups` (which must be
+    sorted), preferring the earliest position on ties. Linear, no sorting.
+    """
+    if len(groups) == 0:
+        return np.zeros(0, dtype=np.int64)
+    starts = np.flatnonzero(np.concatenate(([True], groups[1:] != groups[:-1])))
+    group_of = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, len(groups))))
+    best = np.maximum.reduceat(values, starts)
+    positions = np.where(values == best[group_of], np.arange(len(values)), len(values))
+    return np.minimum.reduceat(positions, starts)
+
+class CSRGraph:
+    """
+    Undirected weighted graph stored as a symmetric CSR adjacency matrix:
+    neighbors of node i are `indices[indptr[i]:indptr[i + 1]]` with weights
+    `weights[...]` in the same slots. Node names are interned to dense ids
+    (`names[i]` / `ids[name]`). A self-loop is stored once, on the diagonal.
+    """
+
+    def __init__(self, indptr, indices, weights, names=None):
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.num_nodes = len(indptr) - 1
+        self.names = names if names is not None else list(range(self.num_nodes))
+        self.ids = {name: index for index, name in enumerate(self.names)}
+        self._rows = None
+
+    @classmethod
+    def from_edges(cls, sources, targets, weights=None, num_nodes=None, names=None):
+        """Build the graph from parallel arrays of edge endpoints (ids) and weights."""
+        sources = np.asarray(sources, dtype=np.int32)
+        targets = np.asarray(targets, dtype=np.int32)
+        weights = np.ones(len(sources)) if weights is None else np.asarray(weights, dtype=np.float64)
+        if num_nodes is None:
+            num_nodes = len(names) if names is not None else int(max(sources.max(initial=-1), targets.max(initial=-1))) + 1
+
+        loops = sources == targets
+        both_sources = np.concatenate([sources, targets[~loops]])
+        both_targets = np.concatenate([targets, sources[~loops]])
+        both_weights = np.concatenate([weights, weights[~loops]])
+        rows, indices, combined = _combine_edges(both_sources, both_targets, both_weights, max(num_nodes, 1))
+
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=num_nodes), out=indptr[1:])
+        return cls(indptr, indices, combined.astype(np.float32), names)
+
+    @classmethod
+    def from_nodes_links(cls, nodes, links):
+        """Build the graph from the `nodes`/`links` lists of the network-graph endpoint."""
+        names = [node["id"] for node in nodes]
+        ids = {name: index for index, name in enumerate(names)}
+        for link in links:
+            for name in (link["source"], link["target"]):
+                if name not in ids:
+                    ids[name] = len(names)
+                    names.append(name)
+
+        sources = np.fromiter((ids[link["source"]] for link in links), dtype=np.int32, count=len(links))
+        targets = np.fromiter((ids[link["target"]] for link in links), dtype=np.int32, count=len(links))
+        weights = np.fromiter((link.get("value", 1) for link in links), dtype=np.float64, count=len(links))
+        return cls.from_edges(sources, targets, weights, len(names), names)
+
+    @property
+    def rows(self):
+        """Row (source node) of every stored adjacency entry."""
+        if self._rows is None:
+            self._rows = np.repeat(np.arange(self.num_nodes, dtype=np.int32), np.diff(self.indptr))
+        return self._rows
+
+    @property
+    def nbytes(self):
+        return self.indptr.nbytes + self.indices.nbytes + self.weights.nbytes
+
+    def degree(self):
+        """Number of distinct neighbors of each node (a self-loop counts once)."""
+        return np.diff(self.indptr)
+
+    def weighted_degree(self):
+        """Sum of each node's edge weights; the matrix row sums."""
+        return np.bincount(self.rows, weights=self.weights, minlength=self.num_nodes)
+
+    def degree_centrality(self):
+        """Share of the other nodes each node is linked to (self-loops ignored)."""
+        if self.num_nodes <= 1:
+            return np.ones(self.num_nodes)
+        degree = self.degree() - np.bincount(self.rows[self.rows == self.indices], minlength=self.num_nodes)
+        return degree / (self.num_nodes - 1)
+
+    def pagerank(self, alpha=0.85, max_iter=100, tol=1e-6):
+        """Weighted PageRank by power iteration over the CSR arrays."""
+        if self.num_nodes == 0:
+            return np.zeros(0)
+        strength = self.weighted_degree()
+        dangling = strength == 0
+        share = np.divide(self.weights, strength[self.rows], out=np.zeros(len(self.weights)), where=~dangling[self.rows])
+        rank = np.full(self.num_nodes, 1.0 / self.num_nodes)
+        for _ in range(max_iter):
+            spread = np.bincount(self.indices, weights=rank[self.rows] * share, minlength=self.num_nodes)
+            updated = alpha * (spread + rank[dangling].sum() / self.num_nodes) + (1 - alpha) / self.num_nodes
+            converged = np.abs(updated - rank).sum() < self.num_nodes * tol
+            rank = updated
+            if converged:
+                break
+        return rank
+
+    def modularity(self, labels):
+        """Newman modularity of a partition given as one label per node."""
+        total = self.weights.sum()
+        if total == 0:
+            return 0.0
+        internal = self.weights[labels[self.rows] == labels[self.indices]].sum()
+        community_degree = np.bincount(labels, weights=self.weighted_degree())
+        return float(internal / total - np.square(community_degree / total).sum())
+
+    def aggregate(self, labels):
+        """Collapse each community (labels must be dense 0..k-1) into one node."""
+        num_communities = int(labels.max()) + 1 if len(labels) else 0
+        rows, indices, weights = _combine_edges(labels[self.rows], labels[self.indices], self.weights, max(num_communities, 1))
+        indptr = np.zeros(num_communities + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=num_communities), out=indptr[1:])
+        return CSRGraph(indptr, indices, weights.astype(np.float32))
+
+def _best_moves(graph, labels, node_degree, community_degree, total):
+    """
+    For every node, the neighboring community with the best modularity gain
+    and that gain, plus the gain of staying put. Pairs (node, community) are
+    aggregated with one sort over all adjacency entries.
+    """
+    rows, indices = graph.rows, graph.indices
+    off_diagonal = rows != indices
+    pair_rows = rows[off_diagonal]
+    pair_communities = labels[indices[off_diagonal]]
+    rows_out, communities, link_weight = _combine_edges(
+        pair_rows, pair_communities, graph.weights[off_diagonal], max(graph.num_nodes, 1)
+    )
+
+    own = labels[rows_out] == communities
+    other_degree = community_degree[communities] - np.where(own, node_degree[rows_out], 0.0)
+    gain = link_weight / total - node_degree[rows_out] * other_degree / (total * total)
+
+    stay = -node_degree * (community_degree[labels] - node_degree) / (total * total)
+    stay_links = np.zeros(graph.num_nodes)
+    stay_links[rows_out[own]] = link_weight[own]
+    stay += stay_links / total
+
+    best = _first_max_per_group(rows_out, gain)
+    return rows_out[best], communities[best], gain[best], stay
+
+def _local_moves(graph, rng, max_sweeps=64, min_improvement=1e-5):
+    """
+    Louvain's local moving phase, vectorized: every sweep computes the best
+    move of all nodes at once and applies the improving ones together. Two
+    singletons only merge towards the lower label, so neighbors do not just
+    swap communities. A sweep that lowers modularity is undone and retried
+    with a random subset of the moves; the phase ends once a sweep gains
+    less than `min_improvement`.
+    """
+    labels = np.arange(graph.num_nodes, dtype=np.int64)
+    node_degree = graph.weighted_degree()
+    total = node_degree.sum()
+    if total == 0:
+        return labels
+
+    quality = graph.modularity(labels)
+    fraction = 1.0
+    for _ in range(max_sweeps):
+        community_size = np.bincount(labels, minlength=graph.num_nodes)
+        community_degree = np.bincount(labels, weights=node_degree, minlength=graph.num_nodes)
+        nodes, targets, gain, stay = _best_moves(graph, labels, node_degree, community_degree, total)
+        current = labels[nodes]
+        improving = (targets != current) & (gain > stay[nodes] + MODULARITY_TOLERANCE)
+        improving &= ~((community_size[current] == 1) & (community_size[targets] == 1) & (targets > current))
+        if not improving.any():
+            break
+
+        moving = improving & (rng.random(len(nodes)) < fraction) if fraction < 1 else improving
+        if not moving.any():
+            continue
+        candidate = labels.copy()
+        candidate[nodes[moving]] = targets[moving]
+        candidate_quality = graph.modularity(candidate)
+        if candidate_quality > quality + MODULARITY_TOLERANCE:
+            improvement = candidate_quality - quality
+            labels, quality = candidate, candidate_quality
+            fraction = min(1.0, fraction * 2)
+            if improvement < min_improvement:
+                break
+        else:
+            fraction /= 2
+            if fraction < 1e-3:
+                break
+    return labels
+
+def louvain(graph, seed=42, max_levels=32):
+    """
+    Louvain community detection on a `CSRGraph`: alternate vectorized local
+    moves with aggregation of communities into nodes until modularity stops
+    improving. Returns a dense community id per node, largest community first.
+    """
+    rng = np.random.default_rng(seed)
+    membership = np.arange(graph.num_nodes, dtype=np.int64)
+    level = graph
+    for _ in range(max_levels):
+        labels = _local_moves(level, rng)
+        _, labels = np.unique(labels, return_inverse=True)
+        if labels.max(initial=-1) + 1 == level.num_nodes:
+            break
+        membership = labels[membership]
+        level = level.aggregate(labels)
+    return _relabel_by_size(membership)
+
+def _relabel_by_size(labels):
+    """Renumber communities 0..k-1 by decreasing size (ties by first member)."""
+    if len(labels) == 0:
+        return labels
+    unique, first_seen, inverse, counts = np.unique(labels, return_index=True, return_inverse=True, return_counts=True)
+    order = np.lexsort((first_seen, -counts))
+    rank = np.empty(len(unique), dtype=np.int64)
+    rank[order] = np.arange(len(unique))
+    return rank[inverse]
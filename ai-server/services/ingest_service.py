@@ -0,0 +1,475 @@
+import hashlib
+import heapq
+import json
+import os
+import time
+from collections import defaultdict
+from services.jsonl_reader import chunked, iter_jsonl
+from services.text_pipeline import create_text_pool, submit_analyses, DEFAULT_WORKERS
+from services.rollup_service import refresh_daily_rollups, post_day_number
+from services.stats_service import refresh_stats_snapshot
+
+DEFAULT_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", 1000))
+DEFAULT_TX_SIZE = int(os.getenv("INGEST_TX_SIZE", 5000))
+INTERACTION_TOP_K = int(os.getenv("INTERACTION_TOP_K", 20))
+INTERACTION_MAX_PARTNERS = int(os.getenv("INTERACTION_MAX_PARTNERS", 200))
+PREFIX_SAMPLE_BLOCKS = int(os.getenv("INGEST_PREFIX_SAMPLE_BLOCKS", 64))
+PREFIX_BLOCK_SIZE = 4096
+
+POST_QUERY = """
+UNWIND $rows AS row
+MERGE (p:Post {id: row.id})
+SET p.title = row.title,
+    p.selftext = row.selftext,
+    p.created_utc = row.created_utc,
+    p.score = row.score,
+    p.num_comments = row.num_comments,
+    p.upvote_ratio = row.upvote_ratio,
+    p.content_hash = row.content_hash
+"""
+
+SUBREDDIT_QUERY = """
+UNWIND $rows AS row
+MATCH (p:Post {id: row.post_id})
+MERGE (s:Subreddit {name: row.name})
+MERGE (p)-[:POSTED_IN]->(s)
+"""
+
+AUTHOR_QUERY = """
+UNWIND $rows AS row
+MATCH (p:Post {id: row.post_id})
+MERGE (a:Author {name: row.name})
+MERGE (p)-[:AUTHORED_BY]->(a)
+"""
+
+TOPIC_QUERY = """
+UNWIND $rows AS row
+MATCH (p:Post {id: row.post_id})
+MERGE (t:Topic {name: row.name})
+MERGE (p)-[:DISCUSSES]->(t)
+"""
+
+ENTITY_QUERY = """
+UNWIND $rows AS row
+MATCH (p:Post {id: row.post_id})
+MERGE (e:Entity {type: row.type, value: row.value})
+MERGE (p)-[:CONTAINS]->(e)
+"""
+
+BATCH_QUERIES = [
+    ("posts", POST_QUERY),
+    ("subreddits", SUBREDDIT_QUERY),
+    ("authors", AUTHOR_QUERY),
+    ("topics", TOPIC_QUERY),
+    ("entities", ENTITY_QUERY),
+]
+
+AUTHOR_ACTIVITY_QUERY = """
+MATCH (a:Author)<-[:AUTHORED_BY]-(p:Post)-[:POSTED_IN]->(s:Subreddit)
+RETURN s.name AS subreddit, a.name AS author, count(p) AS posts
+ORDER BY subreddit
+"""
+
+CLEAR_INTERACTIONS_QUERY = """
+MATCH ()-[r:INTERACTS_WITH]->()
+CALL { WITH r DELETE r } IN TRANSACTIONS OF 10000 ROWS
+"""
+
+INTERACTION_QUERY = """
+UNWIND $rows AS row
+MATCH (a1:Author {name: row.source})
+MATCH (a2:Author {name: row.target})
+MERGE (a1)-[r:INTERACTS_WITH]->(a2)
+SET r.weight = row.weight, r.shared_posts = row.shared_posts
+"""
+
+CLEAR_POST_RELATIONSHIPS_QUERY = """
+UNWIND $rows AS row
+MATCH (p:Post {id: row.id})-[r:POSTED_IN|AUTHORED_BY|DISCUSSES|CONTAINS]->(n)
+WITH r, type(r) AS kind, n.name AS name
+DELETE r
+RETURN kind, name
+"""
+
+AUTHOR_SCOPED_ACTIVITY_QUERY = """
+MATCH (seed:Author)<-[:AUTHORED_BY]-(:Post)-[:POSTED_IN]->(s:Subreddit)
+WHERE seed.name IN $authors
+WITH DISTINCT s
+MATCH (a:Author)<-[:AUTHORED_BY]-(p:Post)-[:POSTED_IN]->(s)
+RETURN s.name AS subreddit, a.name AS author, count(p) AS posts
+ORDER BY subreddit
+"""
+
+CLEAR_AUTHOR_INTERACTIONS_QUERY = """
+MATCH (a:Author)-[r:INTERACTS_WITH]-()
+WHERE a.name IN $authors
+DELETE r
+"""
+
+DATASET_VERSION_QUERY = """
+MATCH (v:DatasetVersion {id: 'current'})
+RETURN v.version AS version
+"""
+
+BUMP_DATASET_VERSION_QUERY = """
+MERGE (v:DatasetVersion {id: 'current'})
+SET v.version = randomUUID(), v.updated_at = timestamp()
+"""
+
+STORED_CONTENT_HASHES_QUERY = """
+UNWIND $ids AS id
+MATCH (p:Post {id: id})
+RETURN p.id AS id, p.content_hash AS content_hash
+"""
+
+WATERMARK_QUERY = """
+MATCH (w:IngestWatermark {source: $source})
+RETURN w.offset AS offset, w.max_created_utc AS max_created_utc, w.prefix_hash AS prefix_hash
+"""
+
+SAVE_WATERMARK_QUERY = """
+MERGE (w:IngestWatermark {source: $source})
+SET w.offset = $offset,
+    w.max_created_utc = $max_created_utc,
+    w.prefix_hash = $prefix_hash,
+    w.updated_at = timestamp()
+"""
+
+CONTENT_HASH_FIELDS = ("title", "selftext", "created_utc", "score", "num_comments", "upvote_ratio", "subreddit", "author")
+
+def post_content_hash(post_data):
+    """Fingerprint the fields of a post that the graph stores, to detect edited posts."""
+    payload = json.dumps([post_data.get(field) for field in CONTENT_HASH_FIELDS], ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+def _post_data_batch(posts):
+    """Keep the data dicts of posts that can be ingested."""
+    post_datas = []
+    for post in posts:
+        post_data = post.get("data") if isinstance(post, dict) else None
+        if post_data and "name" in post_data:
+            post_datas.append(post_data)
+    return post_datas
+
+def build_batch_rows(post_datas, analyses):
+    """
+    Flatten a batch of post data dicts into UNWIND parameter rows.
+    `analyses` yields a (topics, entities) tuple per post, in order.
+    """
+    rows = {key: [] for key, _ in BATCH_QUERIES}
+
+    for post_data, (topics, entities) in zip(post_datas, analyses):
+        post_id = post_data["name"]
+        rows["posts"].append({
+            "id": post_id,
+            "title": post_data.get("title", ""),
+            "selftext": post_data.get("selftext", ""),
+            "created_utc": post_data.get("created_utc", 0),
+            "score": post_data.get("score", 0),
+            "num_comments": post_data.get("num_comments", 0),
+            "upvote_ratio": post_data.get("upvote_ratio", 0),
+            "content_hash": post_content_hash(post_data)
+        })
+
+        if "subreddit" in post_data:
+            rows["subreddits"].append({"post_id": post_id, "name": post_data["subreddit"]})
+
+        if "author" in post_data and post_data["author"] != "[deleted]":
+            rows["authors"].append({"post_id": post_id, "name": post_data["author"]})
+
+        rows["topics"].extend({"post_id": post_id, "name": topic} for topic in topics)
+        rows["entities"].extend(
+            {"post_id": post_id, "type": entity_type, "value": entity_value}
+            for entity_type, entity_value in entities
+        )
+
+    return rows
+
+def _run_rows(tx, query, rows):
+    tx.run(query, rows=rows).consume()
+
+def _run_query(tx, query, **parameters):
+    tx.run(query, **parameters).consume()
+
+def _clear_rows(tx, rows):
+    return [(record["kind"], record["name"]) for record in tx.run(CLEAR_POST_RELATIONSHIPS_QUERY, rows=rows)]
+
+def write_batch_rows(driver, rows, tx_size=DEFAULT_TX_SIZE, refresh=False):
+    """
+    Write prepared rows with one session and a fixed set of UNWIND transactions.
+    With `refresh`, existing relationships of the batch's posts are dropped first
+    so that changed posts do not keep stale subreddits, authors or topics.
+    Returns the names of the subreddits and topics those posts were detached from.
+    """
+    detached = {"subreddits": set(), "topics": set()}
+    with driver.session() as session:
+        if refresh:
+            for start in range(0, len(rows["posts"]), tx_size):
+                for kind, name in session.execute_write(_clear_rows, rows["posts"][start:start + tx_size]):
+                    if kind == "POSTED_IN":
+                        detached["subreddits"].add(name)
+                    elif kind == "DISCUSSES":
+                        detached["topics"].add(name)
+        for key, query in BATCH_QUERIES:
+            key_rows = rows[key]
+            for start in range(0, len(key_rows), tx_size):
+                session.execute_write(_run_rows, query, key_rows[start:start + tx_size])
+    return detached
+
+def ingest_posts(driver, posts, analyze_text, batch_size=DEFAULT_BATCH_SIZE, tx_size=DEFAULT_TX_SIZE,
+                 refresh=False, workers=DEFAULT_WORKERS):
+    """
+    Ingest an iterable of Reddit posts in batches of `batch_size`, splitting each
+    row set into transactions of at most `tx_size` rows. `analyze_text(title,
+    selftext)` runs in a pool of `workers` processes, one batch ahead of the
+    graph writes. Daily post-count rollups of the touched days and the stats
+    snapshot of the touched subreddits and topics are refreshed, and the
+    dataset version is bumped at the end. Returns throughput stats.
+    """
+    start_time = time.perf_counter()
+    total_processed = 0
+
+    day_numbers = set()
+    subreddits = set()
+    topics = set()
+
+    def write(post_datas, analyses):
+        nonlocal total_processed
+        rows = build_batch_rows(post_datas, analyses)
+        detached = write_batch_rows(driver, rows, tx_size, refresh)
+        total_processed += len(rows["posts"])
+        day_numbers.update(post_day_number(row["created_utc"]) for row in rows["posts"])
+        subreddits.update(row["name"] for row in rows["subreddits"])
+        subreddits.update(detached["subreddits"])
+        topics.update(row["name"] for row in rows["topics"])
+        topics.update(detached["topics"])
+
+        elapsed = time.perf_counter() - start_time
+        print(f"Processed {total_processed} posts ({total_processed / max(elapsed, 1e-9):.1f} posts/sec)")
+
+    pool = create_text_pool(workers)
+    try:
+        pending = None
+        for batch in chunked(posts, batch_size):
+            post_datas = _post_data_batch(batch)
+            submitted = (post_datas, submit_analyses(pool, analyze_text, post_datas, workers))
+            if pending:
+                write(*pending)
+            pending = submitted
+        if pending:
+            write(*pending)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    refresh_daily_rollups(driver, day_numbers)
+    refresh_stats_snapshot(driver, subreddits, topics)
+    bump_dataset_version(driver)
+
+    elapsed = time.perf_counter() - start_time
+    posts_per_sec = total_processed / max(elapsed, 1e-9)
+    print(f"Total posts processed: {total_processed} in {elapsed:.1f}s ({posts_per_sec:.1f} posts/sec)")
+
+    return {"posts": total_processed, "seconds": elapsed, "posts_per_sec": posts_per_sec}
+
+def _count_co_posting(group, max_partners, pair_weights, pair_posts):
+    """
+    Count author pairs for one subreddit. Each author is only paired with the
+    `max_partners` most active authors of the subreddit, so a subreddit with n
+    authors contributes O(n * max_partners) pairs instead of O(n^2).
+    """
+    hubs = heapq.nlargest(max_partners, group, key=lambda item: item[1])
+    hub_names = {author for author, _ in hubs}
+
+    for author, posts in group:
+        for hub, hub_posts in hubs:
+            if hub == author or (author in hub_names and author > hub):
+                continue
+            pair = (author, hub) if author < hub else (hub, author)
+            pair_weights[pair] += 1
+            pair_posts[pair] += min(posts, hub_posts)
+
+def compute_author_interactions(activity, top_k=INTERACTION_TOP_K, max_partners=INTERACTION_MAX_PARTNERS, authors=None):
+    """
+    Compute weighted INTERACTS_WITH rows from (subreddit, author, posts) records
+    sorted by subreddit. `weight` is the number of shared subreddits and
+    `shared_posts` the co-posting volume; each author keeps its top_k partners.
+    When `authors` is given, only rows touching those authors are returned.
+    """
+    pair_weights = defaultdict(int)
+    pair_posts = defaultdict(int)
+
+    current_subreddit = None
+    group = []
+    for subreddit, author, posts in activity:
+        if subreddit != current_subreddit and group:
+            _count_co_posting(group, max_partners, pair_weights, pair_posts)
+            group = []
+        current_subreddit = subreddit
+        group.append((author, posts))
+    if group:
+        _count_co_posting(group, max_partners, pair_weights, pair_posts)
+
+    partners = defaultdict(list)
+    for (author1, author2), weight in pair_weights.items():
+        key = (weight, pair_posts[(author1, author2)])
+        if authors is None or author1 in authors:
+            partners[author1].append((key, author2))
+        if authors is None or author2 in authors:
+            partners[author2].append((key, author1))
+
+    edges = set()
+    for author, candidates in partners.items():
+        for (weight, shared_posts), partner in heapq.nlargest(top_k, candidates):
+            edges.add((author, partner, weight, shared_posts))
+            if authors is not None:
+                edges.add((partner, author, weight, shared_posts))
+
+    return [
+        {"source": source, "target": target, "weight": weight, "shared_posts": shared_posts}
+        for source, target, weight, shared_posts in edges
+    ]
+
+def build_author_interactions(driver, top_k=INTERACTION_TOP_K, max_partners=INTERACTION_MAX_PARTNERS,
+                              tx_size=DEFAULT_TX_SIZE, authors=None):
+    """
+    Rebuild weighted INTERACTS_WITH edges in one pass over author activity.
+    Passing `authors` limits the rebuild to those authors' subreddits and edges.
+    """
+    start_time = time.perf_counter()
+
+    with driver.session() as session:
+        if authors is None:
+            session.run(CLEAR_INTERACTIONS_QUERY).consume()
+            records = session.run(AUTHOR_ACTIVITY_QUERY)
+        else:
+            authors = set(authors)
+            if not authors:
+                return 0
+            session.execute_write(_run_query, CLEAR_AUTHOR_INTERACTIONS_QUERY, authors=list(authors))
+            records = session.run(AUTHOR_SCOPED_ACTIVITY_QUERY, authors=list(authors))
+
+        activity = ((record["subreddit"], record["author"], record["posts"]) for record in records)
+        rows = compute_author_interactions(activity, top_k, max_partners, authors)
+
+        for start in range(0, len(rows), tx_size):
+            session.execute_write(_run_rows, INTERACTION_QUERY, rows[start:start + tx_size])
+
+    print(f"Created {len(rows)} author interactions in {time.perf_counter() - start_time:.1f}s")
+    return len(rows)
+
+def get_watermark(driver, source):
+    """Return the stored ingest watermark for a source file, if any."""
+    with driver.session() as session:
+        record = session.run(WATERMARK_QUERY, source=source).single()
+    return dict(record) if record else None
+
+def _prefix_hash(file_path, length):
+    """
+    Fingerprint the first `length` bytes of a file: the length and
+    PREFIX_SAMPLE_BLOCKS blocks spread evenly across it, from the first block
+    to the last. Prefixes that fit in the sampled blocks are hashed whole.
+    """
+    digest = hashlib.sha1(str(length).encode())
+    with open(file_path, "rb") as f:
+        if length <= PREFIX_SAMPLE_BLOCKS * PREFIX_BLOCK_SIZE:
+            digest.update(f.read(length))
+            return digest.hexdigest()
+
+        last_block = length - PREFIX_BLOCK_SIZE
+        for block in range(PREFIX_SAMPLE_BLOCKS):
+            f.seek(last_block * block // (PREFIX_SAMPLE_BLOCKS - 1))
+            digest.update(f.read(PREFIX_BLOCK_SIZE))
+    return digest.hexdigest()
+
+def _changed_posts(driver, posts, batch_size=DEFAULT_BATCH_SIZE):
+    """Drop posts whose stored content hash matches, i.e. unchanged since their last ingest."""
+    skipped = 0
+    with driver.session() as session:
+        for batch in chunked(posts, batch_size):
+            ids = [post_data["name"] for post_data in _post_data_batch(batch)]
+            stored = {record["id"]: record["content_hash"] for record in session.run(STORED_CONTENT_HASHES_QUERY, ids=ids)}
+            for post in batch:
+                post_data = post.get("data") if isinstance(post, dict) else None
+                if post_data and "name" in post_data and stored.get(post_data["name"]) == post_content_hash(post_data):
+                    skipped += 1
+                    continue
+                yield post
+    print(f"Skipped {skipped} unchanged posts")
+
+def _track_posts(posts, progress):
+    """Record max created_utc and authors of the posts being ingested."""
+    for post in posts:
+        post_data = post.get("data") if isinstance(post, dict) else None
+        if not post_data:
+            continue
+
+        progress["max_created_utc"] = max(progress["max_created_utc"], post_data.get("created_utc", 0) or 0)
+        if post_data.get("author") and post_data["author"] != "[deleted]":
+            progress["authors"].add(post_data["author"])
+        yield post
+
+def ingest_jsonl(driver, file_path, analyze_text, incremental=False,
+                 batch_size=DEFAULT_BATCH_SIZE, tx_size=DEFAULT_TX_SIZE, workers=DEFAULT_WORKERS, rescan=False):
+    """
+    Ingest a JSONL file and record an ingest watermark (byte offset, max
+    created_utc and a `_prefix_hash` of the bytes up to the offset) in the
+    graph. In incremental mode only lines appended since the watermark are
+    read, unless the file is now shorter than the offset or the prefix
+    fingerprint changed: then the whole file is rescanned and only new posts
+    and posts whose content hash changed (e.g. an edited score or comment
+    count) are ingested. An in-place edit that keeps the prefix length and
+    falls between the sampled blocks is not detected; pass `rescan` to force
+    the rescan. Posts no longer in the file are not removed from the graph.
+    Returned stats include the set of authors touched, for scoped follow-up
+    stages.
+    """
+    source = os.path.basename(file_path)
+    watermark = get_watermark(driver, source) if incremental else None
+
+    start_offset = 0
+    if watermark:
+        if rescan:
+            print(f"Rescanning {source} for new and changed posts")
+        elif (watermark["offset"] <= os.path.getsize(file_path)
+                and watermark["prefix_hash"] == _prefix_hash(file_path, watermark["offset"])):
+            start_offset = watermark["offset"]
+        else:
+            print(f"{source} changed since the last ingest, rescanning for new and changed posts")
+            rescan = True
+        print(f"Resuming {source} from byte {start_offset}")
+    else:
+        rescan = False
+
+    progress = {
+        "offset": start_offset,
+        "max_created_utc": watermark["max_created_utc"] if watermark else 0,
+        "authors": set()
+    }
+    posts = iter_jsonl(file_path, start_offset, progress)
+    if rescan:
+        posts = _changed_posts(driver, posts, batch_size)
+    stats = ingest_posts(driver, _track_posts(posts, progress), analyze_text, batch_size, tx_size, incremental, workers)
+
+    with driver.session() as session:
+        session.execute_write(
+            _run_query, SAVE_WATERMARK_QUERY,
+            source=source,
+            offset=progress["offset"],
+            max_created_utc=progress["max_created_utc"],
+            prefix_hash=_prefix_hash(file_path, progress["offset"])
+        )
+
+    stats.update(offset=progress["offset"], max_created_utc=progress["max_created_utc"], authors=progress["authors"])
+    return stats
+
+def get_dataset_version(driver):
+    """Return the current dataset version token, or None before the first load."""
+    with driver.session() as session:
+        record = session.run(DATASET_VERSION_QUERY).single()
+    return record["version"] if record else None
+
+def bump_dataset_version(driver):
+    """Give the dataset a new version token so cached responses are invalidated."""
+    with driver.session() as session:
+        session.execute_write(_run_query, BUMP_DATASET_VERSION_QUERY)
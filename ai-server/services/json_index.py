@@ -0,0 +1,191 @@
+import re
+from array import array
+from functools import lru_cache
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+GRAM_SIZE = 3
+
+def _children(path, node):
+    if isinstance(node, dict):
+        return ((path + (key,), key, value) for key, value in node.items())
+    return ((path + (position,), None, value) for position, value in enumerate(node))
+
+class MatchList(list):
+    """A filtered list that remembers how many items matched before top-k truncation."""
+
+    def __init__(self, items=(), total=0):
+        super().__init__(items)
+        self.total = total
+
+class JsonIndex:
+    """
+    Inverted index from lower-cased tokens to the places in a JSON tree where
+    `filter_json_data` would keep a value: dict entries (matched by key or by
+    string value) and string list items. A trigram index over the tokens
+    finds the tokens containing a query word without scanning the whole
+    vocabulary. Filtering looks up the candidate places for each term,
+    confirms the substring match on those only, and materializes at most
+    `max_items` children per list.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.paths = []
+        self.keys = []
+        self.values = []
+        postings = {}
+
+        if isinstance(data, (dict, list)):
+            stack = [_children((), data)]
+            while stack:
+                for child_path, key, value in stack[-1]:
+                    text = value if isinstance(value, str) else None
+                    if key is not None or text is not None:
+                        self._add_site(postings, child_path, None if key is None else str(key), text)
+                    if isinstance(value, (dict, list)):
+                        stack.append(_children(child_path, value))
+                        break
+                else:
+                    stack.pop()
+        elif isinstance(data, str):
+            self._add_site(postings, (), None, data)
+
+        self.postings = postings
+        self.vocabulary = list(self.postings)
+        self.grams = self._index_grams(self.vocabulary)
+        self._word_sites = lru_cache(maxsize=4096)(self._lookup_word)
+
+    @staticmethod
+    def _index_grams(vocabulary):
+        """Map each GRAM_SIZE-character substring to the ids of the tokens containing it."""
+        grams = {}
+        for token_id, token in enumerate(vocabulary):
+            for gram in {token[start:start + GRAM_SIZE] for start in range(len(token) - GRAM_SIZE + 1)}:
+                token_ids = grams.get(gram)
+                if token_ids is None:
+                    token_ids = grams[gram] = array('i')
+                token_ids.append(token_id)
+        return grams
+
+    def _candidate_tokens(self, word):
+        """
+        Tokens that may contain `word`: those holding all of its n-grams.
+        Words shorter than GRAM_SIZE are checked against the whole vocabulary.
+        """
+        if len(word) < GRAM_SIZE:
+            return self.vocabulary
+
+        token_lists = []
+        for gram in {word[start:start + GRAM_SIZE] for start in range(len(word) - GRAM_SIZE + 1)}:
+            token_ids = self.grams.get(gram)
+            if token_ids is None:
+                return ()
+            token_lists.append(token_ids)
+
+        token_lists.sort(key=len)
+        candidates = set(token_lists[0])
+        for token_ids in token_lists[1:]:
+            candidates.intersection_update(token_ids)
+            if not candidates:
+                break
+        return [self.vocabulary[token_id] for token_id in candidates]
+
+    def _add_site(self, postings, path, key_text, text):
+        site_id = len(self.paths)
+        self.paths.append(path)
+        self.keys.append(key_text)
+        self.values.append(text)
+        tokens = set(_TOKEN_PATTERN.findall(key_text.lower())) if key_text else set()
+        if text:
+            tokens.update(_TOKEN_PATTERN.findall(text.lower()))
+        for token in tokens:
+            site_ids = postings.get(token)
+            if site_ids is None:
+                site_ids = postings[token] = array('i')
+            site_ids.append(site_id)
+
+    def _lookup_word(self, word):
+        """Sites with a token containing `word` (memoized per word)."""
+        site_ids = set()
+        for token in self._candidate_tokens(word):
+            if word in token:
+                site_ids.update(self.postings[token])
+        return frozenset(site_ids)
+
+    def _matches(self, site_id, term):
+        key_text, text = self.keys[site_id], self.values[site_id]
+        return (key_text is not None and term in key_text.lower()) or (text is not None and term in text.lower())
+
+    def match(self, query_terms):
+        """Return the sorted ids of the sites that contain any of the terms."""
+        matched = set()
+        for term in {term.lower() for term in query_terms if term}:
+            words = _TOKEN_PATTERN.findall(term)
+            if words:
+                candidates = None
+                for word in sorted(words, key=len, reverse=True):
+                    sites = self._word_sites(word)
+                    candidates = sites if candidates is None else candidates & sites
+                    if not candidates:
+                        break
+            else:
+                candidates = range(len(self.paths))
+            matched.update(site_id for site_id in candidates if site_id not in matched and self._matches(site_id, term))
+        return sorted(matched)
+
+    def filter(self, query_terms, max_items=None):
+        """
+        Same result as `filter_json_data`, built from the matched sites only.
+        With `max_items`, each list keeps its first `max_items` matching children.
+        Lists are `MatchList`s whose `total` counts every matching child.
+        Returns None when nothing matches.
+        """
+        site_ids = self.match(query_terms)
+        if not site_ids:
+            return None
+
+        if not self.paths[site_ids[0]]:
+            return self.data
+
+        root = {} if isinstance(self.data, dict) else MatchList()
+        containers = {(): root}
+        last_child = {}
+        closed = set()
+
+        for site_id in site_ids:
+            path = self.paths[site_id]
+            if any(path[:depth] in closed for depth in range(1, len(path))):
+                continue
+
+            node = self.data
+            for depth, step in enumerate(path, start=1):
+                parent = containers[path[:depth - 1]]
+                node = node[step]
+                prefix = path[:depth]
+                final = depth == len(path)
+
+                if isinstance(parent, dict):
+                    if step in parent:
+                        continue
+                else:
+                    if last_child.get(path[:depth - 1]) == step:
+                        continue
+                    last_child[path[:depth - 1]] = step
+                    parent.total += 1
+                    if max_items is not None and len(parent) >= max_items:
+                        closed.add(prefix)
+                        break
+
+                if final:
+                    child = node
+                    closed.add(prefix)
+                else:
+                    child = {} if isinstance(node, dict) else MatchList()
+                    containers[prefix] = child
+
+                if isinstance(parent, dict):
+                    parent[step] = child
+                else:
+                    parent.append(child)
+
+        return root
@@ -0,0 +1,40 @@
+import json
+from itertools import islice
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+def chunked(iterable, size):
+    """Yield successive lists of at most `size` items from an iterable."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def iter_jsonl(jsonl_file, start_offset=0, progress=None):
+    """
+    Stream decoded objects from a JSONL file without materializing it.
+    Uses orjson when installed. If `progress` is given, progress["offset"] is
+    kept at the byte offset just past the last complete line read.
+    """
+    with open(jsonl_file, 'rb') as f:
+        f.seek(start_offset)
+        offset = start_offset
+        for line_number, line in enumerate(f, start=1):
+            if line.endswith(b"\n"):
+                offset += len(line)
+                if progress is not None:
+                    progress["offset"] = offset
+            if not line.strip():
+                continue
+            try:
+                yield _loads(line)
+            except json.JSONDecodeError as e:
+                print(f"Error decoding JSON on line {line_number}: {e}")
+                continue
@@ -0,0 +1,131 @@
+import argparse
+import csv
+import os
+import time
+from services.text_pipeline import analyze_post_text, create_text_pool, submit_analyses
+from services.jsonl_reader import chunked, iter_jsonl
+from services.ingest_service import post_content_hash
+
+NODE_FILES = {
+    "Post": ("posts.csv", ["id:ID(Post)", "title", "selftext", "created_utc:double",
+                           "score:long", "num_comments:long", "upvote_ratio:double", "content_hash"]),
+    "Subreddit": ("subreddits.csv", ["name:ID(Subreddit)"]),
+    "Author": ("authors.csv", ["name:ID(Author)"]),
+    "Topic": ("topics.csv", ["name:ID(Topic)"]),
+    "Entity": ("entities.csv", [":ID(Entity)", "type", "value"]),
+}
+
+RELATIONSHIP_FILES = {
+    "POSTED_IN": ("posted_in.csv", [":START_ID(Post)", ":END_ID(Subreddit)"]),
+    "AUTHORED_BY": ("authored_by.csv", [":START_ID(Post)", ":END_ID(Author)"]),
+    "DISCUSSES": ("discusses.csv", [":START_ID(Post)", ":END_ID(Topic)"]),
+    "CONTAINS": ("contains.csv", [":START_ID(Post)", ":END_ID(Entity)"]),
+}
+
+def _read_posts(input_jsonl_file):
+    for post in iter_jsonl(input_jsonl_file):
+        post_data = post.get("data") if isinstance(post, dict) else None
+        if post_data and "name" in post_data:
+            yield post_data
+
+def _csv_value(value):
+    return "" if value is None else value
+
+def convert_jsonl_to_csv(input_jsonl_file, output_csv_folder, workers=None, chunk_size=2000):
+    """
+    Stream a Reddit JSONL file into neo4j-admin import CSVs matching the schema
+    created by Neo4jInitializer. Dimension nodes are deduplicated with in-memory
+    sets and topic/entity extraction runs in a process pool, one chunk at a time.
+    """
+    os.makedirs(output_csv_folder, exist_ok=True)
+    start_time = time.perf_counter()
+
+    files = {}
+    writers = {}
+    for name, (file_name, header) in {**NODE_FILES, **RELATIONSHIP_FILES}.items():
+        files[name] = open(os.path.join(output_csv_folder, file_name), 'w', newline='', encoding='utf-8')
+        writers[name] = csv.writer(files[name])
+        writers[name].writerow(header)
+
+    workers = workers or os.cpu_count() or 1
+    pool = create_text_pool(workers)
+    seen = {"Post": set(), "Subreddit": set(), "Author": set(), "Topic": set(), "Entity": set()}
+    total_processed = 0
+
+    def add_node(label, key, row):
+        if key not in seen[label]:
+            seen[label].add(key)
+            writers[label].writerow(row)
+
+    try:
+        for chunk in chunked(_read_posts(input_jsonl_file), chunk_size):
+            chunk = [post_data for post_data in chunk if post_data["name"] not in seen["Post"]]
+            analyses = submit_analyses(pool, analyze_post_text, chunk, workers)
+
+            for post_data, (topics, entities) in zip(chunk, analyses):
+                post_id = post_data["name"]
+                if post_id in seen["Post"]:
+                    continue
+                add_node("Post", post_id, [
+                    post_id,
+                    _csv_value(post_data.get("title", "")),
+                    _csv_value(post_data.get("selftext", "")),
+                    _csv_value(post_data.get("created_utc", 0)),
+                    _csv_value(post_data.get("score", 0)),
+                    _csv_value(post_data.get("num_comments", 0)),
+                    _csv_value(post_data.get("upvote_ratio", 0)),
+                    post_content_hash(post_data)
+                ])
+
+                if "subreddit" in post_data:
+                    add_node("Subreddit", post_data["subreddit"], [post_data["subreddit"]])
+                    writers["POSTED_IN"].writerow([post_id, post_data["subreddit"]])
+
+                if "author" in post_data and post_data["author"] != "[deleted]":
+                    add_node("Author", post_data["author"], [post_data["author"]])
+                    writers["AUTHORED_BY"].writerow([post_id, post_data["author"]])
+
+                for topic in topics:
+                    add_node("Topic", topic, [topic])
+                    writers["DISCUSSES"].writerow([post_id, topic])
+
+                for entity_type, entity_value in set(entities):
+                    entity_id = f"{entity_type}:{entity_value}"
+                    add_node("Entity", entity_id, [entity_id, entity_type, entity_value])
+                    writers["CONTAINS"].writerow([post_id, entity_id])
+
+            total_processed = len(seen["Post"])
+            elapsed = time.perf_counter() - start_time
+            print(f"Converted {total_processed} posts ({total_processed / max(elapsed, 1e-9):.1f} posts/sec)")
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        for f in files.values():
+            f.close()
+
+    print(f"Converted {input_jsonl_file} to CSVs in {output_csv_folder}")
+    print("Import with:")
+    print("  " + import_command(output_csv_folder))
+    print("then run Neo4jInitializer.create_constraints_and_indexes(), build_author_interactions() and refresh_daily_rollups().")
+
+    return {"posts": total_processed, "seconds": time.perf_counter() - start_time}
+
+def import_command(output_csv_folder, database="neo4j"):
+    """Build the neo4j-admin command that imports the generated CSVs."""
+    args = ["neo4j-admin database import full", "--multiline-fields=true"]
+    for label, (file_name, _) in NODE_FILES.items():
+        args.append(f"--nodes={label}={os.path.join(output_csv_folder, file_name)}")
+    for rel_type, (file_name, _) in RELATIONSHIP_FILES.items():
+        args.append(f"--relationships={rel_type}={os.path.join(output_csv_folder, file_name)}")
+    args.append(database)
+    return " ".join(args)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert Reddit JSONL into neo4j-admin import CSVs.")
+    parser.add_argument("input_jsonl_file", nargs="?", default="data/data.jsonl")
+    parser.add_argument("output_csv_folder", nargs="?", default="data/import")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    convert_jsonl_to_csv(args.input_jsonl_file, args.output_csv_folder, args.workers, args.chunk_size)
@@ -1,30 +1,32 @@
+import argparse
 import json
 import os
+from services.jsonl_reader import iter_jsonl
 
-def convert_jsonl_to_json(input_jsonl_file, output_json_folder):
+def convert_jsonl_to_json(input_jsonl_file, output_json_folder, indent=None):
+    """Stream a JSONL file into a JSON array file, one record at a time."""
     os.makedirs(output_json_folder, exist_ok=True)
-    
+
     base_name = os.path.splitext(os.path.basename(input_jsonl_file))[0]
     output_json_file = os.path.join(output_json_folder, base_name + '.json')
 
-    data = []
-    with open(input_jsonl_file, 'r') as jsonl_file:
-        for line_number, line in enumerate(jsonl_file, start=1):
-            line = line.strip()
-            if not line:  
-                continue
-            try:
-                data.append(json.loads(line))
-            except json.JSONDecodeError as e:
-                print(f"Error decoding JSON on line {line_number}: {e}")
-                continue
-    
+    count = 0
     with open(output_json_file, 'w') as json_file:
-        json.dump(data, json_file, indent=4)
-    
-    print(f"Converted {input_jsonl_file} to {output_json_file}")
+        json_file.write('[')
+        for record in iter_jsonl(input_jsonl_file):
+            json_file.write(',\n' if count else '\n')
+            json_file.write(json.dumps(record, indent=indent))
+            count += 1
+        json_file.write('\n]\n')
+
+    print(f"Converted {count} records from {input_jsonl_file} to {output_json_file}")
+    return output_json_file
 
-input_jsonl_file = '/home/sameer42/Desktop/Projects/research-engineering-intern-assignment-sameer-gupta/ai-server/data/data.jsonl' 
-output_json_folder = '/home/sameer42/Desktop/Projects/research-engineering-intern-assignment-sameer-gupta/ai-server/data/'  
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert a JSONL file into a JSON array file.")
+    parser.add_argument("input_jsonl_file", nargs="?", default="data/data.jsonl")
+    parser.add_argument("output_json_folder", nargs="?", default="data/")
+    parser.add_argument("--indent", type=int, default=None)
+    args = parser.parse_args()
 
-convert_jsonl_to_json(input_jsonl_file, output_json_folder)
\ No newline at end of file
+    convert_jsonl_to_json(args.input_jsonl_file, args.output_json_folder, args.indent)
@@ -0,0 +1,261 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import httpx
+from groq import AsyncClient as AsyncGroqClient, Client as GroqClient, DefaultAsyncHttpxClient
+from dotenv import load_dotenv
+
+load_dotenv()
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join("data", "llm_cache.sqlite3"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", 7 * 24 * 3600))
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", 20000))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 16))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", 60))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 2))
+
+CACHE_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS completions (
+        key TEXT PRIMARY KEY,
+        model TEXT NOT NULL,
+        response TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        last_used_at REAL NOT NULL,
+        hits INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS completions_last_used ON completions (last_used_at)",
+    "CREATE INDEX IF NOT EXISTS completions_created ON completions (created_at)"
+]
+
+def completion_key(model, messages, params):
+    """Hash the model, the final messages and the generation parameters."""
+    payload = json.dumps({"model": model, "messages": messages, "params": params},
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class CompletionCache:
+    """
+    On-disk (SQLite) cache of LLM completions. The database file is shared by
+    every uvicorn worker and survives restarts; entries expire after
+    `ttl_seconds` and the least recently used ones are evicted beyond
+    `max_entries`. Hit/miss counters are per process.
+    """
+
+    def __init__(self, path=LLM_CACHE_PATH, ttl_seconds=LLM_CACHE_TTL, max_entries=LLM_CACHE_SIZE):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            for statement in CACHE_SCHEMA:
+                connection.execute(statement)
+            self._local.connection = connection
+        return connection
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def get(self, key):
+        try:
+            connection = self._connection()
+            now = time.time()
+            row = connection.execute(
+                "SELECT response FROM completions WHERE key = ? AND created_at >= ?",
+                (key, now - self.ttl_seconds)
+            ).fetchone()
+            if row is None:
+                self._count("misses")
+                return None
+            connection.execute("UPDATE completions SET last_used_at = ?, hits = hits + 1 WHERE key = ?", (now, key))
+            self._count("hits")
+            return row[0]
+        except sqlite3.Error as e:
+            self._count("errors")
+            print(f"Error reading LLM cache: {str(e)}")
+            return None
+
+    def put(self, key, model, response):
+        try:
+            connection = self._connection()
+            now = time.time()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute(
+                    "INSERT OR REPLACE INTO completions (key, model, response, created_at, last_used_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, model, response, now, now)
+                )
+                connection.execute("DELETE FROM completions WHERE created_at < ?", (now - self.ttl_seconds,))
+                connection.execute(
+                    "DELETE FROM completions WHERE key IN "
+                    "(SELECT key FROM completions ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            self._count("errors")
+            print(f"Error writing LLM cache: {str(e)}")
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        stats = {
+            "path": self.path,
+            "ttl_seconds": self.ttl_seconds,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+        try:
+            entries, total_hits = self._connection().execute(
+                "SELECT count(*), coalesce(sum(hits), 0) FROM completions"
+            ).fetchone()
+            stats.update(entries=entries, total_hits=total_hits)
+        except sqlite3.Error as e:
+            print(f"Error reading LLM cache stats: {str(e)}")
+        return stats
+
+completion_cache = CompletionCache() if LLM_CACHE_ENABLED else None
+
+_groq_client = None
+_groq_client_lock = threading.Lock()
+
+def get_groq_client():
+    """Return the process-wide Groq client."""
+    global _groq_client
+    if _groq_client is None:
+        with _groq_client_lock:
+            if _groq_client is None:
+                _groq_client = GroqClient(api_key=os.getenv("GROQ_API_KEY"), timeout=LLM_TIMEOUT, max_retries=LLM_MAX_RETRIES)
+    return _groq_client
+
+_async_groq_client = None
+_llm_semaphore = None
+
+def get_async_groq_client():
+    """
+    Return the process-wide async Groq client. Its HTTP connection pool is
+    sized to LLM_MAX_CONCURRENCY so concurrent requests reuse connections.
+    """
+    global _async_groq_client
+    if _async_groq_client is None:
+        limits = httpx.Limits(max_connections=LLM_MAX_CONCURRENCY, max_keepalive_connections=LLM_MAX_CONCURRENCY)
+        _async_groq_client = AsyncGroqClient(
+            api_key=os.getenv("GROQ_API_KEY"),
+            timeout=LLM_TIMEOUT,
+            max_retries=LLM_MAX_RETRIES,
+            http_client=DefaultAsyncHttpxClient(limits=limits, timeout=LLM_TIMEOUT)
+        )
+    return _async_groq_client
+
+def _get_llm_semaphore():
+    global _llm_semaphore
+    if _llm_semaphore is None:
+        _llm_semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    return _llm_semaphore
+
+def create_completion(messages, model_name, **params):
+    """
+    Return the text of a Groq chat completion for `messages`. Responses are
+    served from the completion cache when the same model, messages and
+    generation parameters were seen before.
+    """
+    key = completion_key(model_name, messages, params) if completion_cache else None
+    if key is not None:
+        cached = completion_cache.get(key)
+        if cached is not None:
+            return cached
+
+    response = get_groq_client().chat.completions.create(model=model_name, messages=messages, **params)
+    content = response.choices[0].message.content
+
+    if key is not None and content:
+        completion_cache.put(key, model_name, content)
+    return content
+
+async def acreate_completion(messages, model_name, **params):
+    """
+    Async version of `create_completion`. At most LLM_MAX_CONCURRENCY calls
+    per process are in flight; cache reads and writes run in a worker thread.
+    """
+    key = completion_key(model_name, messages, params) if completion_cache else None
+    if key is not None:
+        cached = await asyncio.to_thread(completion_cache.get, key)
+        if cached is not None:
+            return cached
+
+    async with _get_llm_semaphore():
+        response = await get_async_groq_client().chat.completions.create(model=model_name, messages=messages, **params)
+    content = response.choices[0].message.content
+
+    if key is not None and content:
+        await asyncio.to_thread(completion_cache.put, key, model_name, content)
+    return content
+
+async def astream_completion(messages, model_name, **params):
+    """
+    Yield the text of a Groq chat completion as it is generated, using the
+    streaming API. A cached completion is yielded in one piece. The full text
+    is cached only when the stream ran to completion; if the consumer stops
+    early (e.g. the client disconnected) the upstream stream is closed.
+    """
+    key = completion_key(model_name, messages, params) if completion_cache else None
+    if key is not None:
+        cached = await asyncio.to_thread(completion_cache.get, key)
+        if cached is not None:
+            yield cached
+            return
+
+    parts = []
+    async with _get_llm_semaphore():
+        stream = await get_async_groq_client().chat.completions.create(
+            model=model_name, messages=messages, stream=True, **params
+        )
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                text = chunk.choices[0].delta.content
+                if text:
+                    parts.append(text)
+                    yield text
+        finally:
+            await stream.close()
+
+    content = "".join(parts)
+    if key is not None and content:
+        await asyncio.to_thread(completion_cache.put, key, model_name, content)
+
+async def close_llm_clients():
+    """Close the shared async client's connection pool."""
+    global _async_groq_client
+    if _async_groq_client is not None:
+        await _async_groq_client.close()
+        _async_groq_client = None
+
+def completion_cache_stats():
+    return completion_cache.stats() if completion_cache else {"enabled": False}
@@ -1,22 +1,36 @@
 from collections import Counter
 import re
-import json
 from typing import Dict, Any
 from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize
-import networkx as nx
-import community.community_louvain as community 
+from services.graph_core import CSRGraph, louvain
+
+_PUNCTUATION_PATTERN = re.compile(r'[^\w\s]')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_NOISY_PATTERN = re.compile(r'^(.)\1*(.)\2*$')
+_URL_PATTERN = re.compile(r'https?://\S+')
+_HASHTAG_PATTERN = re.compile(r'#\w+')
+_MENTION_PATTERN = re.compile(r'@\w+')
+
+_stop_words = None
+
+def get_stop_words():
+    """Return the English stopword set, loading it once per process."""
+    global _stop_words
+    if _stop_words is None:
+        _stop_words = frozenset(stopwords.words('english'))
+    return _stop_words
 
 def extract_topics_from_text(text, num_topics=5):
         """Extract meaningful topics from text using improved preprocessing and filtering."""
         if not text or len(text) < 50:
             return []
 
-        cleaned_text = re.sub(r'[^\w\s]', '', text.lower())  
-        cleaned_text = re.sub(r'\s+', ' ', cleaned_text)  
+        cleaned_text = _PUNCTUATION_PATTERN.sub('', text.lower())  
+        cleaned_text = _WHITESPACE_PATTERN.sub(' ', cleaned_text)  
 
         words = word_tokenize(cleaned_text)
-        stop_words = set(stopwords.words('english'))
+        stop_words = get_stop_words()
         filtered_words = [
             word for word in words
             if word not in stop_words and len(word) > 2 and word.isalpha()
@@ -35,55 +49,46 @@ def _is_repetitive_or_noisy(word):
     if len(set(word)) < 3: 
         return True
 
-    if re.match(r'^(.)\1*(.)\2*$', word): 
+    if _NOISY_PATTERN.match(word): 
         return True
 
     return False
 
-def detect_communities(nodes, links):
-    """Detect communities in the network graph."""
-    try:
-        graph = nx.Graph()
-
-        for node in nodes:
-            graph.add_node(node["id"], group=node["group"])
-
-        for link in links:
-            graph.add_edge(link["source"], link["target"], weight=link["value"])
-
-        partition = community.best_partition(graph) 
-
-        for node in nodes:
-            node["community"] = partition.get(node["id"], node["group"])
+def extract_entities(text):
+    """Extract URL, hashtag and mention entities from text using simple pattern matching."""
+    entities = [("URL", url) for url in _URL_PATTERN.findall(text)]
+    entities.extend(("Hashtag", hashtag) for hashtag in _HASHTAG_PATTERN.findall(text))
+    entities.extend(("Mention", mention) for mention in _MENTION_PATTERN.findall(text))
+    return entities
 
+def detect_communities(nodes, links):
+    """
+    Detect communities in the network graph, unless every node already has
+    one (precomputed at ingest).
+    """
+    if all(node.get("community") is not None for node in nodes):
         return nodes
 
-    except ImportError as e:
-        print(f"Community detection unavailable: {str(e)}")
-        for node in nodes:
-            node["community"] = node["group"]
-        return nodes
+    communities = louvain(CSRGraph.from_nodes_links(nodes, links))
+    for index, node in enumerate(nodes):
+        node["community"] = int(communities[index])
 
-def process_reddit_data(jsonl_file="data/data.jsonl"):
-    """Process the Reddit data from a JSONL file."""
-    data = []
-    with open(jsonl_file, 'r', encoding='utf-8') as f:
-        for line in f:
-            try:
-                post = json.loads(line)
-                data.append(post)
-            except json.JSONDecodeError:
-                continue
-    return data
-
-def filter_json_data(json_data, query_terms):
+    return nodes
+
+def filter_json_data(json_data, query_terms, max_items=None, index=None):
     """
     Filter JSON data to extract relevant information based on query terms.
     Shortens the JSON data by removing irrelevant parts and keeping only the most relevant data.
+    With a prebuilt `JsonIndex` of `json_data` the matches come from the index,
+    and `max_items` caps how many matching children each list keeps.
     """
     if not json_data:
         return {}
 
+    if index is not None:
+        filtered_data = index.filter(query_terms, max_items=max_items)
+        return filtered_data if filtered_data else _head(json_data)
+
     query_terms_lower = [term.lower() for term in query_terms if term]
 
     def _filter(data):
@@ -131,15 +136,19 @@ def filter_json_data(json_data, query_terms):
     filtered_data = _filter(json_data)
 
     if not filtered_data:
-        if isinstance(json_data, dict):
-            return dict(list(json_data.items())[:3])  
-        elif isinstance(json_data, list):
-            return json_data[:3] 
-        else:
-            return json_data 
+        return _head(json_data)
 
     return filtered_data
 
+def _head(json_data):
+    """First few entries of the data, used when nothing matches."""
+    if isinstance(json_data, dict):
+        return dict(list(json_data.items())[:3])  
+    elif isinstance(json_data, list):
+        return json_data[:3] 
+    else:
+        return json_data 
+
 def reduce_data_context(data: Dict[str, Any], max_items: int = 5) -> Dict[str, Any]:
     """Reduce data context size by limiting number of items"""
     
@@ -151,8 +160,9 @@ def reduce_data_context(data: Dict[str, Any], max_items: int = 5) -> Dict[str, A
     for key, value in data.items():
         if isinstance(value, list):
             reduced_data[key] = value[:max_items]
-            if len(value) > max_items:
-                reduced_data[f"{key}_count"] = len(value)
+            total = getattr(value, "total", len(value))
+            if total > max_items:
+                reduced_data[f"{key}_count"] = total
         elif isinstance(value, dict):
             reduced_data[key] = reduce_data_context(value, max_items//2)
         else:
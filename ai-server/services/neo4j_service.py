@@ -1,17 +1,38 @@
 import os
 from python_types.types import Neo4jConnection
+from services.search_service import match_posts
+from services.stats_service import StatsSnapshotStore
+from services.ingest_service import get_dataset_version
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# The process-wide connection; other modules import it instead of opening their own driver.
 neo4j_connection = Neo4jConnection(
     uri=os.getenv("NEO4J_URI"),
     user=os.getenv("NEO4J_USER"),
     password=os.getenv("NEO4J_PASSWORD")
 )
 
+stats_snapshot = StatsSnapshotStore(neo4j_connection, version_loader=lambda: get_dataset_version(neo4j_connection.driver))
+
 def query_neo4j_for_general_stats(query_terms):
-    """Get general statistics when no specific posts match the query"""
+    """
+    Get general statistics when no specific posts match the query, plus the
+    slices of the stats snapshot that match the query terms. Falls back to
+    aggregating the posts when no snapshot has been computed yet.
+    """
+    try:
+        snapshot = stats_snapshot.get()
+        if snapshot:
+            return snapshot.describe(query_terms)
+    except Exception as e:
+        print(f"Error reading stats snapshot: {str(e)}")
+    
+    return aggregate_general_stats()
+
+def aggregate_general_stats():
+    """General statistics aggregated from the posts, for graphs without a stats snapshot."""
     try:
         cypher_query = """
         MATCH (p:Post)-[:POSTED_IN]->(s:Subreddit)
@@ -21,7 +42,7 @@ def query_neo4j_for_general_stats(query_terms):
         LIMIT 100
         """
         
-        subreddit_results = neo4j_connection.query(cypher_query)
+        subreddit_results = neo4j_connection.read_query(cypher_query)
         
         cypher_query = """
         MATCH (p:Post)-[:DISCUSSES]->(t:Topic)
@@ -30,7 +51,7 @@ def query_neo4j_for_general_stats(query_terms):
         LIMIT 10
         """
         
-        topic_results = neo4j_connection.query(cypher_query)
+        topic_results = neo4j_connection.read_query(cypher_query)
         
         context = "General Reddit statistics:\n\n"
         
@@ -54,37 +75,19 @@ def query_neo4j_for_context(query_terms, max_posts=10):
     Returns formatted context string with relevant data.
     """
     try:
-        term_conditions = []
-        params = {}
+        where_clauses = []
+        params = {"limit": max_posts}
         
-        for i, term in enumerate(query_terms):
-            param_name = f"term{i}"
-            term_conditions.append(f"(p.title CONTAINS ${param_name} OR p.selftext CONTAINS ${param_name})")
-            params[param_name] = term
-        
-        if not term_conditions:
-            cypher_query = """
-            MATCH (p:Post)-[:POSTED_IN]->(s:Subreddit)
-            RETURN p.title as title, p.selftext as content, p.score as score, 
-                   p.num_comments as comments, s.name as subreddit,
-                   datetime({epochSeconds: toInteger(p.created_utc)}) as date
-            ORDER BY p.score DESC
-            LIMIT $limit
-            """
-            params = {"limit": max_posts}
-        else:
-            cypher_query = """
-            MATCH (p:Post)-[:POSTED_IN]->(s:Subreddit)
-            WHERE """ + " OR ".join(term_conditions) + """
-            RETURN p.title as title, p.selftext as content, p.score as score, 
-                   p.num_comments as comments, s.name as subreddit,
-                   datetime({epochSeconds: toInteger(p.created_utc)}) as date
-            ORDER BY p.score DESC
-            LIMIT $limit
-            """
-            params["limit"] = max_posts
+        cypher_query = match_posts("(p:Post)-[:POSTED_IN]->(s:Subreddit)", [term for term in query_terms if term], params, where_clauses)
+        cypher_query += f"""
+        RETURN p.title as title, p.selftext as content, p.score as score, 
+               p.num_comments as comments, s.name as subreddit,
+               datetime({{epochSeconds: toInteger(p.created_utc)}}) as date
+        ORDER BY {"relevance DESC, " if "search" in params else ""}p.score DESC
+        LIMIT $limit
+        """
         
-        results = neo4j_connection.query(cypher_query, params)
+        results = neo4j_connection.read_query(cypher_query, params)
         
         if not results:
             return query_neo4j_for_general_stats(query_terms)
@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+class Pipeline:
+    """
+    Runs named async stages as soon as the stages they depend on finish, so
+    independent stages overlap. Each stage gets the results of its
+    dependencies as keyword arguments and has its own timeout; a stage that
+    times out or fails yields its `default` instead of failing the pipeline.
+    `timings` records each stage's duration, start offset and status.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.tasks = {}
+        self.timings = {}
+        self.started_at = None
+
+    def add(self, name, func, depends_on=(), timeout=None, default=None):
+        """Register `func(**dependency_results)`, a coroutine function."""
+        self.stages[name] = (func, tuple(depends_on), timeout, default)
+        return self
+
+    def start(self):
+        """Schedule every stage; dependencies are awaited inside each task."""
+        self.started_at = time.perf_counter()
+        for name in self.stages:
+            self._task(name)
+        return self
+
+    def _task(self, name):
+        task = self.tasks.get(name)
+        if task is None:
+            task = self.tasks[name] = asyncio.ensure_future(self._run_stage(name))
+        return task
+
+    async def _run_stage(self, name):
+        func, depends_on, timeout, default = self.stages[name]
+        dependencies = {dependency: await self._task(dependency) for dependency in depends_on}
+
+        start_time = time.perf_counter()
+        status = "ok"
+        try:
+            result = await asyncio.wait_for(func(**dependencies), timeout)
+        except asyncio.TimeoutError:
+            status, result = "timeout", default
+            print(f"Pipeline stage {name} timed out after {timeout}s")
+        except Exception as e:
+            status, result = "error", default
+            print(f"Pipeline stage {name} failed: {str(e)}")
+
+        finished_at = time.perf_counter()
+        self.timings[name] = {
+            "ms": round((finished_at - start_time) * 1000, 1),
+            "started_ms": round((start_time - self.started_at) * 1000, 1),
+            "status": status
+        }
+        return result
+
+    async def result(self, name):
+        """Wait for one stage (starting the pipeline if needed) and return its result."""
+        if self.started_at is None:
+            self.start()
+        return await self._task(name)
+
+    async def run(self):
+        """Run every stage and return {name: result}."""
+        if self.started_at is None:
+            self.start()
+        results = await asyncio.gather(*self.tasks.values())
+        return dict(zip(self.tasks, results))
+
+    def elapsed_ms(self):
+        return round((time.perf_counter() - self.started_at) * 1000, 1) if self.started_at is not None else 0.0
+
+    def cancel(self):
+        """Cancel the stages that are still running (e.g. the client went away)."""
+        for task in self.tasks.values():
+            if not task.done():
+                task.cancel()
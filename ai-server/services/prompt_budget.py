@@ -0,0 +1,142 @@
+import json
+import os
+import re
+from functools import lru_cache
+
+PROMPT_CONTEXT_TOKENS = int(os.getenv("PROMPT_CONTEXT_TOKENS", 1500))
+TOKENIZER_ENCODING = os.getenv("TOKENIZER_ENCODING", "cl100k_base")
+TOKEN_COUNT_CACHE_SIZE = int(os.getenv("TOKEN_COUNT_CACHE_SIZE", 4096))
+TOKEN_COUNT_CACHE_MAX_CHARS = 2000
+
+TRUNCATION_MARKER = "\n...[content truncated for brevity]...\n"
+
+_PIECE_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+_encoding = None
+_encoding_loaded = False
+
+def _get_encoding():
+    """Load the tiktoken encoding once; None when tiktoken is not usable."""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        try:
+            import tiktoken
+
+            _encoding = tiktoken.get_encoding(TOKENIZER_ENCODING)
+        except Exception as e:
+            print(f"tiktoken unavailable, estimating token counts: {str(e)}")
+    return _encoding
+
+def count_tokens(text):
+    """
+    Count the tokens of `text` with tiktoken when it is installed. Without it,
+    count words and punctuation marks, charging long words one extra token
+    per six characters, which stays close to BPE counts for English. Counts
+    of short texts (snippets, headings) are memoized; whole prompts are not.
+    """
+    if not text:
+        return 0
+    if len(text) <= TOKEN_COUNT_CACHE_MAX_CHARS:
+        return _count_short_tokens(text)
+    return _count_tokens(text)
+
+@lru_cache(maxsize=TOKEN_COUNT_CACHE_SIZE)
+def _count_short_tokens(text):
+    return _count_tokens(text)
+
+def _count_tokens(text):
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+
+    return sum(1 + len(piece) // 6 for piece in _PIECE_PATTERN.findall(text))
+
+def truncate_to_tokens(text, max_tokens):
+    """Cut `text` to about `max_tokens` tokens, keeping its start and end."""
+    tokens = count_tokens(text)
+    if tokens <= max_tokens:
+        return text
+
+    marker_tokens = count_tokens(TRUNCATION_MARKER)
+    if max_tokens <= marker_tokens:
+        return text[:len(text) * max(max_tokens, 0) // tokens]
+
+    chars_to_keep = len(text) * (max_tokens - marker_tokens) // tokens
+    half_length = chars_to_keep // 2
+    if half_length == 0:
+        return text[:chars_to_keep]
+    return text[:half_length] + TRUNCATION_MARKER + text[-half_length:]
+
+class ContextPacker:
+    """
+    Greedily packs ranked context snippets into a token budget. Snippets are
+    taken in priority order (ties keep insertion order) and skipped when they
+    do not fit; a section heading is charged with its first chosen snippet.
+    The packed text lists sections and snippets in insertion order.
+    """
+
+    def __init__(self, budget=PROMPT_CONTEXT_TOKENS, separator="\n"):
+        self.budget = budget
+        self.separator = separator
+        self.snippets = []
+        self.used_tokens = 0
+        self.dropped = 0
+
+    def add(self, text, priority=0, section=None):
+        if text:
+            self.snippets.append((priority, len(self.snippets), section, text))
+
+    def add_lines(self, text, section=None, priority=0):
+        """
+        Add each line of a text block as a snippet. A line ending in ':' starts
+        a section; lines rank by their position in their section, so the first
+        entries of every section are packed before the later ones.
+        """
+        rank = 0
+        for line in (text or "").splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            if line.endswith(":"):
+                section, rank = line, 0
+                continue
+            self.add(line, priority - rank, section)
+            rank += 1
+
+    def add_json(self, data, section=None, priority=0):
+        """Add each top-level entry of a dict (or item of a list) as compact JSON."""
+        items = data.items() if isinstance(data, dict) else enumerate(data or [])
+        for rank, (key, value) in enumerate(items):
+            text = json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+            self.add(f"{key}: {text}" if isinstance(data, dict) else text, priority - rank, section)
+
+    def pack(self):
+        remaining = self.budget
+        self.dropped = 0
+        chosen = set()
+        charged_sections = set()
+
+        for priority, order, section, text in sorted(self.snippets, key=lambda snippet: (-snippet[0], snippet[1])):
+            cost = count_tokens(text) + count_tokens(self.separator)
+            if section is not None and section not in charged_sections:
+                cost += count_tokens(section) + 1
+            if cost > remaining:
+                self.dropped += 1
+                continue
+            remaining -= cost
+            chosen.add(order)
+            if section is not None:
+                charged_sections.add(section)
+
+        self.used_tokens = self.budget - remaining
+
+        lines_by_section = {}
+        for priority, order, section, text in self.snippets:
+            if order in chosen:
+                lines_by_section.setdefault(section, []).append(text)
+
+        blocks = []
+        for section, lines in lines_by_section.items():
+            blocks.append(self.separator.join(([section] if section is not None else []) + lines))
+        return "\n\n".join(blocks)
@@ -0,0 +1,117 @@
+import os
+import re
+import threading
+from services.chatbot_service import extract_query_terms
+
+QUERY_LOCAL_MAX_WORDS = int(os.getenv("QUERY_LOCAL_MAX_WORDS", 4))
+QUERY_KNOWN_MAX_WORDS = int(os.getenv("QUERY_KNOWN_MAX_WORDS", 8))
+QUERY_KNOWN_COVERAGE = float(os.getenv("QUERY_KNOWN_COVERAGE", 0.75))
+QUERY_MAX_KEYWORDS = 5
+QUERY_MAX_PHRASE_WORDS = 3
+
+_WORD_PATTERN = re.compile(r'\w+')
+_SUBREDDIT_PREFIX_PATTERN = re.compile(r'(?<!\w)/?r/(?=\w)', re.IGNORECASE)
+
+QUESTION_WORDS = frozenset({
+    "what", "how", "why", "when", "where", "who", "which", "whose", "compare", "explain", "summarize",
+    "describe", "tell", "show", "list", "give", "is", "are", "was", "were", "does", "do", "did",
+    "can", "could", "should", "would", "will"
+})
+
+def normalize_query(query):
+    """Case-fold and collapse whitespace; equal normalized queries rephrase the same."""
+    return " ".join((query or "").split()).casefold()
+
+class QueryRewriter:
+    """
+    Local first tier of query understanding. Keyword-style queries (a few
+    words, no question) and queries made mostly of known subreddit names and
+    topics are rewritten without the LLM: their keywords are the matched
+    names, longest topic phrases first, then the remaining content words.
+    Anything else is left to the LLM (`rewrite` returns None).
+    `snapshot_loader` returns the current `StatsSnapshot` for the vocabulary.
+    """
+
+    def __init__(self, snapshot_loader=None):
+        self.snapshot_loader = snapshot_loader
+        self._lock = threading.Lock()
+        self.local = 0
+        self.escalated = 0
+
+    def _snapshot(self):
+        if self.snapshot_loader is None:
+            return None
+        try:
+            return self.snapshot_loader()
+        except Exception as e:
+            print(f"Query vocabulary unavailable: {str(e)}")
+            return None
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def match_vocabulary(self, words, snapshot):
+        """
+        Greedily match runs of up to QUERY_MAX_PHRASE_WORDS words against
+        subreddit and topic names. Returns (names, indexes of matched words).
+        """
+        names = []
+        matched = set()
+        if not snapshot:
+            return names, matched
+
+        position = 0
+        while position < len(words):
+            for size in range(min(QUERY_MAX_PHRASE_WORDS, len(words) - position), 0, -1):
+                phrase = " ".join(words[position:position + size])
+                name = self._exact_name(snapshot, phrase)
+                if name is not None:
+                    names.append(name)
+                    matched.update(range(position, position + size))
+                    position += size
+                    break
+            else:
+                position += 1
+        return names, matched
+
+    def _exact_name(self, snapshot, phrase):
+        for lookup in (snapshot.subreddit_lookup, snapshot.topic_lookup):
+            for name in lookup.get(phrase, ()):
+                if name.lower() == phrase:
+                    return name
+        return None
+
+    def rewrite(self, query):
+        """Return (rephrased_query, keywords), or None when the LLM should rephrase."""
+        text = " ".join((query or "").split())
+        words = _WORD_PATTERN.findall(_SUBREDDIT_PREFIX_PATTERN.sub("", text).lower())
+        if not words:
+            return None
+
+        question = "?" in text or words[0] in QUESTION_WORDS
+        content_terms = extract_query_terms(_SUBREDDIT_PREFIX_PATTERN.sub("", text))
+        snapshot = self._snapshot() if len(words) <= QUERY_KNOWN_MAX_WORDS else None
+        names, matched = self.match_vocabulary(words, snapshot)
+
+        content_words = set(content_terms)
+        matched_words = {words[index] for index in matched}
+        coverage = len(content_words & matched_words) / len(content_words) if content_words else 0.0
+
+        keyword_style = not question and len(words) <= QUERY_LOCAL_MAX_WORDS
+        mostly_known = len(words) <= QUERY_KNOWN_MAX_WORDS and coverage >= QUERY_KNOWN_COVERAGE
+        if not (keyword_style or mostly_known):
+            self._count("escalated")
+            return None
+
+        keywords = list(dict.fromkeys(names + [term for term in content_terms if term not in matched_words]))
+        self._count("local")
+        return text, keywords[:QUERY_MAX_KEYWORDS] or content_terms[:QUERY_MAX_KEYWORDS]
+
+    def stats(self):
+        total = self.local + self.escalated
+        return {
+            "local": self.local,
+            "escalated": self.escalated,
+            "local_rate": self.local / total if total else 0.0
+        }
@@ -0,0 +1,158 @@
+from datetime import date, datetime, timezone
+
+SECONDS_PER_DAY = 86400
+
+ROLLUP_SCHEMA_QUERIES = [
+    "CREATE CONSTRAINT IF NOT EXISTS FOR (d:DailyPostCount) REQUIRE d.day IS UNIQUE",
+    "CREATE INDEX IF NOT EXISTS FOR (d:SubredditDailyPostCount) ON (d.subreddit, d.day)",
+    "CREATE INDEX IF NOT EXISTS FOR (d:SubredditDailyPostCount) ON (d.day)"
+]
+
+ALL_POST_DAYS_QUERY = """
+MATCH (p:Post)
+RETURN DISTINCT toInteger(p.created_utc) / 86400 AS day_number
+"""
+
+REFRESH_ROLLUPS_QUERY = """
+UNWIND $days AS day
+WITH date(day.day) AS day, day.start AS start, day.start + 86400 AS end
+OPTIONAL MATCH (old:SubredditDailyPostCount {day: day})
+DETACH DELETE old
+WITH DISTINCT day, start, end
+CALL {
+    WITH start, end
+    MATCH (p:Post)-[:POSTED_IN]->(s:Subreddit)
+    WHERE p.created_utc >= start AND p.created_utc < end
+    RETURN s.name AS subreddit, count(*) AS posts
+}
+MERGE (d:SubredditDailyPostCount {subreddit: subreddit, day: day})
+SET d.count = posts
+WITH day, sum(posts) AS total
+MERGE (d:DailyPostCount {day: day})
+SET d.count = total
+"""
+
+CLEAR_EMPTY_DAYS_QUERY = """
+UNWIND $days AS day
+MATCH (d:DailyPostCount {day: date(day.day)})
+WHERE NOT EXISTS { MATCH (:SubredditDailyPostCount {day: d.day}) }
+DELETE d
+"""
+
+ROLLUPS_PRESENT_QUERY = """
+MATCH (d:DailyPostCount)
+RETURN d.day AS day
+LIMIT 1
+"""
+
+_rollups_present = None
+_rollups_version = None
+
+def _day_row(day_number):
+    start = day_number * SECONDS_PER_DAY
+    day = datetime.fromtimestamp(start, tz=timezone.utc).date()
+    return {"day": day.isoformat(), "start": start}
+
+def post_day_number(created_utc):
+    """Return the UTC day number (days since epoch) of a post timestamp."""
+    return int(created_utc or 0) // SECONDS_PER_DAY
+
+def _run_days(tx, query, days):
+    tx.run(query, days=days).consume()
+
+def refresh_daily_rollups(driver, day_numbers=None, days_per_tx=100):
+    """
+    Recompute the per-day and per-subreddit-per-day post counts for the given
+    UTC day numbers, or for every day that has posts when none are given.
+    Counts are rebuilt from the posts, so re-ingested posts are not double counted.
+    """
+    with driver.session() as session:
+        if day_numbers is None:
+            day_numbers = [record["day_number"] for record in session.run(ALL_POST_DAYS_QUERY)]
+
+        days = [_day_row(day_number) for day_number in sorted(set(day_numbers))]
+        for start in range(0, len(days), days_per_tx):
+            chunk = days[start:start + days_per_tx]
+            session.execute_write(_run_days, REFRESH_ROLLUPS_QUERY, chunk)
+            session.execute_write(_run_days, CLEAR_EMPTY_DAYS_QUERY, chunk)
+
+    return len(days)
+
+def parse_date_bound(value, end=False):
+    """
+    Timestamp of a start_date/end_date filter. Dates and naive datetimes are
+    read as UTC. End bounds are exclusive on every path, so a date-only end
+    bound maps to the following UTC midnight and covers the whole end day.
+    """
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    timestamp = moment.timestamp()
+    if end and _is_date_only(value):
+        timestamp += SECONDS_PER_DAY
+    return timestamp
+
+def _is_date_only(value):
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+def _utc_midnight(timestamp):
+    moment = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+    if (moment.hour, moment.minute, moment.second, moment.microsecond) != (0, 0, 0, 0):
+        return None
+    return moment.date()
+
+async def rollups_available(connection, version=None):
+    """
+    Whether the graph has daily rollups to read counts from. The answer is
+    cached per dataset `version`, so it is looked up once per ingest.
+    """
+    global _rollups_present, _rollups_version
+    if _rollups_present is None or version != _rollups_version:
+        result = await connection.aquery(ROLLUPS_PRESENT_QUERY)
+        _rollups_present = bool(result)
+        _rollups_version = version
+    return _rollups_present
+
+async def query_daily_counts(connection, start_timestamp=None, end_timestamp=None, subreddit_list=None):
+    """
+    Read time-series counts from the daily rollups. Returns None when the date
+    bounds do not fall on UTC day boundaries (the caller should scan posts);
+    filters that match no days give an empty list. Like the post scans,
+    `end_timestamp` is exclusive.
+    """
+    where_clauses = ["d.count > 0"]
+    params = {}
+
+    if start_timestamp is not None:
+        start_day = _utc_midnight(start_timestamp)
+        if start_day is None:
+            return None
+        where_clauses.append("d.day >= $start_day")
+        params["start_day"] = start_day
+
+    if end_timestamp is not None:
+        end_day = _utc_midnight(end_timestamp)
+        if end_day is None:
+            return None
+        where_clauses.append("d.day < $end_day")
+        params["end_day"] = end_day
+
+    if subreddit_list:
+        where_clauses.append("d.subreddit IN $subreddit_list")
+        params["subreddit_list"] = subreddit_list
+        cypher_query = "MATCH (d:SubredditDailyPostCount)\nWHERE " + " AND ".join(where_clauses) + """
+        RETURN d.day as date, sum(d.count) as count
+        ORDER BY date
+        """
+    else:
+        cypher_query = "MATCH (d:DailyPostCount)\nWHERE " + " AND ".join(where_clauses) + """
+        RETURN d.day as date, d.count as count
+        ORDER BY date
+        """
+
+    result = await connection.aquery(cypher_query, params)
+    return [{"date": record["date"].isoformat(), "count": record["count"]} for record in result]
@@ -0,0 +1,47 @@
+import re
+
+POST_TEXT_INDEX = "post_text"
+
+POST_TEXT_INDEX_QUERY = f"CREATE FULLTEXT INDEX {POST_TEXT_INDEX} IF NOT EXISTS FOR (p:Post) ON EACH [p.title, p.selftext]"
+
+_WORD_PATTERN = re.compile(r'\w+')
+
+def to_lucene_query(query):
+    """
+    Convert free text into a Lucene query for the post full-text index.
+    Every word must match a token (words longer than two characters as a
+    prefix); a list of queries is OR'ed together.
+    Returns an empty string when the text has no searchable words.
+    """
+    groups = [query] if isinstance(query, str) else list(query)
+
+    clauses = []
+    for group in groups:
+        words = _WORD_PATTERN.findall(str(group).lower())
+        if words:
+            clauses.append("(" + " AND ".join(f"{word}*" if len(word) > 2 else word for word in words) + ")")
+
+    return " OR ".join(clauses)
+
+def match_posts(pattern, query, params, where_clauses):
+    """
+    Start a Cypher query whose `pattern` binds `p`. With a search query (text,
+    or a list of alternative terms) the candidate posts come from the full-text
+    index and their relevance is bound as `relevance`; otherwise the pattern is
+    matched directly. Text without indexable words falls back to a
+    case-insensitive CONTAINS filter.
+    """
+    search = to_lucene_query(query) if query else ""
+
+    if search:
+        params["search"] = search
+        return (
+            f"CALL db.index.fulltext.queryNodes('{POST_TEXT_INDEX}', $search) YIELD node AS p, score AS relevance\n"
+            f"MATCH {pattern}\n"
+        )
+
+    if isinstance(query, str) and query.strip():
+        where_clauses.append("(toLower(p.title) CONTAINS toLower($query) OR toLower(p.selftext) CONTAINS toLower($query))")
+        params["query"] = query
+
+    return f"MATCH {pattern}\n"
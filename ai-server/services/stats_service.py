@@ -0,0 +1,227 @@
+import os
+import re
+import threading
+import time
+
+STATS_SNAPSHOT_TOPICS = int(os.getenv("STATS_SNAPSHOT_TOPICS", 5000))
+STATS_VERSION_CHECK_INTERVAL = float(os.getenv("STATS_VERSION_CHECK_INTERVAL", 5))
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+ALL_SUBREDDITS_QUERY = "MATCH (s:Subreddit) RETURN s.name AS name"
+
+ALL_TOPICS_QUERY = "MATCH (t:Topic) RETURN t.name AS name"
+
+UNREFRESHED_SUBREDDITS_QUERY = """
+MATCH (s:Subreddit)
+WHERE s.post_count IS NULL AND NOT s.name IN $names
+RETURN count(s) AS missing
+"""
+
+REFRESH_SUBREDDIT_STATS_QUERY = """
+UNWIND $names AS name
+MATCH (s:Subreddit {name: name})
+CALL {
+    WITH s
+    OPTIONAL MATCH (p:Post)-[:POSTED_IN]->(s)
+    RETURN count(p) AS posts, coalesce(sum(p.score), 0) AS score_sum, coalesce(sum(p.num_comments), 0) AS comments
+}
+SET s.post_count = posts, s.score_sum = score_sum, s.comment_count = comments
+"""
+
+REFRESH_TOPIC_STATS_QUERY = """
+UNWIND $names AS name
+MATCH (t:Topic {name: name})
+OPTIONAL MATCH (t)-[old:MENTIONED_IN]->(:Subreddit)
+DELETE old
+WITH DISTINCT t
+SET t.mentions = size([(t)<-[:DISCUSSES]-(:Post) | 1])
+WITH t
+MATCH (t)<-[:DISCUSSES]-(p:Post)-[:POSTED_IN]->(s:Subreddit)
+WITH t, s, count(p) AS posts
+MERGE (t)-[m:MENTIONED_IN]->(s)
+SET m.posts = posts
+"""
+
+SNAPSHOT_SUBREDDITS_QUERY = """
+MATCH (s:Subreddit)
+WHERE s.post_count > 0
+RETURN s.name AS subreddit, s.post_count AS post_count, s.score_sum AS score_sum, s.comment_count AS comment_count
+ORDER BY post_count DESC
+"""
+
+SNAPSHOT_TOPICS_QUERY = """
+MATCH (t:Topic)
+WHERE t.mentions > 0
+WITH t ORDER BY t.mentions DESC LIMIT $limit
+RETURN t.name AS topic, t.mentions AS mentions,
+       [(t)-[m:MENTIONED_IN]->(s:Subreddit) | [s.name, m.posts]] AS subreddits
+"""
+
+def _run_names(tx, query, names):
+    tx.run(query, names=names).consume()
+
+def refresh_stats_snapshot(driver, subreddits=None, topics=None, names_per_tx=500):
+    """
+    Recompute the stored per-subreddit aggregates (post count, score and
+    comment sums) and per-topic mentions, including mentions per subreddit,
+    for the given names, or for every subreddit and topic when they are None.
+    Like the daily rollups, values are rebuilt from the posts. A graph whose
+    other subreddits were never refreshed (loaded before the snapshot
+    existed) is refreshed in full.
+    """
+    with driver.session() as session:
+        if subreddits is not None:
+            subreddits = list(subreddits)
+            if session.run(UNREFRESHED_SUBREDDITS_QUERY, names=subreddits).single()["missing"]:
+                subreddits, topics = None, None
+        if subreddits is None:
+            subreddits = [record["name"] for record in session.run(ALL_SUBREDDITS_QUERY)]
+        if topics is None:
+            topics = [record["name"] for record in session.run(ALL_TOPICS_QUERY)]
+
+        for query, names in ((REFRESH_SUBREDDIT_STATS_QUERY, sorted(set(subreddits))),
+                             (REFRESH_TOPIC_STATS_QUERY, sorted(set(topics)))):
+            for start in range(0, len(names), names_per_tx):
+                session.execute_write(_run_names, query, names[start:start + names_per_tx])
+
+    return len(subreddits), len(topics)
+
+def _name_keys(name):
+    key = name.lower()
+    return {key, *_TOKEN_PATTERN.findall(key)}
+
+class StatsSnapshot:
+    """
+    The stored statistics held in memory: subreddits by post count, topics by
+    mentions, mentions per topic and subreddit, and a lookup from lower-cased
+    names and name tokens to subreddits and topics for keyword slices.
+    """
+
+    def __init__(self, subreddits, topics):
+        self.subreddits = subreddits
+        self.topics = topics
+        self.subreddit_stats = {row["subreddit"]: row for row in subreddits}
+        self.topic_mentions = {row["topic"]: row["mentions"] for row in topics}
+        self.topic_subreddits = {}
+        self.subreddit_topics = {}
+        self.subreddit_lookup = {}
+        self.topic_lookup = {}
+
+        for row in subreddits:
+            for key in _name_keys(row["subreddit"]):
+                self.subreddit_lookup.setdefault(key, []).append(row["subreddit"])
+
+        for row in topics:
+            pairs = sorted(row["subreddits"], key=lambda pair: -pair[1])
+            self.topic_subreddits[row["topic"]] = pairs
+            for subreddit, posts in pairs:
+                self.subreddit_topics.setdefault(subreddit, []).append((row["topic"], posts))
+            for key in _name_keys(row["topic"]):
+                self.topic_lookup.setdefault(key, []).append(row["topic"])
+
+        for pairs in self.subreddit_topics.values():
+            pairs.sort(key=lambda pair: -pair[1])
+
+    def __bool__(self):
+        return bool(self.subreddits)
+
+    def _lookup(self, lookup, term):
+        term = term.lower().strip()
+        names = lookup.get(term)
+        if names is None:
+            tokens = _TOKEN_PATTERN.findall(term)
+            names = lookup.get(max(tokens, key=len), []) if tokens else []
+        return names
+
+    def _subreddit_line(self, index, row):
+        return (f"{index}. r/{row['subreddit']}: {row['post_count']} posts, "
+                f"avg score {row['score_sum'] / row['post_count']:.1f}, {row['comment_count']} comments")
+
+    def describe(self, query_terms=None, max_subreddits=100, max_topics=10, max_matches=5):
+        """
+        Format the snapshot for a prompt: top subreddits, popular topics and,
+        for each query term, the matching subreddits (with their top topics)
+        and matching topics (with the subreddits that mention them most).
+        """
+        lines = ["General Reddit statistics:", "", "Top Subreddits:"]
+        lines.extend(self._subreddit_line(i + 1, row) for i, row in enumerate(self.subreddits[:max_subreddits]))
+
+        lines.extend(["", "Popular Topics:"])
+        lines.extend(f"{i + 1}. {row['topic']}: {row['mentions']} mentions" for i, row in enumerate(self.topics[:max_topics]))
+
+        for term in query_terms or []:
+            if not term or not term.strip():
+                continue
+            subreddits = self._lookup(self.subreddit_lookup, term)[:max_matches]
+            topics = self._lookup(self.topic_lookup, term)[:max_matches]
+            if not subreddits and not topics:
+                continue
+
+            lines.extend(["", f'Statistics for "{term.strip()}":'])
+            for i, subreddit in enumerate(subreddits):
+                line = self._subreddit_line(i + 1, self.subreddit_stats[subreddit])
+                top_topics = self.subreddit_topics.get(subreddit, [])[:3]
+                if top_topics:
+                    line += "; top topics " + ", ".join(f"{topic} ({posts})" for topic, posts in top_topics)
+                lines.append(line)
+            for topic in topics:
+                pairs = self.topic_subreddits.get(topic, [])[:3]
+                line = f"- topic {topic}: {self.topic_mentions[topic]} mentions"
+                if pairs:
+                    line += " in " + ", ".join(f"r/{subreddit} ({posts})" for subreddit, posts in pairs)
+                lines.append(line)
+
+        return "\n".join(lines) + "\n"
+
+class StatsSnapshotStore:
+    """
+    Keeps the latest `StatsSnapshot` in memory. The dataset version is checked
+    at most every `version_check_interval` seconds and the snapshot is
+    reloaded when it changed, so reads between ingests do no database work.
+    """
+
+    def __init__(self, connection, version_loader=None, version_check_interval=STATS_VERSION_CHECK_INTERVAL,
+                 max_topics=STATS_SNAPSHOT_TOPICS):
+        self.connection = connection
+        self.version_loader = version_loader
+        self.version_check_interval = version_check_interval
+        self.max_topics = max_topics
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._version = None
+        self._checked_at = float("-inf")
+        self.loads = 0
+
+    def get(self):
+        """Return the current snapshot, reloading it after a dataset change."""
+        now = time.monotonic()
+        if self._snapshot is not None and now - self._checked_at < self.version_check_interval:
+            return self._snapshot
+
+        with self._lock:
+            if self._snapshot is not None and time.monotonic() - self._checked_at < self.version_check_interval:
+                return self._snapshot
+            version = self.version_loader() if self.version_loader else None
+            self._checked_at = time.monotonic()
+            if self._snapshot is None or version != self._version:
+                self._snapshot = self._load()
+                self._version = version
+            return self._snapshot
+
+    def reset(self):
+        """Drop the loaded snapshot so the next `get` reloads it."""
+        with self._lock:
+            self._snapshot = None
+            self._version = None
+            self._checked_at = float("-inf")
+
+    def _load(self):
+        start_time = time.perf_counter()
+        subreddits = self.connection.read_query(SNAPSHOT_SUBREDDITS_QUERY)
+        topics = self.connection.read_query(SNAPSHOT_TOPICS_QUERY, {"limit": self.max_topics})
+        snapshot = StatsSnapshot(subreddits, topics)
+        self.loads += 1
+        print(f"Loaded stats snapshot ({len(subreddits)} subreddits, {len(topics)} topics) "
+              f"in {time.perf_counter() - start_time:.2f}s")
+        return snapshot
@@ -0,0 +1,45 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from services.misc_service import extract_topics_from_text, extract_entities, get_stop_words
+
+DEFAULT_WORKERS = int(os.getenv("INGEST_WORKERS", os.cpu_count() or 1))
+
+def analyze_post_text(title, selftext):
+    """Extract topics and entities from a post's title and selftext."""
+    if not (selftext or title):
+        return [], []
+
+    combined_text = f"{title} {selftext}"
+    return extract_topics_from_text(combined_text), extract_entities(combined_text)
+
+def analyze_selftext(title, selftext):
+    """Extract topics from a post's selftext only."""
+    if selftext:
+        return extract_topics_from_text(selftext), []
+    return [], []
+
+def _init_worker():
+    """Preload per-process state so the first chunk does not pay for it."""
+    get_stop_words()
+
+def create_text_pool(workers=DEFAULT_WORKERS):
+    """Create a process pool for text analysis, or None to analyze inline."""
+    if not workers or workers <= 1:
+        return None
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+
+def submit_analyses(pool, analyze, post_datas, workers=DEFAULT_WORKERS):
+    """
+    Start analyzing a list of post data dicts with `analyze(title, selftext)`.
+    Only the two text fields are shipped to the workers. Returns an iterator
+    of (topics, entities) aligned with `post_datas`; with a pool, work starts
+    immediately so callers can overlap it with graph writes.
+    """
+    titles = [post_data.get("title", "") or "" for post_data in post_datas]
+    selftexts = [post_data.get("selftext", "") or "" for post_data in post_datas]
+
+    if pool is None:
+        return map(analyze, titles, selftexts)
+
+    chunksize = max(1, len(post_datas) // (4 * max(workers, 1)))
+    return pool.map(analyze, titles, selftexts, chunksize=chunksize)
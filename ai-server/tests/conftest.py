@@ -0,0 +1,7 @@
+import os
+
+os.environ.setdefault("GROQ_API_KEY", "test")
+os.environ.setdefault("NEO4J_URI", "bolt://localhost:7687")
+os.environ.setdefault("NEO4J_USER", "neo4j")
+os.environ.setdefault("NEO4J_PASSWORD", "test")
+os.environ.setdefault("LLM_CACHE_ENABLED", "false")
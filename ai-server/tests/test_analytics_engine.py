@@ -0,0 +1,32 @@
+from services import analytics_engine
+
+def _setup(monkeypatch, versions):
+    loads = []
+    monkeypatch.setattr(analytics_engine, "ANALYTICS_BACKEND", "memory")
+    monkeypatch.setattr(analytics_engine, "load_analytics_engine", lambda connection: loads.append(1) or object())
+    monkeypatch.setattr(analytics_engine, "get_dataset_version", lambda driver: versions[-1])
+    analytics_engine.reset_analytics_engine()
+    return loads
+
+def test_engine_reloads_when_the_given_version_changes(monkeypatch):
+    loads = _setup(monkeypatch, ["unused"])
+    first = analytics_engine.get_analytics_engine(None, version="v1")
+    assert analytics_engine.get_analytics_engine(None, version="v1") is first
+    second = analytics_engine.get_analytics_engine(None, version="v2")
+    assert second is not first
+    assert len(loads) == 2
+    analytics_engine.reset_analytics_engine()
+
+def test_engine_checks_the_dataset_version_when_none_is_given(monkeypatch):
+    versions = ["v1"]
+    loads = _setup(monkeypatch, versions)
+    connection = type("Connection", (), {"driver": None})()
+
+    first = analytics_engine.get_analytics_engine(connection)
+    versions.append("v2")
+    assert analytics_engine.get_analytics_engine(connection) is first
+
+    monkeypatch.setattr(analytics_engine, "ANALYTICS_VERSION_CHECK_INTERVAL", 0)
+    assert analytics_engine.get_analytics_engine(connection) is not first
+    assert len(loads) == 2
+    analytics_engine.reset_analytics_engine()
@@ -0,0 +1,68 @@
+import asyncio
+from services.cache_service import ResponseCache
+
+def test_cancelled_caller_does_not_cancel_coalesced_computation():
+    async def scenario():
+        cache = ResponseCache()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "value"
+
+        leader = asyncio.ensure_future(cache.get_or_compute("key", compute))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(cache.get_or_compute("key", compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == "value"
+        assert leader.cancelled()
+        assert calls == [1]
+        assert await cache.get_or_compute("key", compute) == "value"
+        assert cache.stats()["coalesced"] == 1
+
+    asyncio.run(scenario())
+
+def test_failed_computation_is_not_cached():
+    async def scenario():
+        cache = ResponseCache()
+        attempts = []
+
+        async def compute():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise ValueError("boom")
+            return "value"
+
+        try:
+            await cache.get_or_compute("key", compute)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("the first computation should fail")
+        assert await cache.get_or_compute("key", compute) == "value"
+        assert len(attempts) == 2
+
+    asyncio.run(scenario())
+
+def test_value_computed_before_version_change_is_not_stored():
+    async def scenario():
+        cache = ResponseCache()
+        cache.set_version(1)
+
+        async def compute():
+            await asyncio.sleep(0.01)
+            cache.set_version(2)
+            return "stale"
+
+        assert await cache.get_or_compute("key", compute) == "stale"
+        assert cache.stats()["entries"] == 0
+
+        cache.put("other", "stale", version=1)
+        assert cache.stats()["entries"] == 0
+        cache.put("other", "fresh", version=2)
+        assert cache.stats()["entries"] == 1
+
+    asyncio.run(scenario())
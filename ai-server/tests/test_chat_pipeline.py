@@ -0,0 +1,44 @@
+import asyncio
+import main
+
+class _Snapshot:
+    def __init__(self):
+        self.described = []
+
+    def __bool__(self):
+        return True
+
+    def describe(self, query_terms):
+        self.described.append(query_terms)
+        return "snapshot stats"
+
+def _run_pipeline(monkeypatch, snapshot):
+    loads = []
+    aggregated = []
+
+    async def rephrase(user_message):
+        return "rephrased", ["a", "b", "c", "d"]
+
+    def load_snapshot():
+        loads.append(1)
+        return snapshot
+
+    monkeypatch.setattr(main, "rephrase_query", rephrase)
+    monkeypatch.setattr(main.stats_snapshot, "get", load_snapshot)
+    monkeypatch.setattr(main.context_store, "get_index", lambda: None)
+    monkeypatch.setattr(main, "aggregate_general_stats", lambda: aggregated.append(1) or "live stats")
+
+    results = asyncio.run(main.chat_pipeline("question").run())
+    return results["general_stats"], loads, aggregated
+
+def test_general_stats_use_the_loaded_snapshot(monkeypatch):
+    snapshot = _Snapshot()
+    stats, loads, aggregated = _run_pipeline(monkeypatch, snapshot)
+    assert stats == "snapshot stats"
+    assert snapshot.described == [["a", "b", "c"]]
+    assert loads == [1] and aggregated == []
+
+def test_general_stats_aggregate_live_without_a_snapshot(monkeypatch):
+    stats, loads, aggregated = _run_pipeline(monkeypatch, None)
+    assert stats == "live stats"
+    assert loads == [1] and aggregated == [1]
@@ -0,0 +1,53 @@
+import asyncio
+import pytest
+import main
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(main.response_cache, "version_loader", None)
+    main.response_cache.set_version("v1")
+    yield main.response_cache
+    main.response_cache.set_version(None)
+
+def _endpoint(name, calls):
+    async def endpoint(**kwargs):
+        calls.append(name)
+        return name
+    return endpoint
+
+def test_dashboard_without_query_uses_the_panel_endpoints(monkeypatch, cache):
+    calls = []
+    for name in ("get_time_series", "get_community_distribution", "get_topic_trends", "get_network_graph"):
+        monkeypatch.setattr(main, name, _endpoint(name, calls))
+
+    async def no_scan(*args, **kwargs):
+        raise AssertionError("the dashboard should not scan posts without a query")
+        yield
+
+    monkeypatch.setattr(main.neo4j_connection, "astream", no_scan)
+
+    result = asyncio.run(main.get_dashboard(query=None, start_date=None, end_date=None, subreddits=None, limit=100))
+    assert result == {
+        "time_series": "get_time_series",
+        "community_distribution": "get_community_distribution",
+        "topic_trends": "get_topic_trends",
+        "network_graph": "get_network_graph"
+    }
+
+@pytest.mark.parametrize("ingest_during_scan", [False, True])
+def test_scanned_network_graph_is_cached_only_for_its_version(monkeypatch, cache, ingest_during_scan):
+    monkeypatch.setattr(main, "get_topic_trends", _endpoint("get_topic_trends", []))
+
+    async def scan(query, params):
+        if ingest_during_scan:
+            cache.set_version("v2")
+        yield {"created_utc": 0, "subreddit": ["python", 0], "author": ["someone", 1]}
+
+    monkeypatch.setattr(main.neo4j_connection, "astream", scan)
+
+    result = asyncio.run(main.get_dashboard(query="asyncio", start_date=None, end_date=None, subreddits=None, limit=100))
+    assert result["community_distribution"] == [{"name": "python", "value": 1}]
+    assert len(result["network_graph"]["nodes"]) == 2
+
+    filters = {"query": "asyncio", "start_date": None, "end_date": None, "subreddits": None, "limit": 100}
+    assert (cache.make_key("network-graph", filters) in cache._entries) is not ingest_during_scan
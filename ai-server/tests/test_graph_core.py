@@ -0,0 +1,88 @@
+import networkx as nx
+import numpy as np
+import pytest
+from community import community_louvain
+from networkx.algorithms.community import modularity as nx_modularity
+from services.graph_core import CSRGraph, louvain
+
+def _csr(graph):
+    names = list(graph.nodes)
+    ids = {name: index for index, name in enumerate(names)}
+    sources = [ids[source] for source, _ in graph.edges]
+    targets = [ids[target] for _, target in graph.edges]
+    weights = [data.get("weight", 1) for _, _, data in graph.edges(data=True)]
+    return CSRGraph.from_edges(sources, targets, weights, len(names), names)
+
+def _partition(graph, labels):
+    communities = {}
+    for name, label in zip(graph.names, labels):
+        communities.setdefault(int(label), set()).add(name)
+    return list(communities.values())
+
+GRAPHS = {
+    "karate": nx.karate_club_graph(),
+    "planted": nx.planted_partition_graph(8, 40, 0.3, 0.01, seed=7),
+    "bipartite": nx.bipartite.random_graph(200, 30, 0.05, seed=3)
+}
+
+@pytest.mark.parametrize("name", sorted(GRAPHS))
+def test_modularity_matches_networkx(name):
+    graph = GRAPHS[name]
+    csr = _csr(graph)
+    labels = np.array([hash(node) % 5 for node in csr.names])
+    expected = nx_modularity(graph, _partition(csr, labels))
+    assert csr.modularity(labels) == pytest.approx(expected, abs=1e-6)
+
+@pytest.mark.parametrize("name", sorted(GRAPHS))
+def test_louvain_quality_close_to_reference(name):
+    graph = GRAPHS[name]
+    csr = _csr(graph)
+    labels = louvain(csr)
+
+    reference = community_louvain.modularity(community_louvain.best_partition(graph, random_state=42), graph)
+    assert len(labels) == csr.num_nodes
+    assert csr.modularity(labels) >= reference - 0.02
+    assert labels.min() == 0 and set(labels) == set(range(labels.max() + 1))
+
+def test_louvain_recovers_planted_partition():
+    csr = _csr(nx.planted_partition_graph(4, 25, 0.8, 0.0, seed=1))
+    labels = louvain(csr)
+    groups = {frozenset(int(node) // 25 for node in community) for community in _partition(csr, labels)}
+    assert groups == {frozenset([group]) for group in range(4)}
+
+def test_louvain_is_deterministic_and_sorted_by_size():
+    csr = _csr(GRAPHS["planted"])
+    labels = louvain(csr)
+    assert np.array_equal(labels, louvain(csr))
+    sizes = np.bincount(labels)
+    assert list(sizes) == sorted(sizes, reverse=True)
+
+def _reference_pagerank(graph, alpha=0.85, iterations=200):
+    rank = {node: 1 / len(graph) for node in graph}
+    strength = dict(graph.degree(weight="weight"))
+    for _ in range(iterations):
+        rank = {
+            node: (1 - alpha) / len(graph) + alpha * sum(
+                rank[neighbor] * data.get("weight", 1) / strength[neighbor]
+                for neighbor, data in graph[node].items()
+            )
+            for node in graph
+        }
+    return rank
+
+def test_centralities_match_networkx():
+    graph = GRAPHS["karate"]
+    csr = _csr(graph)
+    pagerank = _reference_pagerank(graph)
+    centrality = nx.degree_centrality(graph)
+    assert csr.pagerank() == pytest.approx([pagerank[name] for name in csr.names], abs=1e-4)
+    assert csr.degree_centrality() == pytest.approx([centrality[name] for name in csr.names])
+
+def test_from_nodes_links_combines_repeated_links():
+    nodes = [{"id": "a"}, {"id": "b"}]
+    links = [{"source": "a", "target": "b", "value": 1}, {"source": "b", "target": "a", "value": 2},
+             {"source": "a", "target": "c", "value": 1}]
+    csr = CSRGraph.from_nodes_links(nodes, links)
+    assert csr.names == ["a", "b", "c"]
+    assert list(csr.weighted_degree()) == [4, 3, 1]
+    assert list(csr.degree()) == [2, 1, 1]
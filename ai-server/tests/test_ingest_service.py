@@ -0,0 +1,72 @@
+from services import ingest_service
+from services.ingest_service import _changed_posts, _prefix_hash, build_batch_rows, post_content_hash
+
+class _Session:
+    def __init__(self, stored):
+        self.stored = stored
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def run(self, query, ids):
+        return [{"id": post_id, "content_hash": self.stored[post_id]} for post_id in ids if post_id in self.stored]
+
+class _Driver:
+    def __init__(self, stored):
+        self.stored = stored
+
+    def session(self):
+        return _Session(self.stored)
+
+def _post(name, score):
+    return {"data": {"name": name, "title": "title", "selftext": "text", "created_utc": 100, "score": score,
+                     "num_comments": 1, "subreddit": "python", "author": "someone"}}
+
+def test_content_hash_changes_with_stored_fields_only():
+    post = _post("t3_a", 1)["data"]
+    assert post_content_hash(post) == post_content_hash(dict(post, url="ignored"))
+    assert post_content_hash(post) != post_content_hash(dict(post, score=2))
+
+def test_rescan_keeps_new_and_edited_posts():
+    unchanged, edited, new = _post("t3_a", 1), _post("t3_b", 5), _post("t3_c", 1)
+    driver = _Driver({"t3_a": post_content_hash(unchanged["data"]), "t3_b": post_content_hash(_post("t3_b", 1)["data"])})
+    kept = list(_changed_posts(driver, [unchanged, edited, new], batch_size=2))
+    assert [post["data"]["name"] for post in kept] == ["t3_b", "t3_c"]
+
+def test_batch_rows_store_the_content_hash():
+    post = _post("t3_a", 1)["data"]
+    rows = build_batch_rows([post], [([], [])])
+    assert rows["posts"][0]["content_hash"] == post_content_hash(post)
+
+def _rewrite(path, data, position, replacement):
+    path.write_bytes(data[:position] + replacement + data[position + len(replacement):])
+
+def test_prefix_hash_detects_in_place_edits_past_the_first_block(tmp_path):
+    path = tmp_path / "data.jsonl"
+    data = b"".join(b'{"data": {"name": "t3_%06d", "score": 1}}\n' % index for index in range(2000))
+    path.write_bytes(data)
+    offset = len(data) - 100
+    fingerprint = _prefix_hash(path, offset)
+
+    _rewrite(path, data, 50000, b"9")
+    assert _prefix_hash(path, offset) != fingerprint
+    _rewrite(path, data, offset + 10, b"9")
+    assert _prefix_hash(path, offset) == fingerprint
+
+def test_prefix_hash_samples_blocks_across_large_prefixes(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest_service, "PREFIX_SAMPLE_BLOCKS", 4)
+    path = tmp_path / "data.jsonl"
+    data = bytes(range(256)) * 400
+    path.write_bytes(data)
+    offset = len(data)
+    fingerprint = _prefix_hash(path, offset)
+
+    last_block = offset - ingest_service.PREFIX_BLOCK_SIZE
+    for block in range(4):
+        _rewrite(path, data, last_block * block // 3 + 1, b"\xff\xff")
+        assert _prefix_hash(path, offset) != fingerprint
+    path.write_bytes(data)
+    assert _prefix_hash(path, offset) == fingerprint
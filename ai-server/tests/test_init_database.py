@@ -0,0 +1,38 @@
+import asyncio
+import threading
+import main
+
+def test_database_load_runs_off_the_event_loop(monkeypatch):
+    loop_thread = threading.get_ident()
+    threads = []
+
+    def load_graph_database(**options):
+        threads.append(threading.get_ident())
+        assert options == {"incremental": True, "rescan": False}
+        return {"posts": 3}
+
+    monkeypatch.setattr(main, "load_graph_database", load_graph_database)
+    monkeypatch.setattr(main, "get_dataset_version", lambda driver: "v2")
+    monkeypatch.setattr(main.response_cache, "version_loader", None)
+
+    result = asyncio.run(main.init_database(incremental=True, rescan=False))
+    assert result["posts_ingested"] == 3
+    assert threads and threads[0] != loop_thread
+    assert main.response_cache.version == "v2"
+    main.response_cache.set_version(None)
+
+def test_loads_rebuild_author_interactions(monkeypatch):
+    from services import init_neo4j
+
+    calls = []
+    monkeypatch.setattr(init_neo4j.neo4j_connection, "query", lambda query: calls.append("query"))
+    monkeypatch.setattr(init_neo4j, "ingest_jsonl", lambda *args, **options: {"posts": 1, "authors": {"someone"}})
+    monkeypatch.setattr(init_neo4j, "build_author_interactions",
+                        lambda driver, authors=None: calls.append(("interactions", authors)))
+    monkeypatch.setattr(init_neo4j, "update_communities",
+                        lambda driver, incremental=False: calls.append(("communities", incremental)))
+
+    init_neo4j.load_graph_database(incremental=True)
+    assert calls[-2:] == [("interactions", {"someone"}), ("communities", True)]
+    init_neo4j.load_graph_database()
+    assert calls[-2:] == [("interactions", None), ("communities", False)]
@@ -0,0 +1,26 @@
+import pytest
+from benchmarks.synthetic_data import generate_posts
+from services.json_index import JsonIndex
+from services.misc_service import filter_json_data
+
+RECORDS = list(generate_posts(500, seed=3, num_subreddits=10, num_authors=200, text_words=30))
+INDEX = JsonIndex(RECORDS)
+
+def _title_words():
+    words = sorted({word for record in RECORDS for word in record["data"]["title"].split()})
+    return words[:5] + words[-5:]
+
+@pytest.mark.parametrize("term", _title_words() + ["ba", "a", "abo", "dat", "#", "https", "Subreddit", "zzzq", "t3_"])
+def test_index_matches_the_scan(term):
+    assert filter_json_data(RECORDS, [term], index=INDEX) == filter_json_data(RECORDS, [term])
+
+def test_index_matches_the_scan_for_several_terms():
+    terms = _title_words()[:3] + ["multi word phrase"]
+    assert filter_json_data(RECORDS, terms, index=INDEX) == filter_json_data(RECORDS, terms)
+
+def test_lookup_only_checks_tokens_sharing_the_trigrams():
+    word = max(_title_words(), key=len)
+    candidates = INDEX._candidate_tokens(word)
+    assert word in candidates
+    assert len(candidates) < len(INDEX.vocabulary) / 10
+    assert INDEX._candidate_tokens("qqqqqq") == ()
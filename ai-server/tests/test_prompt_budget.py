@@ -0,0 +1,19 @@
+from services.prompt_budget import TOKEN_COUNT_CACHE_MAX_CHARS, _count_short_tokens, count_tokens, truncate_to_tokens
+
+LONG_TEXT = " ".join(f"word{index}" for index in range(4000))
+
+def test_truncation_respects_tiny_budgets():
+    assert count_tokens(truncate_to_tokens(LONG_TEXT, 1)) <= 1
+    assert truncate_to_tokens(LONG_TEXT, 0) == ""
+
+def test_truncation_keeps_start_and_end():
+    truncated = truncate_to_tokens(LONG_TEXT, 200)
+    assert truncated.startswith("word0 ") and truncated.endswith("word3999")
+    assert count_tokens(truncated) < 230
+    assert truncate_to_tokens("short text", 200) == "short text"
+
+def test_only_short_texts_are_memoized():
+    _count_short_tokens.cache_clear()
+    count_tokens("a short snippet")
+    count_tokens("x " * TOKEN_COUNT_CACHE_MAX_CHARS)
+    assert _count_short_tokens.cache_info().currsize == 1
@@ -0,0 +1,34 @@
+import asyncio
+import main
+from services.pipeline_service import Pipeline
+
+QUESTION = "What are people on reddit saying about the new electric car models this year?"
+
+def test_overlapping_rephrase_survives_the_other_request_timing_out(monkeypatch):
+    calls = []
+
+    async def slow_rephrase(user_query, model_name):
+        calls.append(user_query)
+        await asyncio.sleep(0.6)
+        return "rephrased", ["electric", "car"]
+
+    monkeypatch.setattr(main, "llm_rephrase_query", slow_rephrase)
+    main.rephrase_cache.set_version(main.rephrase_cache.version)
+
+    def pipeline(timeout):
+        return Pipeline().add("rephrase", lambda: main.rephrase_query(QUESTION), timeout=timeout, default="default")
+
+    async def scenario():
+        impatient, patient = pipeline(0.3), pipeline(5)
+        first = asyncio.ensure_future(impatient.result("rephrase"))
+        while not calls and not first.done():
+            await asyncio.sleep(0.005)
+        return await asyncio.gather(first, patient.result("rephrase")), impatient, patient
+
+    (impatient_result, patient_result), impatient, patient = asyncio.run(scenario())
+
+    assert impatient_result == "default"
+    assert impatient.timings["rephrase"]["status"] == "timeout"
+    assert patient_result == ("rephrased", ["electric", "car"])
+    assert patient.timings["rephrase"]["status"] == "ok"
+    assert len(calls) == 1
@@ -0,0 +1,62 @@
+import asyncio
+import time
+from datetime import date
+import pytest
+import main
+from services import rollup_service
+from services.rollup_service import _utc_midnight, parse_date_bound
+
+@pytest.fixture
+def non_utc_host(monkeypatch):
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+def test_date_bounds_are_utc_midnights_on_any_host(non_utc_host):
+    start = parse_date_bound("2024-03-10")
+    end = parse_date_bound("2024-03-12", end=True)
+    assert start == 1710028800
+    assert _utc_midnight(start) == date(2024, 3, 10)
+    assert _utc_midnight(end) == date(2024, 3, 13)
+
+def test_datetime_bounds_keep_their_instant():
+    assert parse_date_bound("2024-03-10T12:00:00", end=True) == 1710072000
+    assert parse_date_bound("2024-03-10T12:00:00+01:00") == 1710068400
+    assert _utc_midnight(parse_date_bound("2024-03-10T12:00:00")) is None
+
+class FakeConnection:
+    def __init__(self, rollups=True):
+        self.rollups = rollups
+        self.queries = []
+
+    async def aquery(self, query, parameters=None):
+        self.queries.append(query)
+        if "LIMIT 1" in query:
+            return [{"day": date(2024, 3, 10)}] if self.rollups else []
+        if "(p:Post)" in query:
+            raise AssertionError("the time series should not scan posts")
+        return []
+
+@pytest.fixture
+def rollups(monkeypatch):
+    monkeypatch.setattr(rollup_service, "_rollups_present", None)
+    monkeypatch.setattr(main.response_cache, "version_loader", None)
+    main.response_cache.set_version("v1")
+    connection = FakeConnection()
+    monkeypatch.setattr(main, "neo4j_connection", connection)
+    yield connection
+    main.response_cache.set_version(None)
+
+def test_empty_filtered_rollup_result_does_not_scan_posts(rollups):
+    result = asyncio.run(main.get_time_series(query=None, start_date="2024-03-10", end_date="2024-03-12",
+                                              subreddits="no_such_subreddit"))
+    assert result["data"] == []
+    assert any("SubredditDailyPostCount" in query for query in rollups.queries)
+
+def test_rollup_presence_is_checked_once_per_version(rollups):
+    for _ in range(3):
+        assert asyncio.run(rollup_service.rollups_available(rollups, "v1"))
+    assert asyncio.run(rollup_service.rollups_available(rollups, "v2"))
+    assert sum("LIMIT 1" in query for query in rollups.queries) == 2
@@ -1,6 +1,6 @@
 "use client";
 
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import TimeSeriesChart from "../components/TimeSeriesChart";
 import CommunityDistributionChart from "../components/CommunityDistributionChart";
 import NetworkGraph from "../components/NetworkGraph";
@@ -9,10 +9,9 @@ import Chatbot from "../components/Chatbot";
 import TopicTrends from "@/components/TopicTrendAnalysis";
 import {
   fetchTimeSeries,
-  fetchCommunityDistribution,
-  fetchNetworkGraph,
-  fetchAIAnalysis,
-  fetchTopicTrends,
+  fetchDashboard,
+  fetchNetworkSummary,
+  streamAIAnalysis,
 } from "../utils/api";
 
 import { Button } from "@/components/ui/button";
@@ -47,6 +46,9 @@ export default function Home() {
   const [timeSeriesData, setTimeSeriesData] = useState([]);
   const [communityData, setCommunityData] = useState([]);
   const [networkData, setNetworkData] = useState({ nodes: [], links: [] });
+  const [networkSummary, setNetworkSummary] = useState(null);
+  const [summaryLoading, setSummaryLoading] = useState(false);
+  const summarySignatureRef = useRef(null);
   const [analysis, setAnalysis] = useState("");
   const [topicTrends, setTopicTrends] = useState([]);
   const [loading, setLoading] = useState(false);
@@ -56,6 +58,7 @@ export default function Home() {
   const [startDate, setStartDate] = useState("2024-01-01");
   const [endDate, setEndDate] = useState("2025-03-13");
   const [subreddits, setSubreddits] = useState("Anarchism, Libertarian");
+  const analysisControllerRef = useRef(null);
 
   useEffect(() => {
     checkData();
@@ -87,45 +90,79 @@ export default function Home() {
     }
   };
 
-  const handleSearch = async () => {
-    try {
-      setLoading(true);
-      setFilterOpen(false);
+  const streamAnalysis = async (searchQuery) => {
+    analysisControllerRef.current?.abort();
+    const controller = new AbortController();
+    analysisControllerRef.current = controller;
+    setAnalysis("");
 
-      const timeSeries = await fetchTimeSeries(
-        query,
-        startDate,
-        endDate,
-        subreddits
-      );
-      const communityDistribution = await fetchCommunityDistribution(
-        query,
-        startDate,
-        endDate
+    try {
+      await streamAIAnalysis(
+        searchQuery,
+        (event, data) => {
+          if (event === "token") {
+            setAnalysis((prev) => prev + data.text);
+          }
+        },
+        controller.signal
       );
-      const networkGraph = await fetchNetworkGraph(
+    } catch (err) {
+      if (err.name === "AbortError") return;
+      console.error("Error streaming analysis:", err);
+      toast.error("Failed to generate the AI analysis. Please try again later.");
+    }
+  };
+
+  const loadNetworkSummary = async (signature) => {
+    summarySignatureRef.current = signature;
+    setNetworkSummary(null);
+    setSummaryLoading(true);
+
+    try {
+      const data = await fetchNetworkSummary(
         query,
         startDate,
         endDate,
         subreddits,
         100
       );
-      const topicsData = await fetchTopicTrends(startDate, endDate, subreddits);
+      if (summarySignatureRef.current === signature) {
+        setNetworkSummary(data.summary);
+      }
+    } catch (err) {
+      console.error("Error fetching network summary:", err);
+    } finally {
+      if (summarySignatureRef.current === signature) {
+        setSummaryLoading(false);
+      }
+    }
+  };
 
-      const searchQuery = {
+  const handleSearch = async () => {
+    try {
+      setLoading(true);
+      setFilterOpen(false);
+
+      streamAnalysis({
         query,
         start_date: startDate,
         end_date: endDate,
         subreddits: subreddits ? subreddits.split(",") : [],
-      };
+      });
 
-      const aiAnalysis = await fetchAIAnalysis(searchQuery);
+      const dashboard = await fetchDashboard(
+        query,
+        startDate,
+        endDate,
+        subreddits,
+        100
+      );
 
-      setTimeSeriesData(timeSeries.data);
-      setCommunityData(communityDistribution);
-      setNetworkData(networkGraph);
-      setAnalysis(aiAnalysis.analysis);
-      setTopicTrends(topicsData);
+      setTimeSeriesData(dashboard.time_series.data);
+      setCommunityData(dashboard.community_distribution);
+      setNetworkData(dashboard.network_graph);
+      setTopicTrends(dashboard.topic_trends);
+      loadNetworkSummary(dashboard.network_graph.summary_signature);
     } catch (err) {
       console.error("Error fetching data:", err);
       toast.error("Failed to fetch data. Please try again later.");
@@ -432,7 +469,8 @@ export default function Home() {
                       <NetworkGraph
                         nodes={networkData.nodes}
                         links={networkData.links}
-                        summary={networkData.summary}
+                        summary={networkSummary}
+                        summaryLoading={summaryLoading}
                       />
                     </div>
                   ) : (
@@ -4,7 +4,7 @@ import { Button } from "@/components/ui/button";
 import { Input } from "@/components/ui/input";
 import { ScrollArea } from "@/components/ui/scroll-area";
 import { motion, AnimatePresence } from "framer-motion";
-import { sendChatMessage } from "@/utils/api";
+import { streamChatMessage } from "@/utils/api";
 
 const TypewriterEffect = ({ text }) => {
   const [displayText, setDisplayText] = useState("");
@@ -51,8 +51,14 @@ export default function Chatbot() {
   ]);
   const [inputMessage, setInputMessage] = useState("");
   const [isTyping, setIsTyping] = useState(false);
+  const [isResponding, setIsResponding] = useState(false);
   const messagesEndRef = useRef(null);
   const scrollAreaRef = useRef(null);
+  const abortControllerRef = useRef(null);
+
+  useEffect(() => {
+    return () => abortControllerRef.current?.abort();
+  }, []);
 
   const scrollToBottom = () => {
     messagesEndRef.current?.scrollIntoView({ behavior: "smooth" });
@@ -73,27 +79,61 @@ export default function Chatbot() {
     setMessages((prev) => [...prev, userMessage]);
     setInputMessage("");
     setIsTyping(true);
+    setIsResponding(true);
+
+    const controller = new AbortController();
+    abortControllerRef.current = controller;
+    let started = false;
 
     try {
-      const data = await sendChatMessage(message);
+      await streamChatMessage(
+        message,
+        (event, data) => {
+          if (event !== "token") return;
+
+          if (!started) {
+            started = true;
+            setIsTyping(false);
+            setMessages((prev) => [
+              ...prev,
+              {
+                role: "bot",
+                content: data.text,
+                timestamp: new Date(),
+                streamed: true,
+              },
+            ]);
+          } else {
+            setMessages((prev) => {
+              const last = prev[prev.length - 1];
+              return [
+                ...prev.slice(0, -1),
+                { ...last, content: last.content + data.text },
+              ];
+            });
+          }
+        },
+        controller.signal
+      );
 
-      const botResponse = {
-        role: "bot",
-        content: data.response,
-        timestamp: new Date(),
-      };
-      setMessages((prev) => [...prev, botResponse]);
+      if (!started) {
+        throw new Error("The response stream ended without an answer");
+      }
     } catch (error) {
+      if (error.name === "AbortError") return;
       console.error("Error:", error);
 
-      const errorMessage = {
-        role: "bot",
-        content: "Sorry, I couldn't process your request. Please try again.",
-        timestamp: new Date(),
-      };
-      setMessages((prev) => [...prev, errorMessage]);
+      if (!started) {
+        const errorMessage = {
+          role: "bot",
+          content: "Sorry, I couldn't process your request. Please try again.",
+          timestamp: new Date(),
+        };
+        setMessages((prev) => [...prev, errorMessage]);
+      }
     } finally {
       setIsTyping(false);
+      setIsResponding(false);
     }
   };
 
@@ -162,7 +202,7 @@ export default function Chatbot() {
               size="sm"
               className="text-xs bg-white dark:bg-slate-700 border-indigo-200 dark:border-slate-600 hover:border-indigo-500 dark:hover:border-indigo-400 hover:bg-indigo-50 dark:hover:bg-indigo-900/30 text-slate-700 dark:text-slate-200 justify-start h-auto py-2 text-left"
               onClick={() => handlePredefinedPrompt(prompt)}
-              disabled={isTyping}
+              disabled={isResponding}
             >
               <span className="line-clamp-2">{prompt}</span>
 
@@ -214,7 +254,8 @@ export default function Chatbot() {
                     >
                       {message.role === "bot" &&
                       index === messages.length - 1 &&
-                      !isTyping ? (
+                      !isTyping &&
+                      !message.streamed ? (
                         <TypewriterEffect text={message.content} />
                       ) : (
                         <div
@@ -282,14 +323,14 @@ export default function Chatbot() {
             onKeyDown={handleKeyDown}
             placeholder="Ask about your social data analysis..."
             className="h-12 flex-1 border-indigo-200 dark:border-slate-600 focus:ring-2 focus:ring-indigo-500 dark:focus:ring-indigo-400"
-            disabled={isTyping}
+            disabled={isResponding}
           />
           <Button
             onClick={() => handleSendMessage()}
-            disabled={!inputMessage.trim() || isTyping}
+            disabled={!inputMessage.trim() || isResponding}
             className="h-12 w-12 bg-gradient-to-r from-indigo-500 to-purple-600 hover:from-indigo-600 hover:to-purple-700 text-white shadow-md hover:shadow-lg transition-all"
           >
-            {isTyping ? (
+            {isResponding ? (
               <Loader2 className="h-5 w-5 animate-spin" />
             ) : (
               <Send className="h-5 w-5" />
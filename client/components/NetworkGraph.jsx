@@ -10,7 +10,7 @@ import {
 import { Button } from "@/components/ui/button";
 import { Card, CardContent } from "@/components/ui/card";
 
-const NetworkGraphWithSummary = ({ nodes, links, summary }) => {
+const NetworkGraphWithSummary = ({ nodes, links, summary, summaryLoading }) => {
   const svgRef = useRef(null);
   const containerRef = useRef(null);
   const tooltipRef = useRef(null);
@@ -227,6 +227,7 @@ const NetworkGraphWithSummary = ({ nodes, links, summary }) => {
   }, [nodes, links, dimensions]);
 
   const formatSummary = () => {
+    if (!summary && summaryLoading) return <p>Generating summary...</p>;
     if (!summary) return <p>No summary available</p>;
 
     if (typeof summary === "string") {
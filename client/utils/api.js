@@ -23,6 +23,20 @@ export const fetchNetworkGraph = async (query, startDate, endDate, subreddits, l
     return response.data;
 };
 
+export const fetchDashboard = async (query, startDate, endDate, subreddits, limit) => {
+    const response = await axios.get(`${API_BASE_URL}/api/dashboard`, {
+        params: { query, start_date: startDate, end_date: endDate, subreddits, limit },
+    });
+    return response.data;
+};
+
+export const fetchNetworkSummary = async (query, startDate, endDate, subreddits, limit) => {
+    const response = await axios.get(`${API_BASE_URL}/api/network-graph/summary`, {
+        params: { query, start_date: startDate, end_date: endDate, subreddits, limit },
+    });
+    return response.data;
+};
+
 export const fetchAIAnalysis = async (searchQuery) => {
     const response = await axios.post(`${API_BASE_URL}/api/ai-analysis`, searchQuery);
     return response.data;
@@ -33,6 +47,52 @@ export const sendChatMessage = async (message) => {
     return response.data;
 };
 
+const streamEvents = async (path, body, onEvent, signal) => {
+    const response = await fetch(`${API_BASE_URL}${path}`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json", Accept: "text/event-stream" },
+        body: JSON.stringify(body),
+        signal,
+    });
+    if (!response.ok || !response.body) {
+        throw new Error(`Stream request failed with status ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+            const block = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let event = "message";
+            const dataLines = [];
+            for (const line of block.split("\n")) {
+                if (line.startsWith("event:")) event = line.slice(6).trim();
+                else if (line.startsWith("data:")) dataLines.push(line.slice(5).trim());
+            }
+            if (dataLines.length === 0) continue;
+
+            const data = JSON.parse(dataLines.join("\n"));
+            if (event === "error") throw new Error(data.detail);
+            onEvent(event, data);
+        }
+    }
+};
+
+export const streamChatMessage = (message, onEvent, signal) =>
+    streamEvents("/api/chatbot/stream", { message }, onEvent, signal);
+
+export const streamAIAnalysis = (searchQuery, onEvent, signal) =>
+    streamEvents("/api/ai-analysis/stream", searchQuery, onEvent, signal);
+
 export const fetchTopicTrends = async (startDate, endDate, subreddits) => {
     try {
         const response = await axios.get(`${API_BASE_URL}/api/topic-trends`, {